@@ -7,5 +7,4 @@ class AboutConfig(AppConfig):
     verbose_name = _("About")
     
     def ready(self):
-        # Import signals here if needed
-        pass
+        from . import signals  # noqa: F401
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from apps.about.services import ABOUT_LANGUAGES, warm_about_page_cache
+
+
+class Command(BaseCommand):
+    help = 'Pre-build the cached combined About page payload (run after deploys)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--host',
+            default=settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost',
+            help='Public host the API is served from (image URLs are absolute)'
+        )
+        parser.add_argument(
+            '--scheme',
+            choices=['http', 'https'],
+            default='https',
+            help='Public scheme the API is served over'
+        )
+        parser.add_argument(
+            '--lang',
+            action='append',
+            choices=ABOUT_LANGUAGES,
+            help='Language to warm (repeatable, default: all)'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.ABOUT_CACHE_ENABLED:
+            raise CommandError('ABOUT_CACHE_ENABLED is off, nothing to warm')
+
+        # Serializers build absolute URLs from the request, so warm with one
+        # that looks like a real public request to share its cache entry
+        request = RequestFactory().get(
+            '/api/v1/about/combined/',
+            HTTP_HOST=options['host'],
+            secure=options['scheme'] == 'https'
+        )
+        languages = warm_about_page_cache(request, options['lang'] or ABOUT_LANGUAGES)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed About page cache for {', '.join(languages)} on {options['scheme']}://{options['host']}"
+        ))
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('about', '0003_index_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientlogo',
+            name='logo_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
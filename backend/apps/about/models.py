@@ -15,7 +15,7 @@ class AboutPage(models.Model):
     history_section_title = models.CharField(_("History Section Title"), max_length=200, blank=True)
     meta_description = models.TextField(_("Meta Description"), blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     # Localization fields
     title_ar = models.CharField(_("Title (Arabic)"), max_length=200)
@@ -44,6 +44,8 @@ class TeamMember(models.Model):
     role = models.CharField(_("Role"), max_length=100)
     bio = models.TextField(_("Biography"))
     image = models.ImageField(_("Image"), upload_to='team/')
+    # Maintained by apps.imaging.services.watch_images, see signals.py
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     email = models.EmailField(_("Email"), blank=True)
     linkedin = models.URLField(_("LinkedIn"), blank=True)
     order = models.PositiveIntegerField(_("Order"), default=0)
@@ -58,7 +60,7 @@ class TeamMember(models.Model):
     department_ar = models.CharField(_("Department (Arabic)"), max_length=100, blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['order', 'name']
@@ -81,7 +83,7 @@ class CoreValue(models.Model):
     description_ar = models.TextField(_("Description (Arabic)"))
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['order']
@@ -113,7 +115,7 @@ class Testimonial(models.Model):
     industry_ar = models.CharField(_("Industry (Arabic)"), max_length=100, blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['-created_at']
@@ -142,7 +144,7 @@ class CompanyHistory(models.Model):
     description_ar = models.TextField(_("Description (Arabic)"))
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ["-year"]
@@ -165,7 +167,7 @@ class CompanyStatistic(models.Model):
     unit_ar = models.CharField(_("Unit (Arabic)"), max_length=20, blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ["order"]
@@ -180,6 +182,8 @@ class ClientLogo(models.Model):
     """Client logo model"""
     name = models.CharField(_("Client Name"), max_length=100)
     logo = models.ImageField(_("Logo"), upload_to='clients/')
+    # Maintained by apps.imaging.services.watch_images, see signals.py
+    logo_renditions = models.JSONField(default=dict, blank=True, editable=False)
     url = models.URLField(_("Website URL"), blank=True)
     order = models.PositiveIntegerField(_("Order"), default=0)
     is_active = models.BooleanField(_("Active"), default=True)
@@ -188,7 +192,7 @@ class ClientLogo(models.Model):
     name_ar = models.CharField(_("Client Name (Arabic)"), max_length=100)
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ["order", "name"]
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.imaging.serializers import RenditionsField
 from .models import (
     AboutPage, TeamMember, CoreValue, Testimonial,
     CompanyHistory, CompanyStatistic, ClientLogo
@@ -176,6 +177,7 @@ class LocalizedTeamMemberSerializer(serializers.ModelSerializer):
     Returns only fields for the requested language
     """
     image_url = serializers.SerializerMethodField()
+    image_renditions = RenditionsField()
     name = serializers.SerializerMethodField()
     role = serializers.SerializerMethodField()
     bio = serializers.SerializerMethodField()
@@ -184,7 +186,7 @@ class LocalizedTeamMemberSerializer(serializers.ModelSerializer):
     class Meta:
         model = TeamMember
         fields = [
-            'id', 'name', 'role', 'bio', 'image', 'image_url', 'email', 'linkedin',
+            'id', 'name', 'role', 'bio', 'image', 'image_url', 'image_renditions', 'email', 'linkedin',
             'department', 'is_featured'
         ]
     
@@ -373,12 +375,13 @@ class LocalizedClientLogoSerializer(serializers.ModelSerializer):
     Returns only fields for the requested language
     """
     logo_url = serializers.SerializerMethodField()
+    logo_renditions = RenditionsField()
     name = serializers.SerializerMethodField()
     
     class Meta:
         model = ClientLogo
         fields = [
-            'id', 'name', 'logo', 'logo_url', 'url', 'order'
+            'id', 'name', 'logo', 'logo_url', 'logo_renditions', 'url', 'order'
         ]
     
     def _get_language(self):
@@ -1,4 +1,9 @@
+import logging
+
+from django.conf import settings
 from django.core.cache import cache
+from utils.cache import get_model_versions
+from utils.instrumentation import record_cache_lookup
 from .models import (
     AboutPage, TeamMember, CoreValue, Testimonial,
     CompanyHistory, CompanyStatistic, ClientLogo
@@ -12,6 +17,27 @@ from .serializers import (
     LocalizedCompanyStatisticSerializer, LocalizedClientLogoSerializer
 )
 
+logger = logging.getLogger(__name__)
+
+ABOUT_MODELS = [
+    AboutPage, TeamMember, CoreValue, Testimonial,
+    CompanyHistory, CompanyStatistic, ClientLogo
+]
+ABOUT_LANGUAGES = ['en', 'ar']
+
+
+def get_about_cache_key(language, request=None):
+    """
+    Cache key for the combined About payload.
+
+    Includes the host because image URLs are absolute, and the content
+    version of every About model so any admin edit retires the entry.
+    """
+    origin = f"{request.scheme}://{request.get_host()}" if request else ''
+    versions = '.'.join(str(version) for version in get_model_versions(ABOUT_MODELS))
+    return f"about_page_combined_content:{language}:{origin}:{versions}"
+
+
 def get_about_page_content(language, request=None):
     """
     Returns combined data for the About page.
@@ -24,20 +50,33 @@ def get_about_page_content(language, request=None):
     Returns:
         dict: Combined data for the About page
     """
-    # Debug logging
-    print(f"Getting about page content for language: {language}")
+    cache_enabled = settings.ABOUT_CACHE_ENABLED
+    if cache_enabled:
+        cache_key = get_about_cache_key(language, request)
+        cached_data = cache.get(cache_key)
+        record_cache_lookup(cached_data is not None)
+        if cached_data is not None:
+            return cached_data
+    
+    result = build_about_page_content(language, request)
     
-    cache_key = f"about_page_combined_content:{language}"
-    cached_data = cache.get(cache_key)
+    if cache_enabled:
+        cache.set(cache_key, result, settings.ABOUT_CACHE_TIMEOUT)
     
-    if cached_data:
-        print("Returning cached data")
-        return cached_data
+    return result
+
+
+def build_about_page_content(language, request=None):
+    """
+    Builds the combined About payload from the database.
+    Each queryset is evaluated exactly once.
+    """
+    logger.debug("Building about page content for language: %s", language)
     
     # Get the main content
     about_page = AboutPage.objects.first()
     if not about_page:
-        print("Creating new about page")
+        logger.info("Creating default about page")
         about_page = AboutPage.objects.create(
             title='About Archway Innovations',
             subtitle='Transforming Spaces, Enhancing Lives',
@@ -63,29 +102,18 @@ def get_about_page_content(language, request=None):
         )
     
     # Get related data
-    team_members = TeamMember.objects.filter(is_active=True, is_featured=True).order_by('order', 'name')
-    print(f"Found {team_members.count()} team members, IDs: {[tm.id for tm in team_members]}")
-    
-    core_values = CoreValue.objects.all().order_by('order')
-    print(f"Found {core_values.count()} core values")
-    
-    testimonials = Testimonial.objects.filter(is_featured=True).order_by('-created_at')
-    print(f"Found {testimonials.count()} testimonials")
-    
-    company_history = CompanyHistory.objects.all().order_by('-year')
-    print(f"Found {company_history.count()} history events")
-    
-    statistics = CompanyStatistic.objects.all().order_by('order')
-    print(f"Found {statistics.count()} statistics")
-    
-    client_logos = ClientLogo.objects.filter(is_active=True).order_by('order', 'name')
-    print(f"Found {client_logos.count()} client logos")
+    team_members = list(TeamMember.objects.filter(is_active=True, is_featured=True).order_by('order', 'name'))
+    core_values = list(CoreValue.objects.all().order_by('order'))
+    testimonials = list(Testimonial.objects.filter(is_featured=True).order_by('-created_at'))
+    company_history = list(CompanyHistory.objects.all().order_by('-year'))
+    statistics = list(CompanyStatistic.objects.all().order_by('order'))
+    client_logos = list(ClientLogo.objects.filter(is_active=True).order_by('order', 'name'))
     
     # Serialize data
     context = {'request': request, 'language': language}
     
     # Use localized serializers based on the language
-    if language in ['en', 'ar']:
+    if language in ABOUT_LANGUAGES:
         about_serializer = LocalizedAboutPageSerializer(about_page, context=context)
         team_serializer = LocalizedTeamMemberSerializer(team_members, many=True, context=context)
         values_serializer = LocalizedCoreValueSerializer(core_values, many=True, context=context)
@@ -103,10 +131,8 @@ def get_about_page_content(language, request=None):
         statistics_serializer = CompanyStatisticSerializer(statistics, many=True, context=context)
         logos_serializer = ClientLogoSerializer(client_logos, many=True, context=context)
     
-    print(f"Team serializer data length: {len(team_serializer.data)}")
-    
     # Combine data
-    result = {
+    return {
         'main_content': about_serializer.data,
         'team_members': team_serializer.data,
         'core_values': values_serializer.data,
@@ -115,23 +141,31 @@ def get_about_page_content(language, request=None):
         'statistics': statistics_serializer.data,
         'client_logos': logos_serializer.data,
         'metadata': {
-            'team_count': team_members.count(),
-            'values_count': core_values.count(),
-            'testimonials_count': testimonials.count(),
-            'history_count': company_history.count(),
-            'statistics_count': statistics.count(),
-            'logos_count': client_logos.count(),
+            'team_count': len(team_members),
+            'values_count': len(core_values),
+            'testimonials_count': len(testimonials),
+            'history_count': len(company_history),
+            'statistics_count': len(statistics),
+            'logos_count': len(client_logos),
             'language': language
         }
     }
+
+
+def warm_about_page_cache(request=None, languages=ABOUT_LANGUAGES):
+    """
+    Pre-builds the cached About payload for each language.
     
-    # For debugging
-    print(f"Team members in result: {len(result['team_members'])}")
-    
-    # Cache the result - comment out for debugging
-    # cache.set(cache_key, result, 3600)  # Cache for 1 hour
-    
-    return result
+    Returns:
+        list: Languages that were warmed
+    """
+    for language in languages:
+        cache.set(
+            get_about_cache_key(language, request),
+            build_about_page_content(language, request),
+            settings.ABOUT_CACHE_TIMEOUT
+        )
+    return list(languages)
 
 def get_departments():
     """
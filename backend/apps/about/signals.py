@@ -0,0 +1,16 @@
+from apps.imaging.services import watch_images
+from utils.cache import watch_models
+from .models import (
+    AboutPage, TeamMember, CoreValue, Testimonial,
+    CompanyHistory, CompanyStatistic, ClientLogo
+)
+
+# Generate responsive renditions off the request thread when images change
+watch_images(TeamMember, 'image')
+watch_images(ClientLogo, 'logo')
+
+# Invalidate cached API responses whenever this app's content changes
+watch_models(
+    AboutPage, TeamMember, CoreValue, Testimonial,
+    CompanyHistory, CompanyStatistic, ClientLogo
+)
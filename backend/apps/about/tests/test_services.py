@@ -0,0 +1,61 @@
+import json
+from io import StringIO
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncRequestFactory, TestCase, RequestFactory, override_settings
+from ..models import AboutPage, CoreValue
+from ..services import get_about_page_content
+from ..views import CombinedAboutAsyncView
+
+
+@override_settings(ABOUT_CACHE_ENABLED=True)
+class AboutPageContentCacheTest(TestCase):
+    """Test the cached combined About page payload"""
+
+    def setUp(self):
+        self.request = RequestFactory().get('/api/v1/about/combined/')
+        AboutPage.objects.create(title='About', title_ar='عنا')
+        self.value = CoreValue.objects.create(
+            title='Quality', title_ar='الجودة',
+            description='We care', description_ar='نهتم', order=1
+        )
+
+    def test_content_is_built_once_per_language(self):
+        """Test that the payload costs one query per model and is then cached"""
+        # about page + six related lists, no extra count queries
+        with self.assertNumQueries(7):
+            data = get_about_page_content('en', self.request)
+        with self.assertNumQueries(0):
+            cached = get_about_page_content('en', self.request)
+
+        self.assertEqual(data, cached)
+        self.assertEqual(data['metadata']['values_count'], 1)
+        self.assertEqual(get_about_page_content('ar', self.request)['core_values'][0]['title'], 'الجودة')
+
+    def test_saving_content_invalidates_cache(self):
+        """Test that an admin edit is visible on the next call"""
+        get_about_page_content('en', self.request)
+
+        self.value.title = 'Craft'
+        self.value.save()
+
+        data = get_about_page_content('en', self.request)
+        self.assertEqual(data['core_values'][0]['title'], 'Craft')
+
+    def test_warm_command_fills_cache(self):
+        """Test that the warm command pre-builds both languages"""
+        call_command('warm_about_cache', '--host', 'testserver', '--scheme', 'http', stdout=StringIO())
+
+        with self.assertNumQueries(0):
+            get_about_page_content('en', self.request)
+            get_about_page_content('ar', self.request)
+
+    def test_async_view_serves_the_warmed_payload(self):
+        """Test that the ASGI view answers from the warmed cache with only the validators query"""
+        call_command('warm_about_cache', '--host', 'testserver', '--scheme', 'http', stdout=StringIO())
+        view = async_to_sync(CombinedAboutAsyncView.as_view())
+
+        with self.assertNumQueries(1):
+            response = view(AsyncRequestFactory().get('/api/v1/about/combined/?lang=ar'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), get_about_page_content('ar', self.request))
@@ -1,3 +1,5 @@
+import logging
+
 from django.utils.translation import gettext_lazy as _
 from django.core.cache import cache
 from django.conf import settings
@@ -19,7 +21,13 @@ from .serializers import (
     TestimonialSerializer, CompanyHistorySerializer, CompanyStatisticSerializer,
     ClientLogoSerializer, LocalizedAboutPageSerializer
 )
-from .services import get_about_page_content
+from .services import get_about_page_content, get_about_cache_key
+from asgiref.sync import sync_to_async
+from utils.async_views import AsyncCachedReadView
+from utils.http import conditional_response
+from utils.instrumentation import record_cache_lookup
+
+logger = logging.getLogger(__name__)
 
 class AboutPageView(generics.RetrieveAPIView):
     """
@@ -85,7 +93,13 @@ class CombinedAboutView(APIView):
     - Company statistics
     - Company history events
     """
-    def get(self, request):
+    cache_models = [
+        AboutPage, TeamMember, CoreValue, Testimonial,
+        CompanyHistory, CompanyStatistic, ClientLogo
+    ]
+    
+    def get_language(self):
+        request = self.request
         # Prioritize language from headers, then query params
         language = request.headers.get('Accept-Language')
         
@@ -100,13 +114,37 @@ class CombinedAboutView(APIView):
         # Default to English if no language is specified
         if not language or language not in ['en', 'ar']:
             language = 'en'
-            
-        print(f"CombinedAboutView: Using language '{language}', from headers={request.headers.get('Accept-Language')}")
+        
+        return language
+    
+    # The payload is cached by get_about_page_content (see warm_about_cache),
+    # so the view isn't wrapped in cache_response as well
+    @conditional_response()
+    def get(self, request):
+        language = self.get_language()
+        logger.debug(
+            "CombinedAboutView: Using language '%s', from headers=%s",
+            language, request.headers.get('Accept-Language')
+        )
         
         combined_data = get_about_page_content(language, request)
         return Response(combined_data)
 
 
+class CombinedAboutAsyncView(AsyncCachedReadView):
+    """CombinedAboutView for ASGI deployments"""
+    drf_view = CombinedAboutView
+
+    async def get_cached_data(self, drf_view, drf_request, kwargs):
+        """Hits come from the About payload cache that warm_about_cache fills"""
+        if not settings.ABOUT_CACHE_ENABLED:
+            return None
+        key = await sync_to_async(get_about_cache_key)(drf_view.get_language(), drf_request)
+        data = await cache.aget(key)
+        record_cache_lookup(data is not None)
+        return None if data is None else (data, status.HTTP_200_OK)
+
+
 class TeamMemberViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for team members
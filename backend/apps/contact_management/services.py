@@ -0,0 +1,64 @@
+import logging
+from django.conf import settings
+from django.template.loader import render_to_string
+from apps.email_system.services import queue_email
+
+logger = logging.getLogger(__name__)
+
+
+def queue_admin_notification(contact_message, lang='en'):
+    """Write the notification email for the admins to the outbox"""
+    subject = f"New Contact Message from {contact_message.name}"
+
+    # Create email context
+    context = {
+        'name': contact_message.name,
+        'email': contact_message.email,
+        'phone': contact_message.phone,
+        'message': contact_message.message,
+        'created_at': contact_message.created_at,
+        'lang': lang  # Pass language preference to templates
+    }
+
+    # Get recipients from settings or use default
+    recipients = getattr(settings, 'CONTACT_NOTIFICATION_EMAILS', ['info@archwaydesign.com'])
+
+    return queue_email(
+        subject,
+        render_to_string('contact/email_notification.txt', context),
+        recipients,
+        html_body=render_to_string('contact/email_notification.html', context),
+        category='contact.admin_notification',
+        reference=contact_message.pk,
+    )
+
+
+def queue_client_confirmation(contact_message, lang='en'):
+    """Write the confirmation email for the client to the outbox"""
+    # Determine subject based on language
+    subject = "Thank you for contacting Archway Design" if lang == 'en' else "شكراً للتواصل مع آركواي للتصميم"
+
+    # Create email context
+    context = {
+        'name': contact_message.name,
+        'lang': lang  # Pass language preference to templates
+    }
+
+    return queue_email(
+        subject,
+        render_to_string('contact/client_confirmation.txt', context),
+        [contact_message.email],
+        html_body=render_to_string('contact/client_confirmation.html', context),
+        category='contact.client_confirmation',
+        reference=contact_message.pk,
+    )
+
+
+def queue_contact_notifications(contact_message, lang='en'):
+    """
+    Queue both emails for a new contact message.
+    Call inside the transaction that saves the message.
+    """
+    queue_admin_notification(contact_message, lang)
+    queue_client_confirmation(contact_message, lang)
+    logger.info(f"Queued notification emails for contact message from {contact_message.email}")
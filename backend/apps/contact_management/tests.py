@@ -1,3 +1,50 @@
-from django.test import TestCase
+from unittest import mock
+from django.core import mail
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from apps.email_system.models import OutboxEmail
+from apps.email_system.services import dispatch_outbox
+from .models import ContactMessage
 
-# Create your tests here.
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    CONTACT_NOTIFICATION_EMAILS=['team@example.com'],
+)
+class ContactNotificationTest(TestCase):
+    """Test that contact notifications go through the email outbox"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def submit(self):
+        return self.client.post('/api/v1/contact/', {
+            'name': 'Dana', 'email': 'dana@example.com', 'message': 'We need a kitchen redesign.'
+        }, format='json')
+
+    def test_submission_queues_emails_without_sending(self):
+        """Test that the view only writes the message and its outbox rows"""
+        response = self.submit()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        message = ContactMessage.objects.get()
+        emails = OutboxEmail.objects.filter(reference=str(message.pk))
+        self.assertEqual(
+            sorted(emails.values_list('category', flat=True)),
+            ['contact.admin_notification', 'contact.client_confirmation']
+        )
+
+        self.assertEqual(dispatch_outbox(), 2)
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['dana@example.com', 'team@example.com'])
+        self.assertFalse(emails.exclude(status=OutboxEmail.STATUS_SENT).exists())
+
+    def test_emails_roll_back_with_the_message(self):
+        """Test that a failed save leaves no orphan outbox rows"""
+        with mock.patch('apps.contact_management.views.queue_contact_notifications', side_effect=RuntimeError):
+            response = self.submit()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ContactMessage.objects.exists())
+        self.assertFalse(OutboxEmail.objects.exists())
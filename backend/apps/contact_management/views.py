@@ -2,14 +2,14 @@ from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from django.conf import settings
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.db import transaction
 from django.utils.translation import gettext as _
 from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
 import logging
 from .models import ContactMessage, ContactInfo
 from .serializers import ContactMessageSerializer, ContactInfoSerializer
+from .services import queue_contact_notifications
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -34,20 +34,13 @@ class ContactViewSet(viewsets.GenericViewSet):
             serializer = self.get_serializer(data=request.data)
             
             if serializer.is_valid():
-                # Save the message to the database
-                contact_message = serializer.save()
+                # The message and its notification emails commit together;
+                # the outbox dispatcher sends the emails, so SMTP never delays the response
+                with transaction.atomic():
+                    contact_message = serializer.save()
+                    queue_contact_notifications(contact_message, lang)
                 logger.info(f"Contact message received from {contact_message.email}")
                 
-                try:
-                    # Send email notification to admin
-                    self._send_admin_notification(contact_message, lang)
-                    
-                    # Send confirmation email to client
-                    self._send_client_confirmation(contact_message, lang)
-                except Exception as e:
-                    # Log the error but don't return an error to the user
-                    logger.error(f"Error sending notification email: {e}")
-                
                 return Response(
                     {"message": _("Your message has been sent successfully!")},
                     status=status.HTTP_201_CREATED
@@ -67,66 +60,6 @@ class ContactViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
-    def _send_admin_notification(self, contact_message, lang='en'):
-        """Send notification email to admin"""
-        subject = f"New Contact Message from {contact_message.name}"
-        
-        # Create email context
-        context = {
-            'name': contact_message.name,
-            'email': contact_message.email,
-            'phone': contact_message.phone,
-            'message': contact_message.message,
-            'created_at': contact_message.created_at,
-            'lang': lang  # Pass language preference to templates
-        }
-        
-        # Render email templates
-        html_message = render_to_string('contact/email_notification.html', context)
-        plain_message = render_to_string('contact/email_notification.txt', context)
-        
-        # Get recipients from settings or use default
-        recipients = getattr(settings, 'CONTACT_NOTIFICATION_EMAILS', ['info@archwaydesign.com'])
-        
-        # Send email
-        send_mail(
-            subject,
-            plain_message,
-            settings.DEFAULT_FROM_EMAIL,
-            recipients,
-            html_message=html_message,
-            fail_silently=False
-        )
-        
-        logger.info(f"Admin notification email sent for contact message from {contact_message.email}")
-    
-    def _send_client_confirmation(self, contact_message, lang='en'):
-        """Send confirmation email to client"""
-        # Determine subject based on language
-        subject = "Thank you for contacting Archway Design" if lang == 'en' else "شكراً للتواصل مع آركواي للتصميم"
-        
-        # Create email context
-        context = {
-            'name': contact_message.name,
-            'lang': lang  # Pass language preference to templates
-        }
-        
-        # Render email templates
-        html_message = render_to_string('contact/client_confirmation.html', context)
-        plain_message = render_to_string('contact/client_confirmation.txt', context)
-        
-        # Send email to client
-        send_mail(
-            subject,
-            plain_message,
-            settings.DEFAULT_FROM_EMAIL,
-            [contact_message.email],
-            html_message=html_message,
-            fail_silently=False
-        )
-        
-        logger.info(f"Client confirmation email sent to {contact_message.email}")
-
 class ContactInfoViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for retrieving company contact information.
@@ -1,7 +1,8 @@
 from django.contrib import admin
+from django.utils import timezone
 from .models import (
     EmailDelivery, LinkClick, NewsletterAutomation, 
-    AutomationStep, AutomationExecution, EmailConfiguration
+    AutomationStep, AutomationExecution, EmailConfiguration, OutboxEmail
 )
 
 
@@ -97,7 +98,7 @@ class AutomationExecutionAdmin(admin.ModelAdmin):
     list_filter = ('status', 'started_at')
     search_fields = ('automation__name', 'subscriber__email')
     ordering = ('-started_at',)
-    readonly_fields = ('automation', 'subscriber', 'started_at')
+    readonly_fields = ('automation', 'subscriber', 'started_at', 'attempts', 'last_error')
     
     def automation_name(self, obj):
         return obj.automation.name
@@ -148,3 +149,26 @@ class EmailConfigurationAdmin(admin.ModelAdmin):
             self.message_user(request, f"Email configuration '{obj.name}' is now active and will be used for all emails")
         else:
             self.message_user(request, f"Email configuration '{obj.name}' has been saved but is not active")
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """Read-only delivery log of outbox emails; search by reference to find a record's emails"""
+    list_display = ('subject', 'category', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'category', 'created_at')
+    search_fields = ('reference', 'subject', 'recipients')
+    ordering = ('-created_at',)
+    actions = ['retry_now']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=OutboxEmail.STATUS_SENT).update(
+            status=OutboxEmail.STATUS_QUEUED, attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f"{updated} emails queued for another attempt.")
+    retry_now.short_description = "Retry selected emails now"
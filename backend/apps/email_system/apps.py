@@ -5,3 +5,6 @@ class EmailSystemConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.email_system'
     verbose_name = 'Email System'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,315 @@
+"""
+Pooled SMTP email backend.
+
+Django's SMTP backend opens a TLS session, logs in and quits for every
+`send_mail` call. PooledEmailBackend keeps authenticated sessions open per
+process instead, one pool per set of connection settings (host, port, user,
+password, TLS), so each EmailConfiguration gets its own pool.
+
+- A session idle for longer than EMAIL_POOL_CHECK_AFTER seconds is checked
+  with NOOP before use; dead sockets are closed and replaced.
+- Sessions idle for longer than EMAIL_POOL_MAX_IDLE seconds are closed
+  without a check, since most servers have dropped them by then.
+- At most EMAIL_POOL_SIZE sessions per pool are checked out at once. Further
+  senders wait up to EMAIL_POOL_TIMEOUT seconds, then EmailPoolTimeout is
+  raised, which keeps a process within the provider's connection limit.
+
+Use it by setting EMAIL_BACKEND to 'apps.email_system.backends.PooledEmailBackend'.
+Configurations stored with Django's SMTP backend are then pooled too.
+"""
+import logging
+import smtplib
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.smtp import EmailBackend as SMTPEmailBackend
+
+logger = logging.getLogger(__name__)
+
+POOLED_BACKEND = 'apps.email_system.backends.PooledEmailBackend'
+SMTP_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class EmailPoolTimeout(smtplib.SMTPException):
+    """No pooled connection became free in time"""
+
+
+def is_connection_error(error):
+    """
+    True if the session itself is gone and must not be reused.
+
+    SMTPException subclasses OSError, so refusals of a recipient, sender
+    or message are told apart from dropped sockets here; after those the
+    server is still talking to us. A 421 reply means it is closing the
+    session.
+    """
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+def resolve_backend(path):
+    """Backend to use for a configuration's `email_backend`, pooling plain SMTP when enabled"""
+    if path == SMTP_BACKEND and settings.EMAIL_BACKEND == POOLED_BACKEND:
+        return POOLED_BACKEND
+    return path
+
+
+class SMTPConnectionPool:
+    """Open SMTP sessions for one set of connection settings"""
+
+    def __init__(self, options, size, timeout, check_after, max_idle):
+        self.options = options
+        self.size = size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.max_idle = max_idle
+        self.label = f"{options['username']}@{options['host']}:{options['port']}"
+        # Most recently returned session last, so reuse favours warm sockets
+        self._idle = deque()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._counters = Counter()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _open(self):
+        connection = SMTPEmailBackend(fail_silently=False, **self.options)
+        connection.open()
+        self._count('created')
+        return connection
+
+    def _discard(self, connection):
+        self._count('discarded')
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _is_alive(self, connection):
+        try:
+            return connection.connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def acquire(self):
+        """
+        Check out an open session, waiting for a free slot if the pool is busy.
+
+        Raises:
+            EmailPoolTimeout: No slot became free within the pool timeout
+        """
+        started = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            self._count('waits')
+            if not self._slots.acquire(timeout=self.timeout):
+                self._count('timeouts')
+                raise EmailPoolTimeout(f"No connection to {self.label} became free within {self.timeout}s")
+            self._count('wait_seconds', time.monotonic() - started)
+
+        try:
+            connection = None
+            while connection is None:
+                with self._lock:
+                    item = self._idle.pop() if self._idle else None
+                if item is None:
+                    connection = self._open()
+                    break
+                connection, returned_at = item
+                idle = time.monotonic() - returned_at
+                if idle > self.max_idle:
+                    self._count('expired')
+                    self._discard(connection)
+                    connection = None
+                elif idle > self.check_after and not self._is_alive(connection):
+                    self._count('health_check_failures')
+                    logger.warning(f"Replacing dead SMTP connection to {self.label}")
+                    self._discard(connection)
+                    connection = None
+                else:
+                    self._count('reused')
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+        return connection
+
+    def release(self, connection, reusable=True):
+        """Return a checked-out session, closing it if it can't be reused"""
+        if reusable and connection.connection is not None:
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+        else:
+            self._discard(connection)
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
+
+    def close(self):
+        """Close every idle session"""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                'size': self.size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+            }
+            for name in ('created', 'reused', 'expired', 'health_check_failures', 'discarded',
+                         'waits', 'timeouts', 'sent', 'failed'):
+                stats[name] = self._counters[name]
+            stats['wait_seconds'] = round(self._counters['wait_seconds'], 3)
+        return stats
+
+
+def get_pool(options):
+    """The process-wide pool for a set of SMTP connection settings"""
+    key = tuple(sorted(options.items()))
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SMTPConnectionPool(
+                options,
+                size=settings.EMAIL_POOL_SIZE,
+                timeout=settings.EMAIL_POOL_TIMEOUT,
+                check_after=settings.EMAIL_POOL_CHECK_AFTER,
+                max_idle=settings.EMAIL_POOL_MAX_IDLE,
+            )
+            _pools[key] = pool
+    return pool
+
+
+def get_pool_stats():
+    """Counters of every pool in this process, keyed by user@host:port"""
+    return {pool.label: pool.stats() for pool in list(_pools.values())}
+
+
+def close_pools():
+    """Close every idle session and forget the pools"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+class PooledEmailBackend(BaseEmailBackend):
+    """
+    Drop-in replacement for Django's SMTP backend that sends over pooled sessions.
+
+    Takes the same arguments and settings as the SMTP backend. Used as a
+    context manager, it keeps one session checked out for the whole block;
+    otherwise each send_messages() call checks one out and returns it.
+    """
+
+    def __init__(self, host=None, port=None, username=None, password=None, use_tls=None,
+                 fail_silently=False, use_ssl=None, timeout=None, ssl_keyfile=None,
+                 ssl_certfile=None, **kwargs):
+        super().__init__(fail_silently=fail_silently)
+        # The SMTP backend resolves the settings defaults; no connection is opened here
+        smtp = SMTPEmailBackend(
+            host=host, port=port, username=username, password=password, use_tls=use_tls,
+            use_ssl=use_ssl, timeout=timeout, ssl_keyfile=ssl_keyfile, ssl_certfile=ssl_certfile,
+        )
+        self.pool = get_pool({
+            'host': smtp.host,
+            'port': smtp.port,
+            'username': smtp.username,
+            'password': smtp.password,
+            'use_tls': smtp.use_tls,
+            'use_ssl': smtp.use_ssl,
+            'timeout': smtp.timeout,
+            'ssl_keyfile': smtp.ssl_keyfile,
+            'ssl_certfile': smtp.ssl_certfile,
+        })
+        self._held = None
+        self._holding = False
+
+    def open(self):
+        """Check out a session until close(); returns True if one was checked out"""
+        if self._holding:
+            return False
+        try:
+            self._held = self.pool.acquire()
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return False
+        self._holding = True
+        return True
+
+    def close(self):
+        """Return the held session to the pool"""
+        self._holding = False
+        if self._held is not None:
+            connection, self._held = self._held, None
+            self.pool.release(connection)
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+
+        if self._holding and self._held is None:
+            # The held session died during an earlier send; check out a fresh one
+            try:
+                self._held = self.pool.acquire()
+            except Exception:
+                if not self.fail_silently:
+                    raise
+                return 0
+        connection = self._held
+        if connection is None:
+            try:
+                connection = self.pool.acquire()
+            except Exception:
+                if not self.fail_silently:
+                    raise
+                return 0
+
+        sent = 0
+        reusable = True
+        try:
+            for message in email_messages:
+                try:
+                    # The session is already open, so the SMTP backend leaves it open
+                    sent += connection.send_messages([message])
+                except OSError as e:
+                    self.pool._count('failed')
+                    if is_connection_error(e):
+                        reusable = False
+                        if not self.fail_silently:
+                            raise
+                        break
+                    # Refused recipients or data; the session itself is still usable
+                    if not self.fail_silently:
+                        raise
+        finally:
+            self.pool._count('sent', sent)
+            if connection is self._held:
+                if not reusable:
+                    self._held = None
+                    self.pool.release(connection, reusable=False)
+            else:
+                self.pool.release(connection, reusable=reusable)
+        return sent
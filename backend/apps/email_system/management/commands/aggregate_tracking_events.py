@@ -0,0 +1,18 @@
+from apps.email_system.services import TRACKING_BATCH_SIZE, aggregate_tracking_events
+from apps.task_queue.polling import PollingCommand
+
+
+class Command(PollingCommand):
+    help = 'Fold buffered email open/click events into delivery and campaign counters'
+    interval_help = 'Keep running, draining the buffer every N seconds (default: drain once and exit)'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--batch-size', type=int, default=TRACKING_BATCH_SIZE,
+                            help='Events processed per transaction')
+
+    def tick(self, options):
+        return aggregate_tracking_events(batch_size=options['batch_size'])
+
+    def report(self, total, options):
+        self.stdout.write(f"Aggregated {total} tracking events")
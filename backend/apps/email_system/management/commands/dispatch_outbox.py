@@ -0,0 +1,26 @@
+from apps.email_system.backends import get_pool_stats
+from apps.email_system.services import OUTBOX_BATCH_SIZE, dispatch_outbox
+from apps.task_queue.polling import PollingCommand
+
+
+class Command(PollingCommand):
+    help = 'Send queued outbox emails (contact notifications and similar)'
+    interval_help = 'Keep running, checking the outbox every N seconds (default: drain once and exit)'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE,
+                            help='Emails sent per connection')
+
+    def tick(self, options):
+        return dispatch_outbox(limit=options['batch_size'])
+
+    def drained(self, processed, options):
+        # A partial batch means nothing else is due yet
+        return processed < options['batch_size']
+
+    def report(self, total, options):
+        self.stdout.write(f"Dispatched {total} outbox emails")
+        if options['verbosity'] > 1:
+            for label, stats in get_pool_stats().items():
+                self.stdout.write(f"SMTP pool {label}: {stats}")
@@ -0,0 +1,36 @@
+from apps.email_system.backends import get_pool_stats
+from apps.email_system.services import (
+    AUTOMATION_BATCH_SIZE, AUTOMATION_CHUNK_SIZE, AUTOMATION_CONCURRENCY, run_due_automation_steps
+)
+from apps.task_queue.polling import PollingCommand
+
+
+class Command(PollingCommand):
+    help = 'Send due automation steps and advance each execution to its next step'
+    interval_help = 'Keep running, checking for due steps every N seconds (default: drain once and exit)'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--batch-size', type=int, default=AUTOMATION_BATCH_SIZE,
+                            help='Executions claimed per tick')
+        parser.add_argument('--concurrency', type=int, default=AUTOMATION_CONCURRENCY,
+                            help='Threads sending at once, each with its own SMTP connection')
+        parser.add_argument('--chunk-size', type=int, default=AUTOMATION_CHUNK_SIZE,
+                            help='Messages sent per SMTP connection')
+
+    def tick(self, options):
+        return run_due_automation_steps(
+            limit=options['batch_size'],
+            concurrency=options['concurrency'],
+            chunk_size=options['chunk_size'],
+        )
+
+    def drained(self, processed, options):
+        # A partial batch means nothing else is due yet
+        return processed < options['batch_size']
+
+    def report(self, total, options):
+        self.stdout.write(f"Processed {total} automation steps")
+        if options['verbosity'] > 1:
+            for label, stats in get_pool_stats().items():
+                self.stdout.write(f"SMTP pool {label}: {stats}")
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:48
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_system', '0002_transfer_email_system_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackingEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('event_type', models.CharField(choices=[('open', 'Open'), ('click', 'Click')], max_length=10)),
+                ('tracking_key', models.UUIDField()),
+                ('url', models.TextField(blank=True)),
+                ('user_agent', models.TextField(blank=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Tracking Event',
+                'verbose_name_plural': 'Tracking Events',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='emaildelivery',
+            name='tracking_key',
+            field=models.UUIDField(db_index=True, default=uuid.uuid4, editable=False),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_system', '0003_tracking_event'),
+        ('newsletter', '0002_transfer_newsletter_data'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emaildelivery',
+            index=models.Index(fields=['created_at', 'id'], name='delivery_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emaildelivery',
+            index=models.Index(fields=['campaign', 'created_at', 'id'], name='delivery_campaign_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkclick',
+            index=models.Index(fields=['clicked_at', 'id'], name='link_click_clicked_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-18 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_system', '0004_keyset_indexes'),
+        ('newsletter', '0004_dynamic_segments'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emaildelivery',
+            index=models.Index(fields=['subscriber', 'opened_at'], name='delivery_subscriber_opened_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkclick',
+            index=models.Index(fields=['url', 'delivery'], name='link_click_url_idx'),
+        ),
+    ]
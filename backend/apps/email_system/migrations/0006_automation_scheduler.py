@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-18 04:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_system', '0005_segment_rule_indexes'),
+        ('newsletter', '0004_dynamic_segments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='automationexecution',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0, help_text='Send attempts of the current step'),
+        ),
+        migrations.AddField(
+            model_name='automationexecution',
+            name='last_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='automationexecution',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='automationexecution',
+            index=models.Index(fields=['status', 'next_step_scheduled_at'], name='automation_exec_due_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_system', '0007_outbox_email'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='linkclick',
+            name='clicked_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='linkclick',
+            name='url',
+            field=models.URLField(max_length=2048),
+        ),
+    ]
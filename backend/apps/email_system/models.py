@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.utils import timezone
 
 # Import models from other apps to avoid circular imports
 from apps.newsletter.models import NewsletterSubscription, NewsletterCampaign, NewsletterTemplate, SubscriberSegment
@@ -22,7 +23,7 @@ class EmailDelivery(models.Model):
     campaign = models.ForeignKey(NewsletterCampaign, on_delete=models.CASCADE, related_name='deliveries')
     subscriber = models.ForeignKey(NewsletterSubscription, on_delete=models.CASCADE, related_name='received_emails')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
-    tracking_key = models.UUIDField(default=uuid.uuid4, editable=False)
+    tracking_key = models.UUIDField(default=uuid.uuid4, editable=False, db_index=True)
     sent_at = models.DateTimeField(null=True, blank=True)
     delivered_at = models.DateTimeField(null=True, blank=True)
     opened_at = models.DateTimeField(null=True, blank=True)
@@ -38,6 +39,13 @@ class EmailDelivery(models.Model):
         verbose_name_plural = "Email Deliveries"
         ordering = ['-created_at']
         unique_together = ('campaign', 'subscriber')
+        indexes = [
+            # Keyset pagination on (created_at, id), overall and per campaign
+            models.Index(fields=['created_at', 'id'], name='delivery_created_idx'),
+            models.Index(fields=['campaign', 'created_at', 'id'], name='delivery_campaign_created_idx'),
+            # Engagement rules of dynamic segments ("opened in the last N days")
+            models.Index(fields=['subscriber', 'opened_at'], name='delivery_subscriber_opened_idx'),
+        ]
 
     def __str__(self):
         return f"{self.campaign.name} to {self.subscriber.email}"
@@ -47,8 +55,10 @@ class LinkClick(models.Model):
     """Tracks clicks on links within campaign emails"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     delivery = models.ForeignKey(EmailDelivery, on_delete=models.CASCADE, related_name='link_clicks')
-    url = models.URLField()
-    clicked_at = models.DateTimeField(auto_now_add=True)
+    # Room for long tracked links; longer ones are cut when the click is aggregated
+    url = models.URLField(max_length=2048)
+    # Time of the hit, copied from the buffered TrackingEvent
+    clicked_at = models.DateTimeField(default=timezone.now)
     user_agent = models.TextField(blank=True)
     ip_address = models.GenericIPAddressField(blank=True, null=True)
 
@@ -56,11 +66,47 @@ class LinkClick(models.Model):
         verbose_name = "Link Click"
         verbose_name_plural = "Link Clicks"
         ordering = ['-clicked_at']
+        indexes = [
+            # Keyset pagination on (clicked_at, id)
+            models.Index(fields=['clicked_at', 'id'], name='link_click_clicked_idx'),
+            # "Clicked a URL" rules of dynamic segments
+            models.Index(fields=['url', 'delivery'], name='link_click_url_idx'),
+        ]
 
     def __str__(self):
         return f"Click on {self.url} by {self.delivery.subscriber.email}"
 
 
+class TrackingEvent(models.Model):
+    """
+    Raw open/click hit recorded by the tracking endpoints.
+    Append-only buffer: rows are folded into EmailDelivery and campaign
+    counters by aggregate_tracking_events and then deleted.
+    """
+    EVENT_OPEN = 'open'
+    EVENT_CLICK = 'click'
+    EVENT_CHOICES = [
+        (EVENT_OPEN, 'Open'),
+        (EVENT_CLICK, 'Click'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    event_type = models.CharField(max_length=10, choices=EVENT_CHOICES)
+    tracking_key = models.UUIDField()
+    url = models.TextField(blank=True)
+    user_agent = models.TextField(blank=True)
+    ip_address = models.GenericIPAddressField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Tracking Event"
+        verbose_name_plural = "Tracking Events"
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.event_type} for {self.tracking_key}"
+
+
 class NewsletterAutomation(models.Model):
     """Automated email sequences for subscribers"""
     TRIGGER_CHOICES = [
@@ -111,12 +157,16 @@ class AutomationStep(models.Model):
 
 
 class AutomationExecution(models.Model):
-    """Tracks the execution of automation sequences for subscribers"""
+    """
+    Tracks the execution of automation sequences for subscribers.
+    Due steps are claimed and sent by `manage.py run_automation_scheduler`.
+    """
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('in_progress', 'In Progress'),
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
+        ('failed', 'Failed'),
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -127,12 +177,18 @@ class AutomationExecution(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     current_step = models.ForeignKey(AutomationStep, on_delete=models.SET_NULL, null=True, blank=True, related_name='executions')
     next_step_scheduled_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0, help_text="Send attempts of the current step")
+    last_error = models.TextField(blank=True)
 
     class Meta:
         verbose_name = "Automation Execution"
         verbose_name_plural = "Automation Executions"
         ordering = ['-started_at']
         unique_together = ('automation', 'subscriber')
+        indexes = [
+            # Due steps claimed by the scheduler
+            models.Index(fields=['status', 'next_step_scheduled_at'], name='automation_exec_due_idx'),
+        ]
 
     def __str__(self):
         return f"{self.automation.name} for {self.subscriber.email}"
@@ -165,3 +221,49 @@ class EmailConfiguration(models.Model):
         if self.active:
             EmailConfiguration.objects.exclude(pk=self.pk).update(active=False)
         super().save(*args, **kwargs)
+
+
+class OutboxEmail(models.Model):
+    """
+    Transactional outbox for one-off emails (contact notifications and similar).
+
+    Rows are written in the same transaction as the data they describe and
+    sent by `manage.py dispatch_outbox`, so a request never waits on SMTP and
+    an email is never lost or sent for a rolled-back write.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    category = models.CharField(max_length=100, help_text="What the email is for, e.g. contact.client_confirmation")
+    reference = models.CharField(max_length=100, blank=True, db_index=True, help_text="ID of the record the email is about")
+    from_email = models.CharField(max_length=254, blank=True, help_text="Empty for the active configuration's sender")
+    recipients = models.JSONField(default=list)
+    subject = models.CharField(max_length=255)
+    text_body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Outbox Email"
+        verbose_name_plural = "Outbox Emails"
+        ordering = ['-created_at']
+        indexes = [
+            # Due rows claimed by the dispatcher
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_email_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.recipients)} ({self.get_status_display()})"
@@ -0,0 +1,739 @@
+import logging
+import smtplib
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
+from django.db import DatabaseError, transaction
+from django.db.models import Case, DateTimeField, F, Prefetch, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.newsletter.models import NewsletterCampaign
+from apps.task_queue.services import heartbeat, retry_delay
+from utils.cache import get_model_versions
+from .backends import resolve_backend
+from .models import (
+    EmailConfiguration, EmailDelivery, LinkClick, NewsletterAutomation, AutomationExecution, AutomationStep,
+    OutboxEmail, TrackingEvent
+)
+from .rendering import get_render_plan
+
+logger = logging.getLogger(__name__)
+
+# Process-local copy of the active configuration as (version, configuration).
+# The version comes from the shared cache and is bumped by the post_save /
+# post_delete signals wired in signals.py, so every worker reloads after an
+# admin edit without querying on each send.
+_configuration_cache = None
+_configuration_lock = threading.Lock()
+
+
+def get_active_email_configuration():
+    """
+    Return the active EmailConfiguration, or None to use the settings defaults.
+    Only queries the database when the configuration has changed.
+    """
+    global _configuration_cache
+
+    version = get_model_versions([EmailConfiguration])[0]
+    cached = _configuration_cache
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _configuration_lock:
+        cached = _configuration_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        try:
+            configuration = EmailConfiguration.objects.filter(active=True).order_by('-updated_at').first()
+        except Exception as e:
+            logger.error(f"Error loading email settings from database: {str(e)}")
+            return None
+
+        _configuration_cache = (version, configuration)
+        if configuration:
+            logger.debug(f"Loaded email configuration '{configuration.name}' ({configuration.email_host}:{configuration.email_port})")
+        return configuration
+
+
+def get_email_connection(fail_silently=False):
+    """
+    Build a mail connection for the active configuration.
+    Settings are passed to the backend per connection; global settings are never modified.
+    """
+    configuration = get_active_email_configuration()
+    if not configuration:
+        return get_connection(fail_silently=fail_silently)
+
+    return get_connection(
+        backend=resolve_backend(configuration.email_backend),
+        fail_silently=fail_silently,
+        host=configuration.email_host,
+        port=configuration.email_port,
+        username=configuration.email_host_user,
+        password=configuration.email_host_password,
+        use_tls=configuration.email_use_tls,
+    )
+
+
+def get_default_from_email():
+    """Sender address of the active configuration, falling back to DEFAULT_FROM_EMAIL"""
+    configuration = get_active_email_configuration()
+    if configuration and configuration.default_from_email:
+        return configuration.default_from_email
+    return settings.DEFAULT_FROM_EMAIL
+
+
+def send_email(subject, message, recipient_list, html_message=None, from_email=None,
+               fail_silently=False, connection=None):
+    """
+    Send an email through the active configuration.
+    Drop-in replacement for django.core.mail.send_mail.
+    """
+    return send_mail(
+        subject,
+        message,
+        from_email or get_default_from_email(),
+        recipient_list,
+        html_message=html_message,
+        fail_silently=fail_silently,
+        connection=connection or get_email_connection(fail_silently=fail_silently),
+    )
+
+
+# Delivery states that mean the subscriber has already been handled
+DELIVERY_DONE_STATUSES = ['sent', 'delivered', 'opened', 'clicked', 'bounced', 'failed', 'unsubscribed']
+
+# Recipients handled per round trip; the campaign status is re-read between
+# batches so a cancellation stops a long send
+CAMPAIGN_BATCH_SIZE = 500
+
+# Tracking events folded into the counters per transaction
+TRACKING_BATCH_SIZE = 1000
+
+# Automation scheduler: executions claimed per tick, sending threads,
+# messages per SMTP connection, claim lease and send attempts per step
+AUTOMATION_BATCH_SIZE = 1000
+AUTOMATION_CONCURRENCY = 4
+AUTOMATION_CHUNK_SIZE = 50
+AUTOMATION_LEASE_SECONDS = 600
+AUTOMATION_MAX_ATTEMPTS = 5
+AUTOMATION_DUE_STATUSES = ['pending', 'in_progress']
+
+# Outbox dispatcher: emails claimed per tick and the claim lease
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_LEASE_SECONDS = 300
+
+
+def queue_email(subject, text_body, recipients, html_body='', category='', reference='', from_email=''):
+    """
+    Write an email to the outbox for `manage.py dispatch_outbox` to send.
+
+    Call it inside the transaction that saves the data the email is about:
+    the email is only sent if that transaction commits.
+    """
+    return OutboxEmail.objects.create(
+        category=category,
+        reference=str(reference),
+        from_email=from_email,
+        recipients=list(recipients),
+        subject=subject[:255],
+        text_body=text_body,
+        html_body=html_body,
+    )
+
+
+def _error_message(error):
+    return str(error) or error.__class__.__name__
+
+
+def dispatch_outbox(limit=OUTBOX_BATCH_SIZE, lease_seconds=OUTBOX_LEASE_SECONDS):
+    """
+    Send one batch of due outbox emails over a single connection.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    dispatchers can run at once, and leased by moving next_attempt_at ahead:
+    if the dispatcher dies mid-batch, the rows come due again. Failed sends
+    are retried with exponential backoff until max_attempts, then marked
+    failed; the outcome of every row is written with one bulk UPDATE.
+
+    Returns:
+        int: Number of emails processed
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmail.STATUS_QUEUED, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:limit]
+        )
+        if not emails:
+            return 0
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            next_attempt_at=now + timedelta(seconds=lease_seconds),
+            attempts=F('attempts') + 1,
+        )
+
+    default_from_email = get_default_from_email()
+    connection = get_email_connection()
+    errors = {}
+    try:
+        with connection:
+            for email in emails:
+                message = EmailMultiAlternatives(
+                    email.subject, email.text_body, email.from_email or default_from_email, email.recipients,
+                    connection=connection
+                )
+                if email.html_body:
+                    message.attach_alternative(email.html_body, 'text/html')
+                try:
+                    connection.send_messages([message])
+                    errors[email.id] = None
+                except Exception as e:
+                    errors[email.id] = _error_message(e)
+    except Exception as e:
+        # The connection could not be opened; every unsent email is retried
+        for email in emails:
+            errors.setdefault(email.id, _error_message(e))
+
+    now = timezone.now()
+    sent = 0
+    for email in emails:
+        email.attempts += 1
+        error = errors[email.id]
+        if error is None:
+            email.status = OutboxEmail.STATUS_SENT
+            email.sent_at = now
+            email.last_error = ''
+            sent += 1
+            continue
+        email.last_error = error
+        logger.error(f"Outbox email {email.id} ({email.category}) failed on attempt {email.attempts}: {error}")
+        if email.attempts >= email.max_attempts:
+            email.status = OutboxEmail.STATUS_FAILED
+        else:
+            email.next_attempt_at = now + timedelta(seconds=retry_delay(email.attempts))
+    OutboxEmail.objects.bulk_update(emails, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+
+    logger.info(f"Dispatched {sent} of {len(emails)} outbox emails")
+    return len(emails)
+
+
+def build_campaign_message(subscriber, delivery, plans, from_email, connection):
+    """Personalized, tracked message for one campaign recipient"""
+    plan = plans.get(subscriber.language_preference) or plans['en']
+    subject, html, text = plan.render(subscriber, delivery.tracking_key)
+    message = EmailMultiAlternatives(subject, text, from_email, [subscriber.email], connection=connection)
+    message.attach_alternative(html, 'text/html')
+    return message
+
+
+def is_rejection(error):
+    """
+    Whether a mail error rejects this one message for good (refused
+    recipient, permanent 5xx on the message), rather than the connection
+    or the moment.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPDataError) and error.smtp_code >= 500
+
+
+def send_campaign(campaign_id, batch_size=CAMPAIGN_BATCH_SIZE):
+    """
+    Send a campaign to every recipient that has not been handled yet.
+
+    Recipients are processed in batches: delivery rows are bulk created,
+    messages go out over one open connection, and delivery statuses and
+    campaign counters are written with one query each per batch.
+
+    Safe to run again after an interruption: subscribers with a finished
+    delivery record are skipped, so a restarted job resumes where it stopped.
+
+    Only refused recipients and rejected messages are recorded as failed.
+    When the mail connection drops, the remaining recipients stay pending
+    and the connection is reopened; if nothing gets through on the new
+    connection the error is raised so the job retries later.
+    """
+    # A scheduled campaign starts sending when its job comes due
+    NewsletterCampaign.objects.filter(pk=campaign_id, status='scheduled').update(status='sending')
+
+    campaign = NewsletterCampaign.objects.select_related('template').get(pk=campaign_id)
+    if campaign.status != 'sending':
+        logger.info(f"Campaign '{campaign.name}' is {campaign.status}, not sending")
+        return
+
+    handled = EmailDelivery.objects.filter(
+        campaign=campaign, status__in=DELIVERY_DONE_STATUSES
+    ).values('subscriber_id')
+    recipients = campaign.get_all_subscribers().exclude(id__in=handled).order_by('id')
+    if not campaign.total_recipients:
+        campaign.total_recipients = campaign.get_all_subscribers().count()
+        campaign.save(update_fields=['total_recipients'])
+
+    # Links, tracking and the text part only depend on the language, so compile them once
+    plans = {lang: get_render_plan(campaign.template, lang, tracked=True) for lang in ('en', 'ar')}
+
+    from_email = get_default_from_email()
+    connection = get_email_connection()
+    last_id = None
+    # Whether anything was sent since the connection was last (re)opened
+    progressed = False
+    with connection:
+        while True:
+            if not heartbeat():
+                logger.warning(f"Campaign '{campaign.name}' was taken over by another worker, stopping")
+                return
+
+            # Each batch holds the campaign row lock, so concurrent runs of the
+            # same campaign take turns and pick recipients only after the
+            # other run's batch is committed
+            with transaction.atomic():
+                campaign.status = NewsletterCampaign.objects.select_for_update().values_list(
+                    'status', flat=True
+                ).get(pk=campaign.pk)
+                if campaign.status != 'sending':
+                    logger.info(f"Campaign '{campaign.name}' was {campaign.status} mid-send, stopping")
+                    return
+
+                batch_qs = recipients if last_id is None else recipients.filter(id__gt=last_id)
+                subscribers = list(batch_qs[:batch_size])
+                if not subscribers:
+                    break
+
+                # Reuse pending rows left by an interrupted run, create the rest
+                deliveries = {
+                    delivery.subscriber_id: delivery
+                    for delivery in EmailDelivery.objects.filter(
+                        campaign=campaign, subscriber_id__in=[subscriber.id for subscriber in subscribers]
+                    )
+                }
+                new_deliveries = [
+                    EmailDelivery(campaign=campaign, subscriber=subscriber)
+                    for subscriber in subscribers if subscriber.id not in deliveries
+                ]
+                EmailDelivery.objects.bulk_create(new_deliveries)
+                deliveries.update((delivery.subscriber_id, delivery) for delivery in new_deliveries)
+
+                sent = failed = 0
+                sent_at = timezone.now()
+                handled = []
+                disconnected = None
+                for subscriber in subscribers:
+                    delivery = deliveries[subscriber.id]
+                    message = build_campaign_message(subscriber, delivery, plans, from_email, connection)
+                    # One message per call so a failure is attributed to its
+                    # recipient; the connection stays open for the whole send
+                    try:
+                        connection.send_messages([message])
+                    except (OSError, ValueError) as e:
+                        if isinstance(e, OSError) and not is_rejection(e):
+                            # The session is gone, not this recipient: leave the rest of the batch pending
+                            disconnected = e
+                            break
+                        logger.error(f"Failed to send to {subscriber.email}: {str(e)}")
+                        delivery.status = 'failed'
+                        delivery.bounce_reason = str(e)
+                        failed += 1
+                    else:
+                        delivery.status = 'sent'
+                        delivery.sent_at = sent_at
+                        sent += 1
+                    delivery.updated_at = sent_at
+                    handled.append(subscriber)
+
+                EmailDelivery.objects.bulk_update(
+                    [deliveries[subscriber.id] for subscriber in handled],
+                    ['status', 'sent_at', 'bounce_reason', 'updated_at']
+                )
+                NewsletterCampaign.objects.filter(pk=campaign.pk).update(
+                    successful_deliveries=F('successful_deliveries') + sent,
+                    bounces=F('bounces') + failed,
+                )
+
+            if handled:
+                last_id = handled[-1].id
+                progressed = True
+            if disconnected is not None:
+                if not progressed:
+                    # Nothing got through on a fresh connection; let the job retry later
+                    raise disconnected
+                logger.warning(f"Mail connection dropped during campaign '{campaign.name}' ({disconnected}), reconnecting")
+                connection.close()
+                connection.open()
+                progressed = False
+
+    NewsletterCampaign.objects.filter(pk=campaign.pk).update(status='sent', sent_at=timezone.now())
+    campaign.refresh_from_db()
+    logger.info(f"Campaign '{campaign.name}' sent to {campaign.successful_deliveries} subscribers")
+
+
+def start_automations(trigger_type, subscriber):
+    """
+    Start every active automation with this trigger for a subscriber.
+    Subscribers already enrolled in an automation are left alone; the
+    scheduler sends the first step when it comes due.
+    """
+    automations = NewsletterAutomation.objects.filter(is_active=True, trigger_type=trigger_type)
+    for automation in automations:
+        if automation.segment_id and not automation.segment.subscribers.filter(subscriber=subscriber).exists():
+            continue
+
+        execution, created = AutomationExecution.objects.get_or_create(automation=automation, subscriber=subscriber)
+        if not created:
+            continue
+
+        execution.current_step = automation.steps.filter(is_active=True).order_by('order').first()
+        if execution.current_step is None:
+            execution.status = 'completed'
+            execution.completed_at = timezone.now()
+        else:
+            execution.next_step_scheduled_at = timezone.now() + timedelta(
+                days=automation.delay_days + execution.current_step.delay_days
+            )
+        execution.save()
+
+
+def start_segment_automations(segment_id, subscriber_ids):
+    """
+    Enrol subscribers just added to a segment in its 'segment_added' automations.
+
+    The automations and their first steps are loaded once and the executions
+    are written with one bulk INSERT. Returns the number of executions created.
+    """
+    subscriber_ids = list(subscriber_ids)
+    if not subscriber_ids:
+        return 0
+    automations = list(
+        NewsletterAutomation.objects.filter(
+            is_active=True, trigger_type='segment_added', segment_id=segment_id
+        ).prefetch_related(Prefetch(
+            'steps',
+            queryset=AutomationStep.objects.filter(is_active=True).order_by('order'),
+            to_attr='active_steps'
+        ))
+    )
+    if not automations:
+        return 0
+
+    enrolled = set(
+        AutomationExecution.objects.filter(
+            automation__in=automations, subscriber_id__in=subscriber_ids
+        ).values_list('automation_id', 'subscriber_id')
+    )
+    now = timezone.now()
+    executions = []
+    for automation in automations:
+        first_step = automation.active_steps[0] if automation.active_steps else None
+        for subscriber_id in subscriber_ids:
+            if (automation.id, subscriber_id) in enrolled:
+                continue
+            execution = AutomationExecution(automation=automation, subscriber_id=subscriber_id, current_step=first_step)
+            if first_step is None:
+                execution.status = 'completed'
+                execution.completed_at = now
+            else:
+                execution.next_step_scheduled_at = now + timedelta(days=automation.delay_days + first_step.delay_days)
+            executions.append(execution)
+
+    # A concurrent enrolment of the same subscriber is skipped by the unique constraint
+    AutomationExecution.objects.bulk_create(executions, batch_size=1000, ignore_conflicts=True)
+    return len(executions)
+
+
+def claim_due_executions(limit=AUTOMATION_BATCH_SIZE, lease_seconds=AUTOMATION_LEASE_SECONDS):
+    """
+    Claim up to `limit` automation executions whose current step is due.
+
+    Rows are picked with SELECT ... FOR UPDATE SKIP LOCKED on the
+    (status, next_step_scheduled_at) index, so concurrent schedulers split
+    the work. Claimed rows are rescheduled `lease_seconds` ahead: if the
+    process dies before recording the outcome, the step comes due again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            AutomationExecution.objects.select_for_update(skip_locked=True, of=('self',))
+            .filter(
+                status__in=AUTOMATION_DUE_STATUSES,
+                next_step_scheduled_at__lte=now,
+                automation__is_active=True,
+            )
+            .order_by('next_step_scheduled_at')
+            .values_list('id', flat=True)[:limit]
+        )
+        if ids:
+            AutomationExecution.objects.filter(pk__in=ids).update(
+                next_step_scheduled_at=now + timedelta(seconds=lease_seconds),
+                attempts=F('attempts') + 1,
+            )
+    return ids
+
+
+def _send_automation_steps(executions, from_email, connection):
+    """
+    Send the current step of each execution over one connection.
+    Runs on a scheduler thread: no database access, only SMTP.
+    Returns {execution id: error message or None}.
+    """
+    results = {}
+    with connection:
+        for execution in executions:
+            subscriber = execution.subscriber
+            plan = get_render_plan(execution.current_step.template, subscriber.language_preference)
+            subject, html, text = plan.render(subscriber)
+            message = EmailMultiAlternatives(subject, text, from_email, [subscriber.email], connection=connection)
+            message.attach_alternative(html, 'text/html')
+            try:
+                connection.send_messages([message])
+                results[execution.id] = None
+            except Exception as e:
+                results[execution.id] = _error_message(e)
+    return results
+
+
+def _advance_execution(execution, error, steps, now, max_attempts):
+    """Apply the outcome of a send to an execution (not saved)"""
+    if error is not None:
+        execution.last_error = error
+        logger.error(f"Automation step for {execution.subscriber.email} failed on attempt {execution.attempts}: {error}")
+        if execution.attempts >= max_attempts:
+            execution.status = 'failed'
+            execution.next_step_scheduled_at = None
+        else:
+            execution.next_step_scheduled_at = now + timedelta(seconds=retry_delay(execution.attempts))
+        return
+
+    step = execution.current_step
+    next_step = next((candidate for candidate in steps if candidate.order > step.order), None)
+    execution.current_step = next_step
+    execution.attempts = 0
+    execution.last_error = ''
+    if next_step:
+        execution.status = 'in_progress'
+        execution.next_step_scheduled_at = now + timedelta(days=next_step.delay_days)
+    else:
+        execution.status = 'completed'
+        execution.completed_at = now
+        execution.next_step_scheduled_at = None
+
+
+def run_due_automation_steps(limit=AUTOMATION_BATCH_SIZE, concurrency=AUTOMATION_CONCURRENCY,
+                             chunk_size=AUTOMATION_CHUNK_SIZE, lease_seconds=AUTOMATION_LEASE_SECONDS,
+                             max_attempts=AUTOMATION_MAX_ATTEMPTS):
+    """
+    Claim one batch of due automation steps, send them and advance each
+    execution to its next step.
+
+    Executions, subscribers, templates and the active steps of every
+    automation in the batch are loaded with two queries. Sending runs on at
+    most `concurrency` threads, each holding one SMTP connection per chunk of
+    `chunk_size` messages; outcomes are written back per chunk with one
+    bulk UPDATE, so a crash re-sends at most the chunks in flight.
+
+    Failed sends are retried with exponential backoff until `max_attempts`,
+    then the execution is marked failed.
+
+    Returns:
+        int: Number of executions processed
+    """
+    ids = claim_due_executions(limit, lease_seconds)
+    if not ids:
+        return 0
+
+    executions = list(
+        AutomationExecution.objects.select_related('subscriber', 'current_step__template').filter(pk__in=ids).order_by()
+    )
+    steps = defaultdict(list)
+    for step in AutomationStep.objects.filter(
+        automation_id__in={execution.automation_id for execution in executions}, is_active=True
+    ).order_by('order'):
+        steps[step.automation_id].append(step)
+
+    now = timezone.now()
+    finished, to_send = [], []
+    for execution in executions:
+        if execution.current_step is None or not execution.current_step.is_active or not execution.subscriber.is_active:
+            # Nothing left to send, or the subscriber has unsubscribed
+            execution.status = 'completed' if execution.subscriber.is_active else 'cancelled'
+            execution.completed_at = now
+            execution.next_step_scheduled_at = None
+            finished.append(execution)
+        else:
+            to_send.append(execution)
+
+    fields = ['status', 'current_step', 'next_step_scheduled_at', 'completed_at', 'attempts', 'last_error']
+    if finished:
+        AutomationExecution.objects.bulk_update(finished, fields)
+
+    from_email = get_default_from_email()
+    chunks = [to_send[index:index + chunk_size] for index in range(0, len(to_send), chunk_size)]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='automation-send') as executor:
+        futures = {
+            executor.submit(_send_automation_steps, chunk, from_email, get_email_connection()): chunk
+            for chunk in chunks
+        }
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                # The connection could not be opened; the whole chunk is retried
+                results = {execution.id: _error_message(e) for execution in chunk}
+            now = timezone.now()
+            for execution in chunk:
+                _advance_execution(execution, results[execution.id], steps[execution.automation_id], now, max_attempts)
+            AutomationExecution.objects.bulk_update(chunk, fields)
+
+    logger.info(f"Processed {len(executions)} due automation steps")
+    return len(executions)
+
+
+def record_tracking_event(event_type, tracking_key, url='', user_agent='', ip_address=None):
+    """
+    Buffer an open or click hit; a single INSERT with no lookups.
+    Counters are updated later by aggregate_tracking_events.
+    """
+    return TrackingEvent.objects.create(
+        event_type=event_type,
+        tracking_key=tracking_key,
+        url=url,
+        user_agent=user_agent,
+        ip_address=ip_address or None,
+    )
+
+
+async def arecord_tracking_event(event_type, tracking_key, url='', user_agent='', ip_address=None):
+    """Async record_tracking_event() for the ASGI tracking views"""
+    return await TrackingEvent.objects.acreate(
+        event_type=event_type,
+        tracking_key=tracking_key,
+        url=url,
+        user_agent=user_agent,
+        ip_address=ip_address or None,
+    )
+
+
+def aggregate_tracking_events(batch_size=TRACKING_BATCH_SIZE):
+    """
+    Fold one batch of buffered tracking events into the delivery and campaign counters.
+
+    Events are claimed with SKIP LOCKED and deleted in the same transaction,
+    so concurrent aggregators never count a hit twice. Counters are written
+    with F() increments and first-open/first-click times with COALESCE, so
+    nothing is read-modify-written from Python. If the database rejects a
+    batch, its events are folded one at a time and those that still fail
+    are logged and dropped.
+
+    Returns:
+        int: Number of events processed (0 when the buffer is empty)
+    """
+    with transaction.atomic():
+        events = list(
+            TrackingEvent.objects.select_for_update(skip_locked=True).order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        try:
+            with transaction.atomic():
+                _fold_tracking_events(events)
+        except DatabaseError as e:
+            # Find the events the database rejects and drop them, so one bad
+            # row can't hold back the rest of the buffer
+            logger.error(f"Tracking batch failed, folding its events one by one: {str(e)}")
+            for event in events:
+                try:
+                    with transaction.atomic():
+                        _fold_tracking_events([event])
+                except DatabaseError as e:
+                    logger.error(f"Discarded tracking event {event.pk} ({event.event_type}): {str(e)}")
+
+        TrackingEvent.objects.filter(pk__in=[event.pk for event in events]).delete()
+
+    return len(events)
+
+
+def _fold_tracking_events(events):
+    """Apply claimed tracking events to the delivery, link click and campaign tables"""
+    # tracking_key -> {'opens', 'clicks', 'opened_at', 'clicked_at', 'links'}
+    totals = {}
+    for event in events:
+        entry = totals.setdefault(event.tracking_key, {
+            'opens': 0, 'clicks': 0, 'opened_at': None, 'clicked_at': None, 'links': []
+        })
+        if event.event_type == TrackingEvent.EVENT_CLICK:
+            entry['clicks'] += 1
+            entry['clicked_at'] = entry['clicked_at'] or event.created_at
+            entry['links'].append(event)
+        else:
+            entry['opens'] += 1
+            entry['opened_at'] = entry['opened_at'] or event.created_at
+
+    # Lock the deliveries in a fixed order so concurrent batches can't deadlock
+    deliveries = list(
+        EmailDelivery.objects.select_for_update()
+        .filter(tracking_key__in=list(totals))
+        .order_by('id')
+        .only('id', 'campaign_id', 'tracking_key', 'opened_at', 'clicked_at')
+    )
+
+    campaign_totals = {}
+    link_clicks = []
+    url_max_length = LinkClick._meta.get_field('url').max_length
+    for delivery in deliveries:
+        entry = totals[delivery.tracking_key]
+        first_open = entry['opened_at'] if entry['opens'] else None
+        first_click = entry['clicked_at'] if entry['clicks'] else None
+
+        status = F('status')
+        if first_click:
+            status = Value('clicked')
+        elif first_open:
+            status = Case(
+                When(status__in=['pending', 'sent', 'delivered'], then=Value('opened')),
+                default=F('status'),
+            )
+        EmailDelivery.objects.filter(pk=delivery.pk).update(
+            open_count=F('open_count') + entry['opens'],
+            click_count=F('click_count') + entry['clicks'],
+            opened_at=Coalesce(F('opened_at'), Value(first_open, output_field=DateTimeField())),
+            clicked_at=Coalesce(F('clicked_at'), Value(first_click, output_field=DateTimeField())),
+            status=status,
+            updated_at=timezone.now(),
+        )
+
+        # Campaign opens/clicks count unique recipients
+        counts = campaign_totals.setdefault(delivery.campaign_id, [0, 0])
+        if first_open and delivery.opened_at is None:
+            counts[0] += 1
+        if first_click and delivery.clicked_at is None:
+            counts[1] += 1
+
+        link_clicks.extend(
+            LinkClick(
+                delivery_id=delivery.pk,
+                url=event.url[:url_max_length],
+                clicked_at=event.created_at,
+                user_agent=event.user_agent,
+                ip_address=event.ip_address,
+            )
+            for event in entry['links']
+        )
+
+    LinkClick.objects.bulk_create(link_clicks)
+    for campaign_id, (opens, clicks) in campaign_totals.items():
+        if opens or clicks:
+            NewsletterCampaign.objects.filter(pk=campaign_id).update(
+                opens=F('opens') + opens,
+                clicks=F('clicks') + clicks,
+            )
+
+    unknown = len(totals) - len(deliveries)
+    if unknown:
+        logger.warning(f"Discarded tracking events for {unknown} unknown tracking keys")
@@ -0,0 +1,5 @@
+from utils.cache import watch_models
+from .models import EmailConfiguration
+
+# Reload the cached email configuration in every process after an admin edit
+watch_models(EmailConfiguration)
@@ -0,0 +1,8 @@
+from apps.task_queue.services import register_task
+from . import services
+
+
+@register_task('email_system.send_campaign')
+def send_campaign(campaign_id):
+    services.send_campaign(campaign_id)
+
@@ -1,3 +1,482 @@
-from django.test import TestCase
+import smtplib
+from datetime import timedelta
+from unittest import mock
+from django.core import mail
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import DataError
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.newsletter.models import NewsletterSubscription, NewsletterTemplate, NewsletterCampaign
+from .backends import EmailPoolTimeout, PooledEmailBackend, close_pools, get_pool_stats
+from .models import (
+    AutomationExecution, AutomationStep, EmailConfiguration, EmailDelivery, LinkClick, NewsletterAutomation,
+    OutboxEmail, TrackingEvent
+)
+from .rendering import get_render_plan
+from .services import (
+    aggregate_tracking_events, dispatch_outbox, get_active_email_configuration, get_email_connection,
+    queue_email, run_due_automation_steps, send_email, start_automations
+)
+from .views import EmailDeliveryViewSet, TrackClickAsyncView, TrackOpenAsyncView, TrackOpenView, TrackClickView
 
-# Create your tests here.
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EmailConfigurationServiceTest(TestCase):
+    """Test the cached email configuration used when sending mail"""
+
+    def setUp(self):
+        self.configuration = EmailConfiguration.objects.create(
+            name='Primary',
+            email_backend='django.core.mail.backends.locmem.EmailBackend',
+            email_host='smtp.example.com',
+            email_port=2525,
+            email_host_user='mailer',
+            email_host_password='secret',
+            default_from_email='news@example.com'
+        )
+
+    def test_configuration_is_cached_until_saved(self):
+        """Test that the configuration is only reloaded after it changes"""
+        get_active_email_configuration()
+        with self.assertNumQueries(0):
+            configuration = get_active_email_configuration()
+        self.assertEqual(configuration.email_host, 'smtp.example.com')
+
+        self.configuration.email_host = 'smtp2.example.com'
+        self.configuration.save()
+
+        self.assertEqual(get_active_email_configuration().email_host, 'smtp2.example.com')
+
+    def test_connection_uses_configuration(self):
+        """Test that settings reach the backend without touching global settings"""
+        connection = get_email_connection()
+        send_email('Hello', 'Body', ['to@example.com'], connection=connection)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].from_email, 'news@example.com')
+        self.assertEqual(connection.__class__.__module__, 'django.core.mail.backends.locmem')
+
+
+class TrackingAggregationTest(TestCase):
+    """Test that tracking hits are buffered and folded into the counters"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        template = NewsletterTemplate.objects.create(
+            name='Monthly', type='newsletter', subject_en='News', content_en='<p>Hi</p>'
+        )
+        self.campaign = NewsletterCampaign.objects.create(name='May', template=template, status='sent')
+        self.deliveries = [
+            EmailDelivery.objects.create(
+                campaign=self.campaign,
+                subscriber=NewsletterSubscription.objects.create(email=f'reader{index}@example.com'),
+                status='sent'
+            )
+            for index in range(2)
+        ]
+
+    def open(self, delivery):
+        key = delivery.tracking_key
+        return TrackOpenView.as_view()(self.factory.get(f'/track/open/{key}/'), tracking_key=key)
+
+    def click(self, delivery, url='https://example.com/'):
+        key = delivery.tracking_key
+        request = self.factory.get(f'/track/click/{key}/', {'url': url}, HTTP_USER_AGENT='Mail')
+        return TrackClickView.as_view()(request, tracking_key=key)
+
+    def test_tracking_hit_is_a_single_insert(self):
+        """Test that the pixel and redirect only append an event"""
+        with self.assertNumQueries(1):
+            response = self.open(self.deliveries[0])
+        self.assertEqual(response['Content-Type'], 'image/gif')
+
+        with self.assertNumQueries(1):
+            response = self.click(self.deliveries[0])
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(TrackingEvent.objects.count(), 2)
+        self.deliveries[0].refresh_from_db()
+        self.assertEqual(self.deliveries[0].open_count, 0)
+
+    def test_events_are_aggregated_into_counters(self):
+        """Test that opens and clicks update deliveries and unique campaign totals"""
+        first, second = self.deliveries
+        self.open(first)
+        self.open(first)
+        self.click(first)
+        self.open(second)
+
+        self.assertEqual(aggregate_tracking_events(), 4)
+
+        first.refresh_from_db()
+        self.assertEqual((first.open_count, first.click_count, first.status), (2, 1, 'clicked'))
+        self.assertIsNotNone(first.opened_at)
+        self.assertEqual(LinkClick.objects.get(delivery=first).user_agent, 'Mail')
+        second.refresh_from_db()
+        self.assertEqual((second.open_count, second.status), (1, 'opened'))
+
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.opens, self.campaign.clicks), (2, 1))
+        self.assertFalse(TrackingEvent.objects.exists())
+
+        # Repeat opens raise the delivery count but not the unique campaign count
+        opened_at = first.opened_at
+        self.open(first)
+        aggregate_tracking_events()
+        first.refresh_from_db()
+        self.campaign.refresh_from_db()
+        self.assertEqual((first.open_count, first.opened_at), (3, opened_at))
+        self.assertEqual(self.campaign.opens, 2)
+
+    async def test_async_tracking_views_buffer_events(self):
+        """Test that the ASGI pixel and redirect append the same events"""
+        factory = AsyncRequestFactory()
+        key = self.deliveries[0].tracking_key
+        response = await TrackOpenAsyncView.as_view()(factory.get(f'/track/open/{key}/'), tracking_key=key)
+        self.assertEqual(response['Content-Type'], 'image/gif')
+
+        request = factory.get(f'/track/click/{key}/', {'url': 'https://example.com/'}, headers={'User-Agent': 'Mail'})
+        response = await TrackClickAsyncView.as_view()(request, tracking_key=key)
+        self.assertEqual(response['Location'], 'https://example.com/')
+
+        events = [event async for event in TrackingEvent.objects.order_by('event_type').values_list('event_type', 'url')]
+        self.assertEqual(events, [('click', 'https://example.com/'), ('open', '')])
+
+    def test_long_links_keep_their_click_time(self):
+        """Test that a link longer than the column is cut instead of stalling the buffer"""
+        delivery = self.deliveries[0]
+        url = 'https://example.com/?ref=' + 'x' * 3000
+        self.click(delivery, url=url)
+        clicked_at = timezone.now() - timedelta(hours=3)
+        TrackingEvent.objects.update(created_at=clicked_at)
+
+        self.assertEqual(aggregate_tracking_events(), 1)
+
+        click = LinkClick.objects.get(delivery=delivery)
+        self.assertEqual(click.url, url[:2048])
+        self.assertEqual(click.clicked_at, clicked_at)
+        self.assertFalse(TrackingEvent.objects.exists())
+
+    def test_rejected_event_does_not_stall_the_buffer(self):
+        """Test that an event the database rejects is dropped and the rest are counted"""
+        first, second = self.deliveries
+        self.open(first)
+        self.click(second, url='https://example.com/rejected')
+        bulk_create = LinkClick.objects.bulk_create
+
+        def reject(clicks, *args, **kwargs):
+            if any('rejected' in click.url for click in clicks):
+                raise DataError('value too long')
+            return bulk_create(clicks, *args, **kwargs)
+
+        with mock.patch.object(LinkClick.objects, 'bulk_create', side_effect=reject):
+            self.assertEqual(aggregate_tracking_events(), 2)
+
+        self.assertFalse(TrackingEvent.objects.exists())
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.open_count, second.click_count), (1, 0))
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.opens, self.campaign.clicks), (1, 0))
+
+    def test_unknown_tracking_keys_are_discarded(self):
+        """Test that events for missing deliveries are dropped"""
+        delivery = self.deliveries[0]
+        self.open(delivery)
+        delivery.delete()
+
+        self.assertEqual(aggregate_tracking_events(), 1)
+        self.assertFalse(TrackingEvent.objects.exists())
+
+
+class DeliveryPaginationTest(TestCase):
+    """Test keyset pagination on the delivery list"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        template = NewsletterTemplate.objects.create(
+            name='Monthly', type='newsletter', subject_en='News', content_en='<p>Hi</p>'
+        )
+        campaign = NewsletterCampaign.objects.create(name='May', template=template)
+        for index in range(5):
+            EmailDelivery.objects.create(
+                campaign=campaign,
+                subscriber=NewsletterSubscription.objects.create(email=f'reader{index}@example.com')
+            )
+        # Identical timestamps so the id tie-breaker decides the order
+        EmailDelivery.objects.update(created_at=timezone.now())
+
+    def get_page(self, url):
+        request = self.factory.get(url)
+        force_authenticate(request, user=self.admin)
+        return EmailDeliveryViewSet.as_view({'get': 'list'})(request).data
+
+    def test_cursor_pages_cover_every_row_once(self):
+        """Test that next and previous links walk the key ordering without gaps"""
+        with self.assertNumQueries(1):
+            page = self.get_page('/api/v1/email/deliveries/?page_size=2')
+        self.assertNotIn('count', page)
+        self.assertIsNone(page['previous'])
+
+        pages = [page]
+        while page['next']:
+            page = self.get_page(page['next'])
+            pages.append(page)
+
+        ids = [row['id'] for page in pages for row in page['results']]
+        expected = [str(pk) for pk in EmailDelivery.objects.order_by('-created_at', '-id').values_list('id', flat=True)]
+        self.assertEqual(ids, expected)
+
+        previous = self.get_page(pages[-1]['previous'])
+        self.assertEqual(previous['results'], pages[-2]['results'])
+
+    def test_count_modes(self):
+        """Test exact and estimated totals, and page numbers on request"""
+        page = self.get_page('/api/v1/email/deliveries/?count=exact')
+        self.assertEqual(page['count'], 5)
+
+        page = self.get_page('/api/v1/email/deliveries/?count=estimate')
+        self.assertIsInstance(page['count'], int)
+        self.assertTrue(page['count_is_estimate'])
+
+        page = self.get_page('/api/v1/email/deliveries/?pagination=page&count=exact&page_size=2&page=3')
+        self.assertEqual((page['count'], len(page['results'])), (5, 1))
+
+    def test_invalid_cursor_is_not_found(self):
+        """Test that a tampered cursor is rejected"""
+        request = self.factory.get('/api/v1/email/deliveries/?cursor=bogus')
+        force_authenticate(request, user=self.admin)
+        response = EmailDeliveryViewSet.as_view({'get': 'list'})(request)
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class AutomationSchedulerTest(TestCase):
+    """Test that the scheduler sends due automation steps and advances executions"""
+
+    def setUp(self):
+        self.automation = NewsletterAutomation.objects.create(name='Welcome', trigger_type='subscription')
+        for order, delay in [(1, 0), (2, 3)]:
+            AutomationStep.objects.create(
+                automation=self.automation, order=order, delay_days=delay,
+                template=NewsletterTemplate.objects.create(
+                    name=f'Step {order}', type='welcome', subject_en=f'Step {order}',
+                    content_en=f'<p>Hi {{{{first_name}}}}, step {order}</p>'
+                )
+            )
+        for index in range(5):
+            start_automations('subscription', NewsletterSubscription.objects.create(
+                email=f'new{index}@example.com', first_name=f'New{index}'
+            ))
+
+    def test_due_steps_are_sent_in_batches_and_advanced(self):
+        """Test that each due execution gets its step once and moves to the next one"""
+        # The active configuration is cached per process; load it up front
+        get_active_email_configuration()
+        # Savepoint, claim, lease, release, executions, steps, one update per chunk
+        with self.assertNumQueries(4 + 2 + 3):
+            processed = run_due_automation_steps(limit=10, concurrency=2, chunk_size=2)
+
+        self.assertEqual(processed, 5)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [f'new{index}@example.com' for index in range(5)])
+        self.assertIn('Hi New0, step 1', next(m for m in mail.outbox if m.to == ['new0@example.com']).body)
+        for execution in AutomationExecution.objects.select_related('current_step'):
+            self.assertEqual((execution.status, execution.current_step.order, execution.attempts), ('in_progress', 2, 0))
+            self.assertGreater(execution.next_step_scheduled_at, timezone.now() + timedelta(days=2))
+
+        # Nothing is due until the next step's delay has passed
+        self.assertEqual(run_due_automation_steps(), 0)
+        AutomationExecution.objects.update(next_step_scheduled_at=timezone.now())
+        self.assertEqual(run_due_automation_steps(), 5)
+        self.assertEqual(AutomationExecution.objects.filter(status='completed').count(), 5)
+        self.assertEqual(len(mail.outbox), 10)
+
+    def test_failed_sends_are_retried_with_backoff(self):
+        """Test that a failing send is rescheduled, then marked failed after the last attempt"""
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            run_due_automation_steps(max_attempts=2)
+            execution = AutomationExecution.objects.first()
+            self.assertEqual((execution.status, execution.attempts, execution.last_error), ('pending', 1, 'down'))
+            self.assertGreater(execution.next_step_scheduled_at, timezone.now())
+
+            AutomationExecution.objects.update(next_step_scheduled_at=timezone.now())
+            run_due_automation_steps(max_attempts=2)
+
+        self.assertEqual(AutomationExecution.objects.filter(status='failed').count(), 5)
+        self.assertEqual(run_due_automation_steps(), 0)
+
+
+class RenderPlanTest(TestCase):
+    """Test that templates are compiled once and only tokens vary per recipient"""
+
+    def setUp(self):
+        self.template = NewsletterTemplate.objects.create(
+            name='Offer', type='promotional', subject_en='Offer', subject_ar='عرض',
+            content_en='<p>Hi {{ first_name }}</p><a href="https://example.com/?for={{email}}">Shop</a>',
+        )
+        self.subscriber = NewsletterSubscription(email='a+b@example.com', first_name='<Sam>', language_preference='ar')
+
+    def test_plan_is_cached_until_the_template_changes(self):
+        """Test that the cache key follows updated_at"""
+        plan = get_render_plan(self.template, 'en', tracked=True)
+        self.assertIs(get_render_plan(NewsletterTemplate.objects.get(pk=self.template.pk), 'en', tracked=True), plan)
+
+        self.template.content_en = '<p>Changed</p>'
+        self.template.save()
+        self.assertIsNot(get_render_plan(self.template, 'en', tracked=True), plan)
+
+    def test_render_substitutes_tokens(self):
+        """Test personalization, escaping, link tracking and the text part"""
+        plan = get_render_plan(self.template, 'ar', tracked=True)
+        key = '3f1c2b7a-0000-4000-8000-000000000001'
+
+        with self.assertNumQueries(0):
+            subject, html, text = plan.render(self.subscriber, key)
+
+        # The Arabic subject is used; empty Arabic content falls back to English
+        self.assertEqual(subject, 'عرض')
+        self.assertIn('<p>Hi &lt;Sam&gt;</p>', html)
+        self.assertIn(f'/api/v1/email/track/click/{key}/?url=https%3A%2F%2Fexample.com%2F%3Ffor%3Da%2Bb%40example.com"', html)
+        self.assertTrue(html.endswith(f'/api/v1/email/track/open/{key}/" width="1" height="1" alt="" />'))
+        self.assertEqual(text, 'Hi <Sam>Shop')
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxDispatchTest(TestCase):
+    """Test that the outbox dispatcher retries with backoff and records the outcome"""
+
+    def test_failed_sends_back_off_then_fail(self):
+        """Test that a send error reschedules the email until its last attempt"""
+        email = queue_email('Hello', 'Body', ['to@example.com'], html_body='<p>Body</p>', category='test')
+        OutboxEmail.objects.filter(pk=email.pk).update(max_attempts=2)
+
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            self.assertEqual(dispatch_outbox(), 1)
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts, email.last_error), ('queued', 1, 'down'))
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            # Not due again until the backoff has passed
+            self.assertEqual(dispatch_outbox(), 0)
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            dispatch_outbox()
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', 2))
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP, recording sessions and messages"""
+    sessions = []
+
+    def __init__(self, host, port, **kwargs):
+        self.alive = True
+        self.sent = []
+        self.refused = set()
+        FakeSMTP.sessions.append(self)
+
+    def starttls(self, **kwargs):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def noop(self):
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        return 250, b'OK'
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        refused = self.refused.intersection(to_addrs)
+        if refused:
+            raise smtplib.SMTPRecipientsRefused({address: (550, b'No such user') for address in refused})
+        self.sent.append(to_addrs)
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@override_settings(
+    EMAIL_BACKEND='apps.email_system.backends.PooledEmailBackend',
+    EMAIL_HOST='smtp.example.com',
+    EMAIL_HOST_USER='mailer',
+    EMAIL_HOST_PASSWORD='secret',
+    EMAIL_POOL_SIZE=1,
+    EMAIL_POOL_TIMEOUT=0.01,
+    EMAIL_POOL_CHECK_AFTER=0,
+)
+class PooledEmailBackendTest(TestCase):
+    """Test that SMTP sessions are pooled, health-checked and capped"""
+
+    def setUp(self):
+        close_pools()
+        FakeSMTP.sessions = []
+        patcher = mock.patch('smtplib.SMTP', FakeSMTP)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(close_pools)
+
+    def test_sessions_are_reused_until_they_die(self):
+        """Test that sends share one session and a dead one is replaced after NOOP"""
+        send_mail('One', 'Body', 'from@example.com', ['a@example.com'])
+        send_mail('Two', 'Body', 'from@example.com', ['b@example.com'])
+        self.assertEqual(len(FakeSMTP.sessions), 1)
+        self.assertEqual(FakeSMTP.sessions[0].sent, [['a@example.com'], ['b@example.com']])
+
+        FakeSMTP.sessions[0].alive = False
+        send_mail('Three', 'Body', 'from@example.com', ['c@example.com'])
+        self.assertEqual(len(FakeSMTP.sessions), 2)
+        self.assertEqual(FakeSMTP.sessions[1].sent, [['c@example.com']])
+
+        stats = get_pool_stats()['mailer@smtp.example.com:587']
+        self.assertEqual(
+            {name: stats[name] for name in ('created', 'reused', 'health_check_failures', 'sent', 'idle', 'in_use')},
+            {'created': 2, 'reused': 1, 'health_check_failures': 1, 'sent': 3, 'idle': 1, 'in_use': 0}
+        )
+
+    def test_refused_recipient_keeps_the_session(self):
+        """Test that a refusal fails the message but the session goes back to the pool"""
+        send_mail('One', 'Body', 'from@example.com', ['a@example.com'])
+        FakeSMTP.sessions[0].refused.add('gone@example.com')
+
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            send_mail('Two', 'Body', 'from@example.com', ['gone@example.com'])
+        send_mail('Three', 'Body', 'from@example.com', ['c@example.com'])
+
+        self.assertEqual(len(FakeSMTP.sessions), 1)
+        self.assertEqual(FakeSMTP.sessions[0].sent, [['a@example.com'], ['c@example.com']])
+        stats = get_pool_stats()['mailer@smtp.example.com:587']
+        self.assertEqual((stats['created'], stats['failed'], stats['in_use']), (1, 1, 0))
+
+    def test_checkouts_are_capped(self):
+        """Test that a sender waits for a free session and gives up after the timeout"""
+        holder = get_connection()
+        holder.open()
+        message = EmailMessage('Hi', 'Body', 'from@example.com', ['a@example.com'])
+        with self.assertRaises(EmailPoolTimeout):
+            get_connection().send_messages([message])
+
+        holder.close()
+        self.assertEqual(get_connection().send_messages([message]), 1)
+        stats = get_pool_stats()['mailer@smtp.example.com:587']
+        self.assertEqual((stats['created'], stats['timeouts']), (1, 1))
+
+    def test_smtp_configurations_are_pooled(self):
+        """Test that a stored SMTP configuration gets its own pool"""
+        EmailConfiguration.objects.create(
+            name='Primary',
+            email_host='smtp.provider.com',
+            email_host_user='news',
+            email_host_password='secret',
+            default_from_email='news@example.com'
+        )
+        connection = get_email_connection()
+        self.assertIsInstance(connection, PooledEmailBackend)
+        self.assertEqual(connection.pool.label, 'news@smtp.provider.com:587')
@@ -4,31 +4,42 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.views import APIView
 from django.http import HttpResponse, HttpResponseRedirect
+from django.views import View
 import logging
 import base64
 from .models import (
     EmailDelivery, LinkClick, NewsletterAutomation, 
-    AutomationStep, AutomationExecution, EmailConfiguration
+    AutomationStep, AutomationExecution, EmailConfiguration, TrackingEvent
 )
 from .serializers import (
     EmailDeliverySerializer, LinkClickSerializer, 
     NewsletterAutomationSerializer, AutomationStepSerializer,
     AutomationExecutionSerializer, EmailConfigurationSerializer
 )
-from django.utils import timezone
+from .backends import get_pool_stats
+from .services import arecord_tracking_event, record_tracking_event
+from utils.pagination import FlexiblePagination
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# 1x1 transparent GIF returned by the open tracker
+TRACKING_PIXEL = base64.b64decode('R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7')
+
 class EmailDeliveryViewSet(viewsets.ModelViewSet):
     """API endpoint for email deliveries"""
-    queryset = EmailDelivery.objects.all()
+    queryset = EmailDelivery.objects.select_related('campaign', 'subscriber')
     serializer_class = EmailDeliverySerializer
     permission_classes = [permissions.IsAdminUser]
     filterset_fields = ['status', 'campaign']
     search_fields = ['subscriber__email', 'campaign__name']
     ordering_fields = ['sent_at', 'opened_at', 'clicked_at', 'created_at']
     ordering = ['-created_at']
+    # Cursor pages without COUNT(*) by default; ?pagination=page for page numbers
+    pagination_class = FlexiblePagination
+    pagination_mode = 'cursor'
+    pagination_count = 'none'
+    keyset_ordering = ('-created_at', '-id')
 
 class LinkClickViewSet(viewsets.ReadOnlyModelViewSet):
     """API endpoint for tracking link clicks"""
@@ -39,6 +50,11 @@ class LinkClickViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['url', 'delivery__subscriber__email']
     ordering_fields = ['clicked_at']
     ordering = ['-clicked_at']
+    # Cursor pages without COUNT(*) by default; ?pagination=page for page numbers
+    pagination_class = FlexiblePagination
+    pagination_mode = 'cursor'
+    pagination_count = 'none'
+    keyset_ordering = ('-clicked_at', '-id')
 
 class NewsletterAutomationViewSet(viewsets.ModelViewSet):
     """API endpoint for managing newsletter automations"""
@@ -97,87 +113,43 @@ class EmailConfigurationViewSet(viewsets.ModelViewSet):
         if instance.active:
             EmailConfiguration.objects.exclude(pk=instance.pk).update(active=False)
 
+    @action(detail=False, methods=['get'], url_path='pool-stats')
+    def pool_stats(self, request):
+        """SMTP connection pool counters of this process"""
+        return Response(get_pool_stats())
+
 class TrackOpenView(APIView):
     """API endpoint for tracking email opens"""
     permission_classes = [permissions.AllowAny]
     
     def get(self, request, tracking_key=None):
-        """Return a tracking pixel and record the open"""
+        """Return a tracking pixel and buffer the open for aggregation"""
         if tracking_key:
             try:
-                # Find the delivery and update stats
-                delivery = EmailDelivery.objects.get(tracking_key=tracking_key)
-                
-                # Record open if not already marked as opened
-                if not delivery.opened_at:
-                    delivery.status = 'opened'
-                    delivery.opened_at = timezone.now()
-                
-                # Increment open count regardless
-                delivery.open_count += 1
-                delivery.save()
-                
-                # Update campaign stats
-                campaign = delivery.campaign
-                campaign.opens = EmailDelivery.objects.filter(
-                    campaign=campaign, 
-                    opened_at__isnull=False
-                ).count()
-                campaign.save()
-                
-                logger.info(f"Email open tracked for {delivery.subscriber.email} from campaign {campaign.name}")
-            
-            except EmailDelivery.DoesNotExist:
-                logger.warning(f"Invalid tracking key for email open: {tracking_key}")
+                record_tracking_event(TrackingEvent.EVENT_OPEN, tracking_key)
             except Exception as e:
                 logger.error(f"Error tracking email open: {str(e)}")
         
         # Return 1x1 transparent pixel regardless of success
-        pixel = base64.b64decode('R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7')
-        return HttpResponse(pixel, content_type='image/gif')
+        return HttpResponse(TRACKING_PIXEL, content_type='image/gif')
 
 class TrackClickView(APIView):
     """API endpoint for tracking link clicks and redirecting"""
     permission_classes = [permissions.AllowAny]
     
     def get(self, request, tracking_key=None):
-        """Record the click and redirect to the target URL"""
+        """Buffer the click for aggregation and redirect to the target URL"""
         redirect_url = request.GET.get('url', '/')
         
         if tracking_key:
             try:
-                # Find the delivery and update stats
-                delivery = EmailDelivery.objects.get(tracking_key=tracking_key)
-                
-                # Record click if not already marked as clicked
-                if not delivery.clicked_at:
-                    delivery.status = 'clicked'
-                    delivery.clicked_at = timezone.now()
-                
-                # Increment click count regardless
-                delivery.click_count += 1
-                delivery.save()
-                
-                # Create link click record
-                LinkClick.objects.create(
-                    delivery=delivery,
+                record_tracking_event(
+                    TrackingEvent.EVENT_CLICK,
+                    tracking_key,
                     url=redirect_url,
                     user_agent=request.META.get('HTTP_USER_AGENT', ''),
                     ip_address=self._get_client_ip(request)
                 )
-                
-                # Update campaign stats
-                campaign = delivery.campaign
-                campaign.clicks = EmailDelivery.objects.filter(
-                    campaign=campaign, 
-                    clicked_at__isnull=False
-                ).count()
-                campaign.save()
-                
-                logger.info(f"Email link click tracked for {delivery.subscriber.email} from campaign {campaign.name}")
-            
-            except EmailDelivery.DoesNotExist:
-                logger.warning(f"Invalid tracking key for link click: {tracking_key}")
             except Exception as e:
                 logger.error(f"Error tracking link click: {str(e)}")
         
@@ -192,3 +164,33 @@ class TrackClickView(APIView):
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
+
+
+class TrackOpenAsyncView(View):
+    """TrackOpenView for ASGI deployments; the hit is buffered with the async ORM"""
+
+    async def get(self, request, tracking_key=None):
+        try:
+            await arecord_tracking_event(TrackingEvent.EVENT_OPEN, tracking_key)
+        except Exception as e:
+            logger.error(f"Error tracking email open: {str(e)}")
+        return HttpResponse(TRACKING_PIXEL, content_type='image/gif')
+
+
+class TrackClickAsyncView(View):
+    """TrackClickView for ASGI deployments; the hit is buffered with the async ORM"""
+    _get_client_ip = TrackClickView._get_client_ip
+
+    async def get(self, request, tracking_key=None):
+        redirect_url = request.GET.get('url', '/')
+        try:
+            await arecord_tracking_event(
+                TrackingEvent.EVENT_CLICK,
+                tracking_key,
+                url=redirect_url,
+                user_agent=request.META.get('HTTP_USER_AGENT', ''),
+                ip_address=self._get_client_ip(request)
+            )
+        except Exception as e:
+            logger.error(f"Error tracking link click: {str(e)}")
+        return HttpResponseRedirect(redirect_url)
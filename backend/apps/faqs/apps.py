@@ -5,4 +5,7 @@ from django.utils.translation import gettext_lazy as _
 class FaqsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.faqs'
-    verbose_name = 'Frequently Asked Questions' 
\ No newline at end of file
+    verbose_name = 'Frequently Asked Questions'
+
+    def ready(self):
+        from . import signals  # noqa: F401 
\ No newline at end of file
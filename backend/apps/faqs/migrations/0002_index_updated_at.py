@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faqs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='faq',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Updated At'),
+        ),
+        migrations.AlterField(
+            model_name='faqcategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Updated At'),
+        ),
+    ]
@@ -11,7 +11,7 @@ class FAQCategory(models.Model):
     order = models.PositiveIntegerField(_("Display Order"), default=0, help_text=_("Order in which category is displayed"))
     is_active = models.BooleanField(_("Active"), default=True)
     created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
-    updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
+    updated_at = models.DateTimeField(_("Updated At"), auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = _("FAQ Category")
@@ -84,6 +84,7 @@ class FAQ(models.Model):
     )
     updated_at = models.DateTimeField(
         auto_now=True,
+        db_index=True,
         verbose_name=_('Updated At')
     )
 
@@ -0,0 +1,5 @@
+from utils.cache import watch_models
+from .models import FAQ, FAQCategory
+
+# Invalidate cached API responses whenever this app's content changes
+watch_models(FAQ, FAQCategory)
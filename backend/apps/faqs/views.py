@@ -13,6 +13,9 @@ from .serializers import (
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from django.db.models import Prefetch
+from utils.async_views import AsyncCachedReadView
+from utils.cache import CacheResponseMixin, cache_response
+from utils.http import ConditionalResponseMixin, conditional_response
 
 
 class FAQListView(APIView):
@@ -109,7 +112,7 @@ class FAQCategoryDetailView(APIView):
         return Response(serializer.data)
 
 
-class FAQViewSet(viewsets.ReadOnlyModelViewSet):
+class FAQViewSet(ConditionalResponseMixin, CacheResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for retrieving FAQ items.
     
@@ -129,6 +132,7 @@ class FAQViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = FAQSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ['question', 'answer']
+    cache_models = [FAQ, FAQCategory]
     
     def get_queryset(self):
         """
@@ -151,6 +155,8 @@ class FAQViewSet(viewsets.ReadOnlyModelViewSet):
         return context
     
     @action(detail=False, methods=['get'])
+    @conditional_response()
+    @cache_response()
     def by_category(self, request):
         """
         Return a list of FAQ categories with their FAQs.
@@ -186,6 +192,12 @@ class FAQViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(sorted(languages))
 
 
+class FAQListAsyncView(AsyncCachedReadView):
+    """FAQ list for ASGI deployments"""
+    drf_view = FAQViewSet
+    actions = {'get': 'list'}
+
+
 class FAQCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for retrieving FAQ categories.
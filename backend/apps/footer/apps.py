@@ -5,3 +5,6 @@ class FooterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.footer'
     verbose_name = 'Footer Management'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:56
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('footer', '0009_index_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FooterSnapshot',
+            fields=[
+                ('language', models.CharField(max_length=10, primary_key=True, serialize=False)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('etag', models.CharField(max_length=100)),
+                ('built_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Footer Snapshot',
+                'verbose_name_plural': 'Footer Snapshots',
+            },
+        ),
+    ]
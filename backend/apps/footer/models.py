@@ -5,14 +5,13 @@ from django.utils.html import mark_safe, format_html
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.utils.safestring import mark_safe
-from django.conf import settings
-from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
 
 # Define TimeStampedModel locally
 class TimeStampedModel(models.Model):
     """An abstract base class model that provides self-updating created_at and updated_at fields."""
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         abstract = True
@@ -64,7 +63,7 @@ class FooterSettings(TimeStampedModel):
     
     # timestamp fields
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return f"Footer Settings - Updated {self.updated_at.strftime('%Y-%m-%d')}"
@@ -100,16 +99,6 @@ class FooterSettings(TimeStampedModel):
         if errors:
             raise ValidationError(errors)
     
-    def save(self, *args, **kwargs):
-        """Override save to clear cache"""
-        super().save(*args, **kwargs)
-        self.clear_cache()
-        
-    @classmethod
-    def clear_cache(cls):
-        for lang_code, _ in settings.LANGUAGES:
-            cache_key = f'footer_settings_{lang_code}'
-            cache.delete(cache_key)
 
 
 class FooterSection(TimeStampedModel):
@@ -156,7 +145,7 @@ class FooterSection(TimeStampedModel):
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Created At'))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Updated At'))
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name=_('Updated At'))
     
     def active_links_count(self):
         """Count of active links in this section."""
@@ -258,7 +247,7 @@ class FooterLink(TimeStampedModel):
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Created At'))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Updated At'))
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name=_('Updated At'))
     
     class Meta:
         verbose_name = _("Footer Link")
@@ -328,7 +317,7 @@ class SocialMedia(TimeStampedModel):
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name=_("Updated At"))
     
     @property
     def get_icon(self):
@@ -405,7 +394,7 @@ class FooterBottomLink(TimeStampedModel):
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Created At'))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Updated At'))
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name=_('Updated At'))
     
     class Meta:
         verbose_name = _("Footer Bottom Link")
@@ -420,3 +409,22 @@ class FooterBottomLink(TimeStampedModel):
     def title(self):
         """Return the English title for backward compatibility."""
         return self.title_en
+
+
+class FooterSnapshot(models.Model):
+    """
+    Materialized response of the complete footer endpoint for one language.
+    Rebuilt by apps.footer.services whenever footer content changes; the
+    cache holds a copy and this row survives cache restarts.
+    """
+    language = models.CharField(max_length=10, primary_key=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    etag = models.CharField(max_length=100)
+    built_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = _("Footer Snapshot")
+        verbose_name_plural = _("Footer Snapshots")
+
+    def __str__(self):
+        return f"Footer snapshot ({self.language})"
@@ -141,7 +141,9 @@ class LocalizedFooterSettingsSerializer(serializers.ModelSerializer):
         return self._get_localized_field(obj, 'newsletter_label')
     
     def get_social_media(self, obj):
-        social_media = SocialMedia.objects.filter(is_active=True).order_by('order')
+        social_media = self.context.get('social_media')
+        if social_media is None:
+            social_media = SocialMedia.objects.filter(is_active=True).order_by('order')
         return SocialMediaSerializer(social_media, many=True).data
     
     def to_representation(self, instance):
@@ -179,7 +181,10 @@ class LocalizedFooterSectionSerializer(serializers.ModelSerializer):
     
     def get_links(self, obj):
         lang = self.get_language()
-        links = obj.links.filter(is_active=True).order_by('order')
+        # Active links prefetched by apps.footer.services, when available
+        links = getattr(obj, 'prefetched_active_links', None)
+        if links is None:
+            links = obj.links.filter(is_active=True).order_by('order')
         return [
             {
                 'id': link.id,
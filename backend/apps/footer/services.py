@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.cache import quote_etag
+from utils.instrumentation import record_cache_lookup
+
+from .models import FooterSettings, FooterSection, FooterLink, SocialMedia, FooterBottomLink, FooterSnapshot
+from .serializers import (
+    LocalizedFooterSettingsSerializer, LocalizedFooterSectionSerializer,
+    SocialMediaSerializer, FooterBottomLinkSerializer
+)
+
+logger = logging.getLogger(__name__)
+
+FOOTER_MODELS = [FooterSettings, FooterSection, FooterLink, SocialMedia, FooterBottomLink]
+
+# Snapshots are rebuilt on every change; the timeout only bounds how long a
+# lost invalidation could keep an old one in the cache
+SNAPSHOT_CACHE_TIMEOUT = 60 * 60
+
+
+def get_footer_languages():
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def get_snapshot_cache_key(language):
+    return f"footer_snapshot:{language}"
+
+
+def build_footer_payload(language):
+    """
+    Complete footer data for one language.
+    Runs one query per footer model; section links are prefetched.
+    """
+    footer_settings = FooterSettings.objects.first()
+    social_media = list(SocialMedia.objects.filter(is_active=True).order_by('order'))
+    sections = FooterSection.objects.filter(is_active=True).order_by('order').prefetch_related(
+        Prefetch('links', queryset=FooterLink.objects.filter(is_active=True).order_by('order'), to_attr='prefetched_active_links')
+    )
+    bottom_links = FooterBottomLink.objects.filter(is_active=True).order_by('order')
+
+    context = {'language': language, 'social_media': social_media}
+    return {
+        'settings': LocalizedFooterSettingsSerializer(footer_settings, context=context).data if footer_settings else None,
+        'sections': LocalizedFooterSectionSerializer(sections, many=True, context=context).data,
+        'social_media': SocialMediaSerializer(social_media, many=True).data,
+        'bottom_links': FooterBottomLinkSerializer(bottom_links, many=True, context=context).data,
+    }
+
+
+def _snapshot_entry(snapshot):
+    return {'payload': snapshot.payload, 'etag': snapshot.etag, 'built_at': snapshot.built_at}
+
+
+def build_footer_snapshot(language):
+    """Build, persist and cache the snapshot for one language"""
+    encoded = json.dumps(build_footer_payload(language), cls=DjangoJSONEncoder, sort_keys=True)
+    snapshot, _ = FooterSnapshot.objects.update_or_create(
+        language=language,
+        defaults={
+            # Round-trip so the stored and cached payloads hold plain JSON types
+            'payload': json.loads(encoded),
+            'etag': quote_etag(hashlib.sha256(encoded.encode('utf-8')).hexdigest()),
+            'built_at': timezone.now(),
+        }
+    )
+    entry = _snapshot_entry(snapshot)
+    cache.set(get_snapshot_cache_key(language), entry, SNAPSHOT_CACHE_TIMEOUT)
+    return entry
+
+
+def rebuild_footer_snapshots():
+    """Rebuild the snapshot of every language (run after footer content changes)"""
+    for language in get_footer_languages():
+        build_footer_snapshot(language)
+    logger.info("Rebuilt footer snapshots")
+
+
+def invalidate_footer_snapshots():
+    """
+    Drop the snapshots so no request serves the old footer.
+    Readers rebuild a missing snapshot on demand.
+    """
+    FooterSnapshot.objects.all().delete()
+    cache.delete_many([get_snapshot_cache_key(language) for language in get_footer_languages()])
+
+
+def get_footer_snapshot(language):
+    """
+    Snapshot for a language as {'payload', 'etag', 'built_at'}.
+
+    Served from the cache with a single key lookup; falls back to the
+    persisted row (e.g. after a cache restart), then to a rebuild.
+
+    The persisted row is only added to the cache, never overwrites it: a
+    reader racing an uncommitted change loads the old row, and must not
+    replace the snapshot the post-commit rebuild has cached meanwhile.
+    """
+    if language not in get_footer_languages():
+        language = settings.LANGUAGE_CODE.split('-')[0]
+
+    key = get_snapshot_cache_key(language)
+    entry = cache.get(key)
+    record_cache_lookup(entry is not None)
+    if entry is not None:
+        return entry
+
+    snapshot = FooterSnapshot.objects.filter(language=language).first()
+    if snapshot is None:
+        return build_footer_snapshot(language)
+
+    entry = _snapshot_entry(snapshot)
+    cache.add(key, entry, SNAPSHOT_CACHE_TIMEOUT)
+    return entry
+
+
+async def aget_footer_snapshot(language):
+    """Async get_footer_snapshot() for the ASGI view"""
+    if language not in get_footer_languages():
+        language = settings.LANGUAGE_CODE.split('-')[0]
+
+    key = get_snapshot_cache_key(language)
+    entry = await cache.aget(key)
+    record_cache_lookup(entry is not None)
+    if entry is not None:
+        return entry
+
+    snapshot = await FooterSnapshot.objects.filter(language=language).afirst()
+    if snapshot is None:
+        return await sync_to_async(build_footer_snapshot)(language)
+
+    entry = _snapshot_entry(snapshot)
+    await cache.aadd(key, entry, SNAPSHOT_CACHE_TIMEOUT)
+    return entry
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .services import FOOTER_MODELS, invalidate_footer_snapshots, rebuild_footer_snapshots
+
+
+def _rebuild_pending(connection):
+    # Callbacks of a rolled back transaction or savepoint are dropped from this
+    # list, so the check never skips a rebuild that is still needed
+    return any(callback[1] is rebuild_footer_snapshots for callback in connection.run_on_commit)
+
+
+def _footer_changed(sender, raw=False, **kwargs):
+    if raw:
+        return
+    # Drop the snapshots now so this transaction never serves stale data,
+    # and rebuild them once the change is visible to other connections.
+    # An admin save with inlines changes many rows; rebuild once per transaction.
+    invalidate_footer_snapshots()
+    connection = transaction.get_connection()
+    if not _rebuild_pending(connection):
+        transaction.on_commit(rebuild_footer_snapshots)
+
+
+for model in FOOTER_MODELS:
+    uid = f"footer_snapshot:{model._meta.label_lower}"
+    post_save.connect(_footer_changed, sender=model, dispatch_uid=f"{uid}:save")
+    post_delete.connect(_footer_changed, sender=model, dispatch_uid=f"{uid}:delete")
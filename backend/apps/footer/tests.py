@@ -1,3 +1,143 @@
-from django.test import TestCase
+from django.core.cache import cache
+import json
+import time
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.db import transaction
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase
+from rest_framework.test import APIRequestFactory
+from .models import FooterSection, FooterLink, FooterSnapshot
+from .services import get_footer_snapshot, get_snapshot_cache_key, rebuild_footer_snapshots
+from .views import FooterCompleteAsyncView, FooterCompleteView
+
+
+class FooterCompleteViewTest(TestCase):
+    """Test the snapshot and conditional GET on the complete footer response"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = FooterCompleteView.as_view()
+        self.section = FooterSection.objects.create(
+            title_en='Quick Links', title_ar='روابط سريعة', slug='quick-links'
+        )
+        self.link = FooterLink.objects.create(
+            section=self.section, title_en='About', title_ar='من نحن', url='/about'
+        )
+
+    def get_footer(self, lang='en', **headers):
+        return self.view(self.factory.get(f'/api/v1/footer/all/?lang={lang}', **headers))
+
+    def test_repeat_requests_are_served_from_snapshot(self):
+        """Test that an unchanged footer is served without queries"""
+        first = self.get_footer()
+        with self.assertNumQueries(0):
+            second = self.get_footer()
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(second.data['sections'][0]['links'][0]['title'], 'About')
+
+    def test_languages_are_cached_separately(self):
+        """Test that each language gets its own cache entry"""
+        self.get_footer('en')
+        response = self.get_footer('ar')
+
+        self.assertEqual(response.data['sections'][0]['title'], 'روابط سريعة')
+
+    def test_saving_content_invalidates_cache(self):
+        """Test that an admin edit is visible on the next request"""
+        self.get_footer()
+
+        self.link.title_en = 'About Us'
+        self.link.save()
+        response = self.get_footer()
+
+        self.assertEqual(response.data['sections'][0]['links'][0]['title'], 'About Us')
+
+    def test_matching_etag_returns_not_modified(self):
+        """Test that a repeat poll with the current ETag gets a 304"""
+        etag = self.get_footer()['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.get_footer(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_changed_content_returns_new_etag(self):
+        """Test that editing or deleting content changes the ETag"""
+        # Last-Modified is sent once the second the snapshot was built has passed
+        with mock.patch('time.time', return_value=time.time() + 2):
+            first = self.get_footer()
+        self.assertIn('Last-Modified', first)
+
+        self.link.delete()
+        response = self.get_footer(HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(response.data['sections'][0]['links'], [])
+
+    def test_snapshot_row_survives_cache_loss(self):
+        """Test that a cache miss reads the persisted snapshot instead of rebuilding"""
+        self.get_footer()
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            response = self.get_footer()
+        self.assertEqual(response.data['sections'][0]['title'], 'Quick Links')
+
+    def test_reader_never_replaces_a_cached_snapshot(self):
+        """Test that a reader holding an older persisted row leaves the rebuilt snapshot in the cache"""
+        current = get_footer_snapshot('en')
+        FooterSnapshot.objects.filter(language='en').update(etag='"old"')
+
+        # The reader missed the cache just before the rebuild stored the current snapshot
+        with mock.patch('django.core.cache.backends.locmem.LocMemCache.get', return_value=None):
+            stale = get_footer_snapshot('en')
+
+        self.assertEqual(stale['etag'], '"old"')
+        self.assertEqual(cache.get(get_snapshot_cache_key('en'))['etag'], current['etag'])
+
+    def test_async_view_serves_the_same_snapshot(self):
+        """Test that the ASGI view answers from the snapshot with the same validators"""
+        view = async_to_sync(FooterCompleteAsyncView.as_view())
+        factory = AsyncRequestFactory()
+        response = view(factory.get('/api/v1/footer/all/?lang=ar'))
+
+        self.assertEqual(json.loads(response.content)['sections'][0]['title'], 'روابط سريعة')
+        with self.assertNumQueries(0):
+            not_modified = view(factory.get('/api/v1/footer/all/?lang=ar', headers={'If-None-Match': response['ETag']}))
+        self.assertEqual(not_modified.status_code, 304)
+
+
+class FooterRebuildTest(TransactionTestCase):
+    """Test that committed footer changes rebuild the snapshots once"""
+
+    def setUp(self):
+        cache.clear()
+        self.section = FooterSection.objects.create(
+            title_en='Quick Links', title_ar='روابط سريعة', slug='quick-links'
+        )
+        self.link = FooterLink.objects.create(
+            section=self.section, title_en='About', title_ar='من نحن', url='/about'
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_commit_rebuilds_every_language_once(self):
+        """Test that saving a section with its links rebuilds each language once, ahead of requests"""
+        with mock.patch('apps.footer.signals.rebuild_footer_snapshots', wraps=rebuild_footer_snapshots) as rebuild:
+            with transaction.atomic():
+                self.section.title_en = 'Explore'
+                self.section.save()
+                self.link.save()
+                FooterLink.objects.create(section=self.section, title_en='Contact', title_ar='اتصل', url='/contact')
+
+        self.assertEqual(rebuild.call_count, 1)
+        self.assertEqual(FooterSnapshot.objects.count(), 2)
+        view = FooterCompleteView.as_view()
+        with self.assertNumQueries(0):
+            response = view(APIRequestFactory().get('/api/v1/footer/all/'))
+        self.assertEqual(response.data['sections'][0]['title'], 'Explore')
+        self.assertEqual(len(response.data['sections'][0]['links']), 2)
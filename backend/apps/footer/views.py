@@ -4,7 +4,12 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import get_language
+from django.utils.cache import get_conditional_response
+from django.views import View
+from utils.async_views import json_response
+from utils.http import last_modified_header_time, set_validators
 from .models import FooterSettings, FooterSection, FooterLink, SocialMedia, FooterBottomLink
+from .services import aget_footer_snapshot, get_footer_snapshot
 from .serializers import (
     FooterSettingsSerializer, FooterSectionSerializer, FooterLinkSerializer, 
     SocialMediaSerializer, LocalizedFooterSettingsSerializer, 
@@ -155,36 +160,43 @@ class FooterBottomLinkViewSet(viewsets.ModelViewSet):
 
 class FooterCompleteView(views.APIView):
     """
-    View to get complete footer data in a single API call
+    View to get complete footer data in a single API call.
+    Served from the per-language snapshot kept by apps.footer.services.
     """
     permission_classes = [permissions.AllowAny]
     
+    def get_language(self):
+        """Requested language, falling back to the default for unsupported codes"""
+        language = self.request.GET.get('lang') or get_language() or 'en'
+        return language.split('-')[0]
+    
     def get(self, request):
         """Get complete footer data with optional language parameter"""
-        lang = request.query_params.get('lang') or get_language()
-        
-        # Get footer settings
-        settings = FooterSettings.objects.first()
-        settings_serializer = LocalizedFooterSettingsSerializer(settings, context={'language': lang}) if settings else None
-        
-        # Get active sections with their links
-        sections = FooterSection.objects.filter(is_active=True).order_by('order')
-        sections_serializer = LocalizedFooterSectionSerializer(sections, many=True, context={'language': lang})
-        
-        # Get active social media links
-        social_media = SocialMedia.objects.filter(is_active=True).order_by('order')
-        social_media_serializer = SocialMediaSerializer(social_media, many=True)
-        
-        # Get active bottom links
-        bottom_links = FooterBottomLink.objects.filter(is_active=True).order_by('order')
-        bottom_links_serializer = FooterBottomLinkSerializer(bottom_links, many=True, context={'language': lang})
-        
-        # Combine all data
-        data = {
-            'settings': settings_serializer.data if settings else None,
-            'sections': sections_serializer.data,
-            'social_media': social_media_serializer.data,
-            'bottom_links': bottom_links_serializer.data
-        }
-        
-        return Response(data) 
\ No newline at end of file
+        return snapshot_response(request, get_footer_snapshot(self.get_language()), Response)
+
+
+class FooterCompleteAsyncView(View):
+    """
+    FooterCompleteView for ASGI deployments; the snapshot is read
+    with the async cache and ORM APIs.
+    """
+    get_language = FooterCompleteView.get_language
+
+    async def get(self, request):
+        return snapshot_response(request, await aget_footer_snapshot(self.get_language()), json_response)
+
+
+def snapshot_response(request, snapshot, render):
+    """A 304 for a current conditional GET, else the snapshot payload with its validators"""
+    last_modified = last_modified_header_time([snapshot['built_at'].timestamp()])
+    
+    not_modified = get_conditional_response(
+        request, etag=snapshot['etag'], last_modified=last_modified
+    )
+    if not_modified is not None:
+        set_validators(not_modified, snapshot['etag'], last_modified)
+        return not_modified
+    
+    response = render(snapshot['payload'])
+    set_validators(response, snapshot['etag'], last_modified)
+    return response
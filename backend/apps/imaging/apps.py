@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class ImagingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.imaging'
+    verbose_name = 'Image Renditions'
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.imaging.services import (
+    WATCHED_IMAGES, needs_renditions, process_image_field, queue_renditions, renditions_field_name
+)
+
+
+class Command(BaseCommand):
+    help = 'Generate missing responsive image renditions for existing uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true',
+                            help='Generate in this process instead of queueing background jobs')
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate renditions that are already up to date')
+
+    def handle(self, *args, **options):
+        force = options['force']
+        total = 0
+        for model, field_name in WATCHED_IMAGES:
+            queryset = model._default_manager.only('pk', field_name, renditions_field_name(field_name))
+            for instance in queryset.iterator():
+                if not needs_renditions(instance, field_name) and not (force and getattr(instance, field_name)):
+                    continue
+                if options['sync']:
+                    process_image_field(model._meta.label, instance.pk, field_name, force=force)
+                else:
+                    queue_renditions(instance, field_name, force=force)
+                total += 1
+
+        action = 'Generated' if options['sync'] else 'Queued'
+        self.stdout.write(self.style.SUCCESS(f"{action} renditions for {total} images"))
@@ -0,0 +1,221 @@
+"""
+On-demand crops of media files, served from /media/r/<w>x<h>/<path>.
+
+URLs are signed (see services.resized_image_url) so only sizes handed out
+by the API can be requested. Results are kept in a size-bounded disk cache (least recently
+used files are evicted first) and resizing runs on a small per-process
+thread pool, so a crawl of uncached sizes queues up instead of taking every
+worker's CPU.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+from .services import JPEG_QUALITY, WEBP_QUALITY, encode_image
+
+logger = logging.getLogger(__name__)
+
+# Source extension -> output format
+OUTPUT_FORMATS = {
+    '.jpg': 'jpeg',
+    '.jpeg': 'jpeg',
+    '.png': 'png',
+    '.gif': 'png',
+    '.webp': 'webp',
+}
+OUTPUT_EXTENSIONS = {'jpeg': '.jpg', 'png': '.png', 'webp': '.webp'}
+
+# Eviction trims the cache to this fraction of its cap so it doesn't run on every write
+EVICT_TARGET_RATIO = 0.9
+
+
+class ResizeBusy(Exception):
+    """Raised when every slot of the resize pool is taken"""
+
+
+class DiskLRUCache:
+    """
+    Files under `directory`, capped at `max_bytes` in total.
+
+    A hit refreshes the file's mtime; when a write takes the cache over the
+    cap, the files with the oldest mtimes are removed first. The running size
+    is tracked per process and corrected by every eviction scan.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+
+    def path_for(self, key, extension):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}{extension}")
+
+    def open(self, path):
+        """Open a cached file for reading and mark it as recently used"""
+        handle = open(path, 'rb')
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted between open() and utime(); the open handle still reads it
+            pass
+        return handle
+
+    def touch(self, path):
+        """Mark a cached file as recently used; False if it isn't cached"""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def put(self, path, content):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(content)
+            over_limit = self._size > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Remove least recently used files until the cache is under EVICT_TARGET_RATIO of the cap"""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * EVICT_TARGET_RATIO
+            removed = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            self._size = total
+        if removed:
+            logger.info(f"Evicted {removed} resized images, cache now {total} bytes")
+
+
+class ResizePool:
+    """
+    Thread pool with a hard bound on queued work.
+
+    At most `workers` resizes run at once and `queue_size` more may wait;
+    beyond that run() raises ResizeBusy. Concurrent requests for the same
+    key share one job.
+    """
+
+    def __init__(self, workers, queue_size):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-resize')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.in_flight = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, function, *args, timeout=None):
+        with self._lock:
+            future = self.in_flight.get(key)
+            created = future is None
+            if created:
+                if not self.slots.acquire(blocking=False):
+                    raise ResizeBusy()
+                future = self.executor.submit(function, *args)
+                self.in_flight[key] = future
+        if created:
+            # Outside the lock: the callback runs immediately if the job already finished
+            future.add_done_callback(lambda _: self._finish(key))
+        return future.result(timeout=timeout)
+
+    def _finish(self, key):
+        with self._lock:
+            self.in_flight.pop(key, None)
+        self.slots.release()
+
+
+_cache = None
+_pool = None
+_setup_lock = threading.Lock()
+
+
+def get_resize_cache() -> DiskLRUCache:
+    global _cache
+    with _setup_lock:
+        directory = str(settings.IMAGE_RESIZE_CACHE_DIR)
+        max_bytes = settings.IMAGE_RESIZE_CACHE_MAX_BYTES
+        if _cache is None or (_cache.directory, _cache.max_bytes) != (directory, max_bytes):
+            _cache = DiskLRUCache(directory, max_bytes)
+        return _cache
+
+
+def get_resize_pool() -> ResizePool:
+    global _pool
+    with _setup_lock:
+        if _pool is None:
+            _pool = ResizePool(settings.IMAGE_RESIZE_WORKERS, settings.IMAGE_RESIZE_QUEUE_SIZE)
+        return _pool
+
+
+def get_output_format(path) -> Optional[str]:
+    return OUTPUT_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def render_crop(source, width, height, image_format, cache_path):
+    """Crop `source` to fill width x height and store the result in the cache"""
+    started = time.monotonic()
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image_format == 'jpeg':
+            image = image.convert('RGB')
+        elif image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        cropped = ImageOps.fit(image, (width, height), Image.LANCZOS)
+
+    if image_format == 'webp':
+        content = encode_image(cropped, 'webp', quality=WEBP_QUALITY, method=4)
+    elif image_format == 'jpeg':
+        content = encode_image(cropped, 'jpeg', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        content = encode_image(cropped, 'png', optimize=True)
+
+    get_resize_cache().put(cache_path, content)
+    logger.debug(f"Resized {source} to {width}x{height} in {time.monotonic() - started:.3f}s")
+    return cache_path
@@ -0,0 +1,16 @@
+from rest_framework import serializers
+from .services import serialize_renditions
+
+
+class RenditionsField(serializers.Field):
+    """
+    Read-only field for a `<field>_renditions` JSONField.
+    Null until the background job has generated the renditions.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return serialize_renditions(value, self.context.get('request'))
@@ -0,0 +1,297 @@
+import base64
+import io
+import logging
+import os
+import time
+from urllib.parse import quote
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from apps.task_queue.services import enqueue
+from utils.cache import bump_model_version
+from utils.security import generate_signed_url
+
+logger = logging.getLogger(__name__)
+
+RENDITIONS_DIR = 'renditions'
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+PLACEHOLDER_WIDTH = 16
+
+FORMAT_MIME_TYPES = {
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+}
+
+# (model, image field) pairs registered with watch_images()
+WATCHED_IMAGES = []
+
+
+def renditions_field_name(field_name):
+    """JSON field holding the renditions of an image field"""
+    return f'{field_name}_renditions'
+
+
+def get_rendition_widths():
+    return sorted(getattr(settings, 'IMAGE_RENDITION_WIDTHS', [320, 640, 1024, 1600]))
+
+
+def rendition_path(source, width, extension):
+    stem, _ = os.path.splitext(source)
+    return f'{RENDITIONS_DIR}/{stem}-{width}w.{extension}'
+
+
+def encode_image(image, image_format, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format.upper(), **options)
+    return buffer.getvalue()
+
+
+def _save(path, content):
+    # Overwrite any file left by an earlier run for the same source
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    return default_storage.save(path, ContentFile(content))
+
+
+def build_placeholder(image):
+    """Tiny blurred JPEG as a data URI, shown while the real image loads"""
+    tiny = image.convert('RGB')
+    tiny.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH * 4), Image.LANCZOS)
+    encoded = base64.b64encode(encode_image(tiny, 'jpeg', quality=50)).decode('ascii')
+    return f'data:image/jpeg;base64,{encoded}'
+
+
+def build_renditions(source):
+    """
+    Write resized copies of a stored image and describe them.
+
+    Each width below the original (capped at the largest configured width)
+    is saved as WebP plus a JPEG fallback, or PNG for images with
+    transparency. AVIF is not produced because Pillow has no built-in
+    encoder for it.
+
+    Returns:
+        dict: {'source', 'width', 'height', 'placeholder', 'renditions': [...]}
+    """
+    with default_storage.open(source, 'rb') as handle:
+        image = Image.open(handle)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    width, height = image.size
+
+    widths = get_rendition_widths()
+    targets = sorted({target for target in widths if target < width} | {min(width, widths[-1])})
+
+    formats = ['webp'] if features.check('webp') else []
+    formats.append('png' if has_alpha else 'jpeg')
+
+    renditions = []
+    for target in targets:
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS
+        )
+        for image_format in formats:
+            if image_format == 'webp':
+                content = encode_image(resized, 'webp', quality=WEBP_QUALITY, method=4)
+            elif image_format == 'jpeg':
+                content = encode_image(resized, 'jpeg', quality=JPEG_QUALITY, optimize=True, progressive=True)
+            else:
+                content = encode_image(resized, 'png', optimize=True)
+            renditions.append({
+                'path': _save(rendition_path(source, target, image_format), content),
+                'width': resized.width,
+                'height': resized.height,
+                'format': image_format,
+            })
+
+    return {
+        'source': source,
+        'width': width,
+        'height': height,
+        'placeholder': build_placeholder(image),
+        'renditions': renditions,
+    }
+
+
+def delete_renditions(data, keep=()):
+    """Remove the files listed in a renditions description"""
+    for rendition in (data or {}).get('renditions', []):
+        if rendition['path'] not in keep:
+            default_storage.delete(rendition['path'])
+
+
+def needs_renditions(instance, field_name):
+    """True when the stored renditions don't describe the current file"""
+    image = getattr(instance, field_name)
+    data = getattr(instance, renditions_field_name(field_name)) or {}
+    if not image:
+        return bool(data)
+    return data.get('source') != image.name
+
+
+def process_image_field(model_label, pk, field_name, force=False):
+    """
+    Generate (or clear) the renditions of one image field and store them on the row.
+    Safe to run twice: a row whose renditions already match its file is skipped
+    unless `force` is set.
+    """
+    model = apps.get_model(model_label)
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None or not (needs_renditions(instance, field_name) or force):
+        return
+
+    image = getattr(instance, field_name)
+    old_data = getattr(instance, renditions_field_name(field_name)) or {}
+    data = {}
+    if image:
+        try:
+            data = build_renditions(image.name)
+        except FileNotFoundError as e:
+            if not model._default_manager.filter(pk=pk, **{field_name: image.name}).exists():
+                # Replaced or cleared since the job was queued; the new file has its own job
+                return
+            # Fail the job (and retry) rather than leave the image without renditions,
+            # e.g. when this process can't see the media storage
+            raise FileNotFoundError(f"Image {image.name} for {model_label} {pk} is missing from storage") from e
+
+    updates = {renditions_field_name(field_name): data}
+    try:
+        model._meta.get_field('updated_at')
+        # Move Last-Modified / ETag so clients pick up the new renditions
+        updates['updated_at'] = timezone.now()
+    except FieldDoesNotExist:
+        pass
+
+    # Only store the result if the file was not replaced in the meantime
+    unchanged = Q(**{field_name: image.name}) if image else Q(**{field_name: ''}) | Q(**{f'{field_name}__isnull': True})
+    updated = model._default_manager.filter(unchanged, pk=pk).update(**updates)
+    if not updated:
+        delete_renditions(data)
+        return
+
+    new_paths = {rendition['path'] for rendition in data.get('renditions', [])}
+    delete_renditions(old_data, keep=new_paths)
+    bump_model_version(model)
+    logger.info(f"Generated {len(new_paths)} renditions for {model_label} {pk} {field_name}")
+
+
+def queue_renditions(instance, field_name, force=False):
+    enqueue('imaging.generate_renditions', {
+        'model': instance._meta.label,
+        'pk': str(instance.pk),
+        'field': field_name,
+        'force': force,
+    })
+
+
+def watch_images(model, *field_names):
+    """
+    Generate renditions in a background job whenever one of the image
+    fields of `model` changes. Each field needs a `<field>_renditions`
+    JSONField to store the result.
+    """
+    for field_name in field_names:
+        WATCHED_IMAGES.append((model, field_name))
+
+    def queue_changed(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        for field_name in field_names:
+            if needs_renditions(instance, field_name):
+                queue_renditions(instance, field_name)
+
+    def remove_files(sender, instance, **kwargs):
+        stored = [getattr(instance, renditions_field_name(field_name)) for field_name in field_names]
+
+        def delete_files():
+            for data in stored:
+                delete_renditions(data)
+
+        transaction.on_commit(delete_files)
+
+    uid = f"image_renditions:{model._meta.label_lower}"
+    post_save.connect(queue_changed, sender=model, weak=False, dispatch_uid=f"{uid}:save")
+    post_delete.connect(remove_files, sender=model, weak=False, dispatch_uid=f"{uid}:delete")
+
+
+def get_resize_prefix():
+    return f"{settings.MEDIA_URL}r/"
+
+
+def resized_image_url(path, width, height, request=None):
+    """
+    Signed URL for a `width` x `height` crop of the media file at `path`.
+
+    The expiry is rounded up to a whole IMAGE_RESIZE_URL_LIFETIME period, so
+    the URL stays the same (and browser/CDN caches keep working) for at
+    least one full period.
+    """
+    lifetime = settings.IMAGE_RESIZE_URL_LIFETIME
+    expires_at = (int(time.time()) // lifetime + 2) * lifetime
+    signed = generate_signed_url(f"{get_resize_prefix()}{width}x{height}/{path}", expires_at=expires_at)
+    # Sign the decoded path (what the view sees), hand out the quoted one
+    location, query = signed.split('?', 1)
+    url = f"{quote(location)}?{query}"
+    return request.build_absolute_uri(url) if request else url
+
+
+def serialize_renditions(data, request=None):
+    """
+    `srcset`-ready description of stored renditions, or None before they exist.
+
+    Returns:
+        dict: width, height, placeholder, `sources` (one srcset per format,
+        best format first, for <picture>), the flat `renditions` list and
+        signed `crops` URLs for each IMAGE_CROP_PRESETS entry
+    """
+    if not data or not data.get('renditions'):
+        return None
+
+    def absolute(path):
+        url = default_storage.url(path)
+        return request.build_absolute_uri(url) if request else url
+
+    renditions = [
+        {
+            'url': absolute(rendition['path']),
+            'width': rendition['width'],
+            'height': rendition['height'],
+            'format': rendition['format'],
+        }
+        for rendition in data['renditions']
+    ]
+
+    sources = []
+    for image_format in FORMAT_MIME_TYPES:
+        candidates = [rendition for rendition in renditions if rendition['format'] == image_format]
+        if candidates:
+            sources.append({
+                'type': FORMAT_MIME_TYPES[image_format],
+                'srcset': ', '.join(f"{rendition['url']} {rendition['width']}w" for rendition in candidates),
+            })
+
+    return {
+        'width': data['width'],
+        'height': data['height'],
+        'placeholder': data['placeholder'],
+        'sources': sources,
+        'renditions': renditions,
+        'crops': {
+            name: resized_image_url(data['source'], width, height, request)
+            for name, (width, height) in settings.IMAGE_CROP_PRESETS.items()
+        },
+    }
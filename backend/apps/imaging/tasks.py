@@ -0,0 +1,7 @@
+from apps.task_queue.services import register_task
+from . import services
+
+
+@register_task('imaging.generate_renditions')
+def generate_renditions(model, pk, field, force=False):
+    services.process_image_field(model, pk, field, force=force)
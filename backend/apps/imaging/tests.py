@@ -0,0 +1,171 @@
+import io
+import os
+import shutil
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIRequestFactory
+from apps.about.models import ClientLogo
+from apps.projects.models import Project
+from apps.projects.serializers import LocalizedProjectListSerializer
+from apps.task_queue.models import Job
+from apps.task_queue.services import run_due_jobs
+from .resize import DiskLRUCache, ResizeBusy, ResizePool
+from .services import resized_image_url
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def tearDownModule():
+    shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+
+def make_upload(name, size=(1200, 800), mode='RGB', image_format='JPEG'):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 100, 50, 128) if mode == 'RGBA' else (200, 100, 50)).save(buffer, format=image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_RENDITION_WIDTHS=[320, 640, 1600])
+class RenditionsTest(TestCase):
+    """Test background generation of responsive image renditions"""
+
+    def setUp(self):
+        self.project = Project.objects.create(
+            title_en='Loft', slug='loft', is_published=True, cover_image=make_upload('loft.jpg')
+        )
+
+    def test_upload_queues_job_and_job_stores_renditions(self):
+        """Test that saving an image only queues work, and the job writes the renditions"""
+        self.assertEqual(self.project.cover_image_renditions, {})
+        self.assertEqual(Job.objects.filter(task_name='imaging.generate_renditions').count(), 1)
+
+        run_due_jobs('worker-1')
+        self.project.refresh_from_db()
+        data = self.project.cover_image_renditions
+
+        self.assertEqual((data['width'], data['height']), (1200, 800))
+        self.assertTrue(data['placeholder'].startswith('data:image/jpeg;base64,'))
+        # Never upscaled: 1600 is capped at the original width
+        self.assertEqual(sorted({r['width'] for r in data['renditions']}), [320, 640, 1200])
+        self.assertEqual({r['format'] for r in data['renditions']}, {'webp', 'jpeg'})
+        for rendition in data['renditions']:
+            self.assertTrue(default_storage.exists(rendition['path']))
+
+        # Up to date renditions are not queued again
+        self.project.save()
+        self.assertFalse(Job.objects.filter(status=Job.STATUS_QUEUED).exists())
+
+    def test_serializer_exposes_srcset(self):
+        """Test the srcset-ready output of the list serializer"""
+        run_due_jobs('worker-1')
+        self.project.refresh_from_db()
+        request = APIRequestFactory().get('/api/v1/projects/')
+        renditions = LocalizedProjectListSerializer(self.project, context={'request': request}).data['cover_image_renditions']
+
+        self.assertEqual([source['type'] for source in renditions['sources']], ['image/webp', 'image/jpeg'])
+        webp = renditions['sources'][0]['srcset'].split(', ')
+        self.assertEqual(len(webp), 3)
+        self.assertTrue(webp[0].startswith('http://testserver/media/renditions/'))
+        self.assertTrue(webp[0].endswith(' 320w'))
+        self.assertIn('/media/r/600x400/projects/covers/', renditions['crops']['card'])
+
+    def test_replacing_image_removes_old_renditions(self):
+        """Test that a new upload replaces the files of the previous one"""
+        run_due_jobs('worker-1')
+        self.project.refresh_from_db()
+        old_paths = [r['path'] for r in self.project.cover_image_renditions['renditions']]
+
+        self.project.cover_image = make_upload('loft-2.jpg', size=(500, 400))
+        self.project.save()
+        run_due_jobs('worker-1')
+        self.project.refresh_from_db()
+
+        self.assertEqual(self.project.cover_image_renditions['width'], 500)
+        for path in old_paths:
+            self.assertFalse(default_storage.exists(path))
+
+    def test_missing_source_fails_the_job(self):
+        """Test that a job whose image is missing from storage fails instead of passing silently"""
+        default_storage.delete(self.project.cover_image.name)
+        run_due_jobs('worker-1')
+
+        job = Job.objects.get(task_name='imaging.generate_renditions')
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('is missing from storage', job.last_error)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.cover_image_renditions, {})
+
+    def test_transparent_images_fall_back_to_png(self):
+        """Test that images with alpha keep it in the fallback format"""
+        logo = ClientLogo.objects.create(name='Acme', logo=make_upload('acme.png', (400, 200), 'RGBA', 'PNG'))
+        run_due_jobs('worker-1')
+        logo.refresh_from_db()
+        self.assertEqual({r['format'] for r in logo.logo_renditions['renditions']}, {'webp', 'png'})
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_RESIZE_CACHE_DIR=os.path.join(MEDIA_ROOT, 'resize-cache'))
+class ResizeEndpointTest(TestCase):
+    """Test the signed on-demand crop endpoint and its disk cache"""
+
+    def setUp(self):
+        self.path = default_storage.save('projects/crop-me.jpg', make_upload('crop-me.jpg'))
+
+    def fetch(self, url):
+        response = self.client.get(url)
+        if response.status_code == 200:
+            content = b''.join(response.streaming_content)
+            return response, Image.open(io.BytesIO(content))
+        return response, None
+
+    def test_signed_url_returns_crop_and_caches_it(self):
+        """Test that a signed URL serves the exact size and repeat hits use the cache"""
+        url = resized_image_url(self.path, 300, 300)
+        response, image = self.fetch(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(image.size, (300, 300))
+        self.assertIn('immutable', response['Cache-Control'])
+
+        cache_dir = os.path.join(MEDIA_ROOT, 'resize-cache')
+        cached = [name for _, _, files in os.walk(cache_dir) for name in files]
+        self.assertEqual(len(cached), 1)
+
+        self.fetch(url)
+        self.assertEqual([name for _, _, files in os.walk(cache_dir) for name in files], cached)
+        # Stable URL for the whole period, so browser and CDN caches keep working
+        self.assertEqual(resized_image_url(self.path, 300, 300), url)
+
+    def test_rejects_unsigned_tampered_and_oversized_requests(self):
+        """Test that only URLs signed by the API are served"""
+        url = resized_image_url(self.path, 300, 300)
+        self.assertEqual(self.client.get(url.split('?')[0]).status_code, 403)
+        self.assertEqual(self.client.get(url.replace('300x300', '301x300')).status_code, 403)
+        self.assertEqual(self.client.get(resized_image_url(self.path, 5000, 300)).status_code, 404)
+        self.assertEqual(self.client.get(resized_image_url('../settings.py', 300, 300)).status_code, 404)
+
+    def test_busy_pool_returns_503(self):
+        """Test that requests beyond the pool's capacity are turned away"""
+        pool = ResizePool(workers=1, queue_size=0)
+        pool.slots.acquire()
+        with self.assertRaises(ResizeBusy):
+            pool.run('key', lambda: None)
+        pool.slots.release()
+        self.assertEqual(pool.run('key', lambda: 'done'), 'done')
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test LRU eviction once the cache passes its size cap"""
+        cache = DiskLRUCache(os.path.join(MEDIA_ROOT, 'lru-test'), max_bytes=250)
+        paths = [cache.path_for(f'key-{index}', '.bin') for index in range(3)]
+        for index, path in enumerate(paths[:2]):
+            cache.put(path, b'x' * 100)
+            os.utime(path, (index, index))
+        self.assertTrue(cache.touch(paths[0]))
+
+        cache.put(paths[2], b'x' * 100)
+        self.assertTrue(os.path.exists(paths[0]))
+        self.assertFalse(os.path.exists(paths[1]))
+        self.assertTrue(os.path.exists(paths[2]))
+
@@ -0,0 +1,92 @@
+import logging
+import os
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden
+from django.utils._os import safe_join
+from django.views.decorators.http import require_GET
+from PIL import Image
+
+from utils.security import validate_signed_url
+from .resize import (
+    OUTPUT_EXTENSIONS, ResizeBusy, get_output_format, get_resize_cache, get_resize_pool, render_crop
+)
+from .services import FORMAT_MIME_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Seconds a request waits for its crop before giving up with a 503
+RESIZE_TIMEOUT = 20
+RETRY_AFTER = '5'
+MAX_CACHE_AGE = 60 * 60 * 24 * 365
+
+
+def _unavailable():
+    response = HttpResponse('Image resizing is busy, try again shortly', status=503, content_type='text/plain')
+    response['Retry-After'] = RETRY_AFTER
+    return response
+
+
+@require_GET
+def resized_media(request, width, height, path):
+    """
+    Serve a signed width x height crop of a media file.
+
+    Cached crops are streamed straight from disk (or handed to the web
+    server with X-Accel-Redirect when IMAGE_RESIZE_ACCEL_REDIRECT is set);
+    misses are rendered on the shared resize pool.
+    """
+    # The signature covers the decoded path, as generated by resized_image_url()
+    valid, error = validate_signed_url(f"{request.path}?{request.META.get('QUERY_STRING', '')}")
+    if not valid:
+        return HttpResponseForbidden(error)
+
+    max_dimension = settings.IMAGE_RESIZE_MAX_DIMENSION
+    image_format = get_output_format(path)
+    if not (0 < width <= max_dimension and 0 < height <= max_dimension) or image_format is None:
+        raise Http404('Unsupported size or format')
+
+    try:
+        source = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(source)
+    except (SuspiciousFileOperation, FileNotFoundError, NotADirectoryError):
+        raise Http404('Image not found')
+
+    # The source mtime is part of the key so a replaced upload gets fresh crops
+    cache = get_resize_cache()
+    cache_path = cache.path_for(f"{path}:{width}x{height}:{stat.st_mtime_ns}", OUTPUT_EXTENSIONS[image_format])
+
+    if not cache.touch(cache_path):
+        try:
+            get_resize_pool().run(
+                cache_path, render_crop, source, width, height, image_format, cache_path,
+                timeout=RESIZE_TIMEOUT
+            )
+        except (ResizeBusy, FutureTimeoutError):
+            logger.warning(f"Resize pool busy, rejected {width}x{height} crop of {path}")
+            return _unavailable()
+        except (OSError, Image.DecompressionBombError) as e:
+            logger.warning(f"Could not resize {path}: {e}")
+            raise Http404('Image could not be resized')
+
+    accel_prefix = settings.IMAGE_RESIZE_ACCEL_REDIRECT
+    if accel_prefix:
+        response = HttpResponse(content_type=FORMAT_MIME_TYPES[image_format])
+        relative = os.path.relpath(cache_path, cache.directory).replace(os.sep, '/')
+        response['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{relative}"
+    else:
+        try:
+            handle = cache.open(cache_path)
+        except FileNotFoundError:
+            # Evicted right after it was written; rare enough to just ask for a retry
+            return _unavailable()
+        # Streamed with the WSGI server's file wrapper (sendfile where available)
+        response = FileResponse(handle, content_type=FORMAT_MIME_TYPES[image_format])
+
+    expires = int(request.GET['expires'])
+    max_age = max(0, min(expires - int(time.time()), MAX_CACHE_AGE))
+    response['Cache-Control'] = f'public, max-age={max_age}, immutable'
+    return response
@@ -3,8 +3,9 @@ from django.utils import timezone
 from .models import (
     NewsletterSubscription, SubscriberSegment, 
     NewsletterTemplate, NewsletterCampaign, 
-    SubscriberSegmentMembership
+    SubscriberSegmentMembership, SubscriberImport
 )
+from .services import update_member_count
 
 @admin.register(NewsletterSubscription)
 class NewsletterSubscriptionAdmin(admin.ModelAdmin):
@@ -17,12 +18,12 @@ class NewsletterSubscriptionAdmin(admin.ModelAdmin):
     actions = ['mark_as_confirmed', 'mark_as_unconfirmed']
     
     def mark_as_confirmed(self, request, queryset):
-        updated = queryset.update(confirmed=True)
+        updated = queryset.filter(confirmed=False).update(confirmed=True, confirmed_at=timezone.now())
         self.message_user(request, f"{updated} subscribers marked as confirmed.")
     mark_as_confirmed.short_description = "Mark selected subscribers as confirmed"
     
     def mark_as_unconfirmed(self, request, queryset):
-        updated = queryset.update(confirmed=False)
+        updated = queryset.update(confirmed=False, confirmed_at=None)
         self.message_user(request, f"{updated} subscribers marked as unconfirmed.")
     mark_as_unconfirmed.short_description = "Mark selected subscribers as unconfirmed"
 
@@ -41,9 +42,16 @@ class SubscriberSegmentAdmin(admin.ModelAdmin):
     ordering = ('name',)
     inlines = [SubscriberSegmentMembershipInline]
     
+    readonly_fields = ('member_count', 'refreshed_at')
+    
     def get_subscriber_count(self, obj):
-        return obj.subscribers.count()
+        return obj.member_count
     get_subscriber_count.short_description = 'Subscribers'
+    
+    def save_related(self, request, form, formsets, change):
+        """Keep the stored count in line with memberships edited inline"""
+        super().save_related(request, form, formsets, change)
+        update_member_count(form.instance)
 
 
 @admin.register(NewsletterTemplate)
@@ -102,3 +110,19 @@ class NewsletterCampaignAdmin(admin.ModelAdmin):
         updated = queryset.filter(status__in=['draft', 'scheduled']).update(status='cancelled')
         self.message_user(request, f"{updated} campaigns cancelled.")
     cancel_campaign.short_description = "Cancel selected campaigns"
+
+
+
+@admin.register(SubscriberImport)
+class SubscriberImportAdmin(admin.ModelAdmin):
+    """Read-only import reports; uploads go through the API or the import_subscribers command"""
+    list_display = ('file_name', 'status', 'rows_processed', 'created_count', 'existing_count', 'invalid_count', 'created_at')
+    list_filter = ('status', 'format', 'created_at')
+    ordering = ('-created_at',)
+    exclude = ('file',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
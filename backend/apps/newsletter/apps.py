@@ -5,3 +5,6 @@ class NewsletterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.newsletter'
     verbose_name = 'Newsletter Management'
+
+    def ready(self):
+        from . import signals  # noqa: F401
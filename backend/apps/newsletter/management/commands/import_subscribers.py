@@ -0,0 +1,49 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.newsletter.models import SubscriberImport
+from apps.newsletter.services import IMPORT_CHUNK_SIZE, run_import
+
+
+class Command(BaseCommand):
+    help = 'Import newsletter subscribers from a CSV or JSON Lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (email, first_name, last_name, language_preference) or JSONL file')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='File format (default: from the extension)')
+        parser.add_argument('--confirmed', action='store_true',
+                            help='Import subscribers as already confirmed')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE,
+                            help='Rows inserted per transaction')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f"File not found: {path}")
+        file_format = options['format'] or ('jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'csv')
+
+        subscriber_import = SubscriberImport.objects.create(
+            file_name=os.path.basename(path)[:255],
+            format=file_format,
+            mark_confirmed=options['confirmed'],
+            status='running',
+            started_at=timezone.now(),
+        )
+
+        def progress(report):
+            self.stdout.write(f"{report.rows_processed} rows: {report.created_count} created, "
+                              f"{report.existing_count} existing, {report.invalid_count} invalid")
+
+        with open(path, 'rb') as stream:
+            run_import(subscriber_import, stream, chunk_size=options['chunk_size'], progress=progress)
+
+        subscriber_import.status = 'completed'
+        subscriber_import.finished_at = timezone.now()
+        subscriber_import.save(update_fields=['status', 'finished_at'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {subscriber_import.created_count} new subscribers "
+            f"({subscriber_import.duplicate_count} repeated in the file, report {subscriber_import.id})"
+        ))
@@ -0,0 +1,17 @@
+from apps.newsletter.services import refresh_segments
+from apps.task_queue.polling import PollingCommand
+
+
+class Command(PollingCommand):
+    help = 'Materialize the members of dynamic subscriber segments from their rules'
+    interval_help = 'Keep running, refreshing every N seconds (default: refresh once and exit)'
+
+    def tick(self, options):
+        return refresh_segments()
+
+    def drained(self, processed, options):
+        # Every tick refreshes all segments
+        return True
+
+    def report(self, total, options):
+        self.stdout.write(f"Refreshed {total} dynamic segments")
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.6 on 2026-10-18 04:12
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill(apps, schema_editor):
+    """Best-known confirmation time for existing rows and the stored segment counts"""
+    NewsletterSubscription = apps.get_model('newsletter', 'NewsletterSubscription')
+    SubscriberSegment = apps.get_model('newsletter', 'SubscriberSegment')
+    SubscriberSegmentMembership = apps.get_model('newsletter', 'SubscriberSegmentMembership')
+
+    NewsletterSubscription.objects.filter(confirmed=True, confirmed_at__isnull=True).update(
+        confirmed_at=models.F('updated_at')
+    )
+    SubscriberSegment.objects.update(member_count=Coalesce(
+        models.Subquery(
+            SubscriberSegmentMembership.objects.filter(segment=models.OuterRef('pk'))
+            .order_by().values('segment').annotate(total=models.Count('pk')).values('total')
+        ),
+        0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0003_subscriber_import'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newslettersubscription',
+            name='confirmed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='subscribersegment',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='subscribersegment',
+            name='refreshed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='subscribersegment',
+            name='rules',
+            field=models.JSONField(blank=True, default=dict, help_text='Filter rules of a dynamic segment; empty for a manual list'),
+        ),
+        migrations.AddIndex(
+            model_name='newslettersubscription',
+            index=models.Index(condition=models.Q(('confirmed', True), ('is_active', True)), fields=['confirmed_at'], name='newsletter_sub_confirmed_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 import uuid
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
+from utils.files import private_storage
 
 
 class NewsletterSubscription(models.Model):
@@ -10,6 +12,7 @@ class NewsletterSubscription(models.Model):
     first_name = models.CharField(max_length=100, blank=True)
     last_name = models.CharField(max_length=100, blank=True)
     confirmed = models.BooleanField(default=False)
+    confirmed_at = models.DateTimeField(null=True, blank=True)
     confirmation_token = models.UUIDField(default=uuid.uuid4, editable=False)
     is_active = models.BooleanField(default=True)
     language_preference = models.CharField(max_length=2, choices=[('en', 'English'), ('ar', 'Arabic')], default='en')
@@ -20,23 +23,40 @@ class NewsletterSubscription(models.Model):
         verbose_name = "Newsletter Subscription"
         verbose_name_plural = "Newsletter Subscriptions"
         ordering = ['-created_at']
+        indexes = [
+            # Confirmed-date rules of dynamic segments
+            models.Index(
+                fields=['confirmed_at'], name='newsletter_sub_confirmed_idx',
+                condition=models.Q(is_active=True, confirmed=True)
+            ),
+        ]
 
     def __str__(self):
         return self.email
         
     def save(self, *args, **kwargs):
-        """Generate a new confirmation token if being created"""
+        """Generate a new confirmation token if being created and stamp the confirmation"""
         if not self.pk:
             self.confirmation_token = uuid.uuid4()
+        if self.confirmed and self.confirmed_at is None:
+            self.confirmed_at = timezone.now()
         super().save(*args, **kwargs)
 
 
 class SubscriberSegment(models.Model):
-    """Segments for categorizing newsletter subscribers"""
+    """
+    Segments for categorizing newsletter subscribers.
+
+    A segment with `rules` is dynamic: its memberships are materialized from
+    the rules by newsletter.services.refresh_segment instead of being added by hand.
+    """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
+    rules = models.JSONField(default=dict, blank=True, help_text="Filter rules of a dynamic segment; empty for a manual list")
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    refreshed_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -48,6 +68,10 @@ class SubscriberSegment(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def is_dynamic(self):
+        return bool(self.rules)
+
 
 class SubscriberSegmentMembership(models.Model):
     """Many-to-many relationship between subscribers and segments"""
@@ -144,17 +168,57 @@ class NewsletterCampaign(models.Model):
         
     def get_all_subscribers(self):
         """Get all subscribers for this campaign, either from segments or all active subscribers if no segments"""
+        subscribers = NewsletterSubscription.objects.filter(is_active=True, confirmed=True)
         if self.segments.exists():
-            # Get subscribers from selected segments
-            segment_ids = self.segments.values_list('id', flat=True)
-            subscriber_ids = SubscriberSegmentMembership.objects.filter(
-                segment_id__in=segment_ids
-            ).values_list('subscriber_id', flat=True).distinct()
-            return NewsletterSubscription.objects.filter(
-                id__in=subscriber_ids, 
-                is_active=True, 
-                confirmed=True
-            )
-        else:
-            # If no segments selected, get all active confirmed subscribers
-            return NewsletterSubscription.objects.filter(is_active=True, confirmed=True)
+            # A semi-join on the materialized memberships; no DISTINCT needed
+            return subscribers.filter(models.Exists(
+                SubscriberSegmentMembership.objects.filter(
+                    subscriber=models.OuterRef('pk'), segment__campaigns=self
+                )
+            ))
+        # If no segments selected, get all active confirmed subscribers
+        return subscribers
+
+
+class SubscriberImport(models.Model):
+    """A bulk subscriber upload and its progress report"""
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Kept outside MEDIA_ROOT and deleted once the import finishes
+    file = models.FileField(upload_to='imports/subscribers/', storage=private_storage, blank=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    mark_confirmed = models.BooleanField(default=False, help_text="Import subscribers as already confirmed")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    # Progress, updated after every chunk
+    rows_processed = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    existing_count = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0, help_text="Emails repeated within one chunk; repeats in later chunks count as existing")
+    invalid_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="First rows that could not be imported")
+    error_message = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Subscriber Import"
+        verbose_name_plural = "Subscriber Imports"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.file_name or self.id} ({self.get_status_display()})"
@@ -1,8 +1,11 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+import os
 from .models import (
     NewsletterSubscription, SubscriberSegment, 
-    NewsletterTemplate, NewsletterCampaign
+    NewsletterTemplate, NewsletterCampaign, SubscriberImport
 )
+from .services import validate_segment_rules
 
 class NewsletterSubscriptionSerializer(serializers.ModelSerializer):
     """Serializer for newsletter subscriptions"""
@@ -13,17 +16,21 @@ class NewsletterSubscriptionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'confirmed', 'is_active', 'created_at']
 
 class SubscriberSegmentSerializer(serializers.ModelSerializer):
-    """Serializer for subscriber segments"""
-    subscriber_count = serializers.SerializerMethodField()
+    """Serializer for subscriber segments; segments with rules are dynamic"""
+    subscriber_count = serializers.IntegerField(source='member_count', read_only=True)
+    is_dynamic = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = SubscriberSegment
-        fields = ['id', 'name', 'description', 'is_active', 
-                 'subscriber_count', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'name', 'description', 'is_active', 'rules', 'is_dynamic',
+                 'subscriber_count', 'refreshed_at', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'refreshed_at', 'created_at', 'updated_at']
     
-    def get_subscriber_count(self, obj):
-        return obj.subscribers.count()
+    def validate_rules(self, value):
+        try:
+            return validate_segment_rules(value)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
 
 class NewsletterTemplateSerializer(serializers.ModelSerializer):
     """Serializer for newsletter templates"""
@@ -49,4 +56,47 @@ class ConfirmSubscriptionSerializer(serializers.Serializer):
 
 class UnsubscribeSerializer(serializers.Serializer):
     """Serializer for unsubscribing from newsletters"""
-    email = serializers.EmailField() 
\ No newline at end of file
+    email = serializers.EmailField() 
+
+class SubscriberImportSerializer(serializers.ModelSerializer):
+    """Progress report of a bulk subscriber import"""
+    class Meta:
+        model = SubscriberImport
+        fields = ['id', 'file_name', 'format', 'mark_confirmed', 'status', 'rows_processed',
+                 'created_count', 'existing_count', 'duplicate_count', 'invalid_count',
+                 'errors', 'error_message', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+class SubscriberImportUploadSerializer(serializers.Serializer):
+    """Upload for a bulk subscriber import; the format defaults to the file extension"""
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=SubscriberImport.FORMAT_CHOICES, required=False)
+    mark_confirmed = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        if 'format' not in data:
+            extension = os.path.splitext(data['file'].name)[1].lower()
+            data['format'] = 'jsonl' if extension in ('.jsonl', '.ndjson') else 'csv'
+        return data
+
+class SegmentMembersSerializer(serializers.Serializer):
+    """
+    Subscribers to add to or remove from a segment: explicit IDs, or (when
+    adding) rules matched in the database: language and a signup date range
+    """
+    subscriber_ids = serializers.ListField(child=serializers.UUIDField(), required=False, max_length=10000)
+    language = serializers.ChoiceField(
+        choices=NewsletterSubscription._meta.get_field('language_preference').choices, required=False
+    )
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+
+    RULE_FIELDS = ['language', 'created_after', 'created_before']
+
+    def validate(self, data):
+        rules = [field for field in self.RULE_FIELDS if field in data]
+        if not data.get('subscriber_ids') and not rules:
+            raise serializers.ValidationError("Provide subscriber_ids or at least one rule.")
+        if data.get('subscriber_ids') and rules:
+            raise serializers.ValidationError("Provide either subscriber_ids or rules, not both.")
+        return data
@@ -0,0 +1,436 @@
+import codecs
+import csv
+import json
+import logging
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from apps.task_queue.services import heartbeat
+from .models import NewsletterSubscription, SubscriberImport, SubscriberSegment, SubscriberSegmentMembership
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+# Rows with errors kept on the import report
+MAX_REPORTED_ERRORS = 100
+
+LANGUAGES = {code for code, _ in NewsletterSubscription._meta.get_field('language_preference').choices}
+EXPORT_FIELDS = [
+    'email', 'first_name', 'last_name', 'language_preference',
+    'confirmed', 'is_active', 'created_at',
+]
+
+
+def read_rows(stream, file_format):
+    """
+    Yield one dict per subscriber row of a binary CSV or JSON Lines stream.
+    Decodes incrementally, so the file is never held in memory.
+    """
+    text = codecs.getreader('utf-8-sig')(stream, errors='replace')
+    if file_format == 'jsonl':
+        for line in text:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row if isinstance(row, dict) else {'_error': 'Invalid JSON line'}
+    else:
+        for row in csv.DictReader(text):
+            # Header names are matched case-insensitively
+            yield {(key or '').strip().lower(): value for key, value in row.items()}
+
+
+def clean_row(row):
+    """Validated NewsletterSubscription field values for a row; raises ValidationError"""
+    if '_error' in row:
+        raise ValidationError(row['_error'])
+    email = BaseUserManager.normalize_email(str(row.get('email') or '').strip())
+    validate_email(email)
+    if len(email) > NewsletterSubscription._meta.get_field('email').max_length:
+        raise ValidationError('Email is too long')
+
+    language = str(row.get('language_preference') or row.get('language') or 'en').strip().lower()[:2]
+    return {
+        'email': email,
+        'first_name': str(row.get('first_name') or '').strip()[:100],
+        'last_name': str(row.get('last_name') or '').strip()[:100],
+        'language_preference': language if language in LANGUAGES else 'en',
+    }
+
+
+def import_chunk(subscriber_import, rows, first_row_number):
+    """
+    Insert one chunk of rows and record the progress on the import.
+
+    Emails are checked against existing subscribers with a single IN query;
+    the insert and the counters commit together, so a retried import resumes
+    after the last finished chunk.
+    """
+    report = {'created': 0, 'existing': 0, 'duplicate': 0, 'invalid': 0}
+    errors = []
+    cleaned = {}
+    for offset, row in enumerate(rows):
+        try:
+            values = clean_row(row)
+        except ValidationError as e:
+            report['invalid'] += 1
+            errors.append({'row': first_row_number + offset, 'email': str(row.get('email', ''))[:254], 'error': e.messages[0]})
+            continue
+        if values['email'] in cleaned:
+            report['duplicate'] += 1
+            continue
+        cleaned[values['email']] = values
+
+    with transaction.atomic():
+        existing = set(
+            NewsletterSubscription.objects.filter(email__in=list(cleaned)).order_by().values_list('email', flat=True)
+        )
+        confirmed_at = timezone.now() if subscriber_import.mark_confirmed else None
+        new = [
+            NewsletterSubscription(confirmed=subscriber_import.mark_confirmed, confirmed_at=confirmed_at, **values)
+            for email, values in cleaned.items()
+            if email not in existing
+        ]
+        # A concurrent signup for the same email is skipped by the unique constraint
+        NewsletterSubscription.objects.bulk_create(new, batch_size=IMPORT_CHUNK_SIZE, ignore_conflicts=True)
+        report['created'] = len(new)
+        report['existing'] = len(existing)
+
+        subscriber_import.rows_processed += len(rows)
+        subscriber_import.created_count += report['created']
+        subscriber_import.existing_count += report['existing']
+        subscriber_import.duplicate_count += report['duplicate']
+        subscriber_import.invalid_count += report['invalid']
+        room = MAX_REPORTED_ERRORS - len(subscriber_import.errors)
+        if room > 0:
+            subscriber_import.errors = subscriber_import.errors + errors[:room]
+        subscriber_import.save(update_fields=[
+            'rows_processed', 'created_count', 'existing_count',
+            'duplicate_count', 'invalid_count', 'errors',
+        ])
+    return report
+
+
+def run_import(subscriber_import, stream, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+    """
+    Import every row of `stream` in chunks, skipping rows already processed
+    by an earlier attempt. `progress` is called with the import after each chunk.
+
+    Subscribers added this way don't start the subscription automations.
+    """
+    rows = islice(read_rows(stream, subscriber_import.format), subscriber_import.rows_processed, None)
+    # Row numbers in the report count the CSV header line
+    header_lines = 1 if subscriber_import.format == 'csv' else 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        import_chunk(subscriber_import, chunk, subscriber_import.rows_processed + header_lines + 1)
+        # Long imports outlive the default job lease
+        if not heartbeat():
+            logger.warning(f"Import {subscriber_import.id} was taken over by another worker, stopping")
+            break
+        if progress:
+            progress(subscriber_import)
+    return subscriber_import
+
+
+def process_import(import_id):
+    """Run a queued SubscriberImport from its uploaded file"""
+    subscriber_import = SubscriberImport.objects.filter(id=import_id).first()
+    if subscriber_import is None or subscriber_import.status == 'completed':
+        return
+
+    SubscriberImport.objects.filter(id=import_id).update(status='running', started_at=timezone.now())
+    subscriber_import.status = 'running'
+    try:
+        with subscriber_import.file.open('rb') as stream:
+            run_import(subscriber_import, stream)
+    except FileNotFoundError:
+        SubscriberImport.objects.filter(id=import_id).update(
+            status='failed', error_message='Uploaded file is missing', finished_at=timezone.now()
+        )
+        return
+    except Exception as e:
+        # The job is retried and resumes after the last finished chunk
+        SubscriberImport.objects.filter(id=import_id).update(status='failed', error_message=str(e))
+        raise
+
+    # The upload holds personal data; only the report is kept
+    subscriber_import.file.delete(save=False)
+    SubscriberImport.objects.filter(id=import_id).update(
+        status='completed', file='', error_message='', finished_at=timezone.now()
+    )
+    logger.info(
+        f"Subscriber import {import_id} finished: {subscriber_import.created_count} created, "
+        f"{subscriber_import.existing_count} existing, {subscriber_import.invalid_count} invalid"
+    )
+
+
+DAY_RULES = ['opened_within_days', 'clicked_within_days']
+# Rule -> lookup for the date range rules
+DATE_RULES = {
+    'confirmed_after': 'confirmed_at__gte',
+    'confirmed_before': 'confirmed_at__lt',
+    'created_after': 'created_at__gte',
+    'created_before': 'created_at__lt',
+}
+SEGMENT_RULES = ['language_preference', 'clicked_url', *DATE_RULES, *DAY_RULES]
+
+
+def _rule_datetime(value, name):
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        value = str(value)
+        parsed = parse_datetime(value)
+        if parsed is None and parse_date(value) is not None:
+            parsed = datetime.combine(parse_date(value), datetime.min.time())
+    if parsed is None:
+        raise ValidationError(f"{name} must be an ISO 8601 date or datetime.")
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def validate_segment_rules(rules):
+    """
+    Normalized copy of dynamic segment rules; raises ValidationError.
+
+    Rules are combined with AND:
+        language_preference: 'en' or 'ar'
+        confirmed_after / confirmed_before, created_after / created_before: ISO dates
+        opened_within_days: Opened any campaign in the last N days
+        clicked_url: Clicked this exact link in any campaign
+        clicked_within_days: Clicked any link (or `clicked_url`) in the last N days
+    """
+    if not isinstance(rules, dict):
+        raise ValidationError("Rules must be an object.")
+    unknown = sorted(set(rules) - set(SEGMENT_RULES))
+    if unknown:
+        raise ValidationError(f"Unknown rules: {', '.join(unknown)}.")
+
+    cleaned = {}
+    if 'language_preference' in rules:
+        if rules['language_preference'] not in LANGUAGES:
+            raise ValidationError(f"language_preference must be one of {', '.join(sorted(LANGUAGES))}.")
+        cleaned['language_preference'] = rules['language_preference']
+    for name in DATE_RULES:
+        if name in rules:
+            cleaned[name] = _rule_datetime(rules[name], name).isoformat()
+    for name in DAY_RULES:
+        if name in rules:
+            value = rules[name]
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValidationError(f"{name} must be a positive number of days.")
+            cleaned[name] = value
+    if 'clicked_url' in rules:
+        if not isinstance(rules['clicked_url'], str) or not rules['clicked_url'].strip():
+            raise ValidationError("clicked_url must be a URL.")
+        cleaned['clicked_url'] = rules['clicked_url'].strip()
+    return cleaned
+
+
+def segment_candidates():
+    """Subscribers that may be added to a segment"""
+    return NewsletterSubscription.objects.filter(is_active=True, confirmed=True)
+
+
+def segment_rule_queryset(rules, now=None):
+    """
+    Eligible subscribers matching validated `rules`, compiled to a single
+    query: plain filters for profile rules and EXISTS subqueries (on indexed
+    delivery and click columns) for engagement rules.
+    """
+    # Imported here because the email_system models import this app's models
+    from apps.email_system.models import EmailDelivery, LinkClick
+
+    now = now or timezone.now()
+    queryset = segment_candidates()
+    if 'language_preference' in rules:
+        queryset = queryset.filter(language_preference=rules['language_preference'])
+    for name, lookup in DATE_RULES.items():
+        if name in rules:
+            queryset = queryset.filter(**{lookup: _rule_datetime(rules[name], name)})
+    if 'opened_within_days' in rules:
+        queryset = queryset.filter(Exists(EmailDelivery.objects.filter(
+            subscriber=OuterRef('pk'), opened_at__gte=now - timedelta(days=rules['opened_within_days'])
+        )))
+    if 'clicked_url' in rules or 'clicked_within_days' in rules:
+        clicks = LinkClick.objects.filter(delivery__subscriber=OuterRef('pk'))
+        if 'clicked_url' in rules:
+            clicks = clicks.filter(url=rules['clicked_url'])
+        if 'clicked_within_days' in rules:
+            clicks = clicks.filter(clicked_at__gte=now - timedelta(days=rules['clicked_within_days']))
+        queryset = queryset.filter(Exists(clicks))
+    return queryset
+
+
+def update_member_count(segment):
+    """Store the segment's member count, counted on the membership segment index"""
+    update_member_counts([segment.pk])
+
+
+def update_member_counts(segment_ids):
+    """update_member_count() for several segments with one UPDATE"""
+    SubscriberSegment.objects.filter(pk__in=segment_ids).update(member_count=Coalesce(
+        Subquery(
+            SubscriberSegmentMembership.objects.filter(segment=OuterRef('pk'))
+            .order_by().values('segment').annotate(total=Count('pk')).values('total')
+        ),
+        0
+    ))
+
+
+def _start_segment_automations(segment, subscriber_ids):
+    # Imported here because the email_system models import this app's models
+    from apps.email_system.services import start_segment_automations
+    return start_segment_automations(segment.id, subscriber_ids)
+
+
+def _insert_members(segment, queryset):
+    """
+    Add the subscribers of `queryset` to a segment with a single
+    INSERT ... SELECT; returns the IDs that were inserted.
+    """
+    select_sql, select_params = queryset.exclude(
+        segment_memberships__segment=segment
+    ).order_by().values_list('id').query.sql_with_params()
+
+    quote = connection.ops.quote_name
+    table = SubscriberSegmentMembership._meta.db_table
+    sql = (
+        f"INSERT INTO {quote(table)} ({quote('subscriber_id')}, {quote('segment_id')}, {quote('added_at')}) "
+        f"SELECT candidate.id, %s, %s FROM ({select_sql}) AS candidate "
+        f"ON CONFLICT ({quote('subscriber_id')}, {quote('segment_id')}) DO NOTHING "
+        f"RETURNING {quote('subscriber_id')}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [segment.id, timezone.now(), *select_params])
+        return {row[0] for row in cursor.fetchall()}
+
+
+def add_segment_members(segment, subscriber_ids):
+    """
+    Add subscribers to a segment and start its 'segment_added' automations.
+
+    The requested IDs are diffed against the current members in one query and
+    the new memberships are written with one bulk INSERT. Inactive or
+    unconfirmed subscribers are skipped. Returns the IDs that were added.
+    """
+    with transaction.atomic():
+        candidates = set(
+            segment_candidates().filter(id__in=list(subscriber_ids)).exclude(
+                segment_memberships__segment=segment
+            ).order_by().values_list('id', flat=True)
+        )
+        # A concurrent add of the same member is skipped by the unique constraint
+        SubscriberSegmentMembership.objects.bulk_create([
+            SubscriberSegmentMembership(segment=segment, subscriber_id=subscriber_id)
+            for subscriber_id in candidates
+        ], batch_size=IMPORT_CHUNK_SIZE, ignore_conflicts=True)
+        update_member_count(segment)
+        _start_segment_automations(segment, candidates)
+    return candidates
+
+
+def add_segment_members_by_rules(segment, rules):
+    """
+    Add every eligible subscriber matching validated `rules` to a segment.
+
+    Evaluated in the database as a single INSERT ... SELECT, so no subscriber
+    rows are loaded into Python; only the IDs that were inserted come back,
+    to start the segment's automations. Returns those IDs.
+    """
+    with transaction.atomic():
+        added = _insert_members(segment, segment_rule_queryset(rules))
+        update_member_count(segment)
+        _start_segment_automations(segment, added)
+    return added
+
+
+def remove_segment_members(segment, subscriber_ids):
+    """Remove subscribers from a segment with one DELETE; returns how many were removed"""
+    with transaction.atomic():
+        removed, _ = SubscriberSegmentMembership.objects.filter(
+            segment=segment, subscriber_id__in=list(subscriber_ids)
+        ).delete()
+        update_member_count(segment)
+    return removed
+
+
+def refresh_segment(segment_id):
+    """
+    Bring a dynamic segment's memberships in line with its rules.
+
+    Only the difference is written: members that no longer match are removed
+    with one DELETE ... NOT IN (rules) and new matches are added with one
+    INSERT ... SELECT, so unchanged members keep their rows and `added_at`.
+    Newly added members start the segment's automations.
+    Returns (added, removed), or None when the segment isn't dynamic.
+    """
+    with transaction.atomic():
+        # Locked so concurrent refreshes of one segment run one after the other
+        segment = SubscriberSegment.objects.select_for_update().filter(pk=segment_id).first()
+        if segment is None or not segment.is_dynamic:
+            return None
+
+        matching = segment_rule_queryset(segment.rules)
+        removed, _ = SubscriberSegmentMembership.objects.filter(segment=segment).exclude(
+            subscriber_id__in=matching.order_by().values('id')
+        ).delete()
+        added = _insert_members(segment, matching)
+        update_member_count(segment)
+        SubscriberSegment.objects.filter(pk=segment.pk).update(refreshed_at=timezone.now())
+        _start_segment_automations(segment, added)
+
+    logger.info(f"Refreshed segment '{segment.name}': {len(added)} added, {removed} removed")
+    return len(added), removed
+
+
+def refresh_segments():
+    """Refresh every active dynamic segment; returns how many were refreshed"""
+    segment_ids = list(
+        SubscriberSegment.objects.filter(is_active=True).exclude(rules={}).values_list('id', flat=True)
+    )
+    for segment_id in segment_ids:
+        refresh_segment(segment_id)
+        heartbeat()
+    return len(segment_ids)
+
+
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, file_format='csv', chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield an export of `queryset` line by line.
+    Rows are read with a server-side cursor, so memory use stays flat.
+    """
+    rows = queryset.order_by('created_at', 'id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    if file_format == 'jsonl':
+        for row in rows:
+            record = dict(zip(EXPORT_FIELDS, row))
+            record['created_at'] = record['created_at'].isoformat()
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+        return
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([value.isoformat() if hasattr(value, 'isoformat') else value for value in row])
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, pre_delete
+
+from .models import NewsletterSubscription
+from .services import update_member_counts
+
+
+def _remember_segments(sender, instance, **kwargs):
+    # The memberships are removed by cascade, which bypasses the services
+    # that keep member_count current; note the segments before they go
+    instance._segment_ids = list(instance.segment_memberships.values_list('segment_id', flat=True))
+
+
+def _recount_segments(sender, instance, **kwargs):
+    segment_ids = getattr(instance, '_segment_ids', None)
+    if segment_ids:
+        update_member_counts(segment_ids)
+
+
+pre_delete.connect(_remember_segments, sender=NewsletterSubscription, dispatch_uid='segment_counts:remember')
+post_delete.connect(_recount_segments, sender=NewsletterSubscription, dispatch_uid='segment_counts:recount')
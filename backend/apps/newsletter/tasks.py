@@ -0,0 +1,12 @@
+from apps.task_queue.services import register_task
+from . import services
+
+
+@register_task('newsletter.import_subscribers')
+def import_subscribers(import_id):
+    services.process_import(import_id)
+
+
+@register_task('newsletter.refresh_segment')
+def refresh_segment(segment_id):
+    services.refresh_segment(segment_id)
@@ -1,3 +1,412 @@
-from django.test import TestCase
+import io
+import json
+import smtplib
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.email_system.models import (
+    AutomationExecution, AutomationStep, EmailDelivery, LinkClick, NewsletterAutomation
+)
+from apps.email_system.services import send_campaign
+from apps.task_queue.models import Job
+from apps.task_queue.services import run_due_jobs
+from .models import (
+    NewsletterSubscription, NewsletterTemplate, NewsletterCampaign, SubscriberImport,
+    SubscriberSegment, SubscriberSegmentMembership
+)
+from .services import add_segment_members, refresh_segment, run_import
 
-# Create your tests here.
+
+class FlakyEmailBackend(locmem.EmailBackend):
+    """Locmem backend that raises the scripted error (or None to deliver) for each send"""
+    script = []
+    opened = 0
+
+    def open(self):
+        FlakyEmailBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        error = self.script.pop(0) if self.script else None
+        if error is not None:
+            raise error
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class CampaignSendTest(TestCase):
+    """Test that campaigns are sent by the background workers"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        )
+        template = NewsletterTemplate.objects.create(
+            name='Monthly', type='newsletter',
+            subject_en='News', subject_ar='أخبار',
+            content_en='<p>Hi {{first_name}}</p><a href="https://example.com">Read</a>',
+            content_ar='<p>مرحبا</p>'
+        )
+        self.campaign = NewsletterCampaign.objects.create(name='May', template=template)
+        for index, lang in enumerate(['en', 'ar', 'en']):
+            NewsletterSubscription.objects.create(
+                email=f'reader{index}@example.com', first_name=f'Reader{index}',
+                language_preference=lang, confirmed=True
+            )
+
+    def test_send_now_queues_job_for_workers(self):
+        """Test that send_now only queues work and a worker sends it"""
+        response = self.client.post(f'/api/v1/newsletter/campaigns/{self.campaign.id}/send_now/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Job.objects.filter(task_name='email_system.send_campaign').count(), 1)
+
+        run_due_jobs('worker-1')
+
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, 'sent')
+        self.assertEqual(self.campaign.successful_deliveries, 3)
+        self.assertEqual(len(mail.outbox), 3)
+        english = next(message for message in mail.outbox if message.to == ['reader0@example.com'])
+        self.assertIn('Hi Reader0', english.body)
+        self.assertIn('/api/v1/email/track/click/', english.alternatives[0][0])
+
+    def test_send_now_replaces_the_scheduled_send(self):
+        """Test that sending a scheduled campaign now drops its queued job"""
+        url = f'/api/v1/newsletter/campaigns/{self.campaign.id}'
+        scheduled_at = (timezone.now() + timedelta(hours=1)).isoformat()
+        self.assertEqual(self.client.post(f'{url}/schedule/', {'scheduled_at': scheduled_at}).status_code, 200)
+
+        self.client.post(f'{url}/send_now/')
+
+        job = Job.objects.get(task_name='email_system.send_campaign')
+        self.assertLessEqual(job.run_at, timezone.now())
+        run_due_jobs('worker-1')
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_schedule_needs_a_timezone(self):
+        """Test that a naive scheduled_at is rejected instead of guessed"""
+        response = self.client.post(
+            f'/api/v1/newsletter/campaigns/{self.campaign.id}/schedule/', {'scheduled_at': '2030-05-01T09:00:00'}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, 'draft')
+
+    def test_resumed_send_skips_delivered_subscribers(self):
+        """Test that a restarted send does not email anyone twice"""
+        self.client.post(f'/api/v1/newsletter/campaigns/{self.campaign.id}/send_now/')
+        first = NewsletterSubscription.objects.get(email='reader0@example.com')
+        EmailDelivery.objects.create(campaign=self.campaign, subscriber=first, status='sent')
+
+        run_due_jobs('worker-1')
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertNotIn('reader0@example.com', [message.to[0] for message in mail.outbox])
+
+    def test_batches_cover_every_recipient(self):
+        """Test that recipients spanning several batches each get one email"""
+        NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(status='sending')
+
+        send_campaign(self.campaign.id, batch_size=2)
+
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, 'sent')
+        self.assertEqual(self.campaign.successful_deliveries, 3)
+        self.assertEqual(EmailDelivery.objects.filter(campaign=self.campaign, status='sent').count(), 3)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [
+            'reader0@example.com', 'reader1@example.com', 'reader2@example.com'
+        ])
+
+
+    @override_settings(EMAIL_BACKEND='apps.newsletter.tests.FlakyEmailBackend')
+    def test_dropped_connection_leaves_recipients_pending(self):
+        """Test that a disconnect reconnects or retries instead of failing the rest of the campaign"""
+        NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(status='sending')
+        refused = smtplib.SMTPRecipientsRefused({'reader@example.com': (550, b'No such user')})
+        FlakyEmailBackend.opened = 0
+        FlakyEmailBackend.script = [refused, smtplib.SMTPServerDisconnected('gone'), None, None]
+
+        send_campaign(self.campaign.id)
+
+        self.campaign.refresh_from_db()
+        self.assertEqual(FlakyEmailBackend.opened, 2)
+        self.assertEqual((self.campaign.status, self.campaign.successful_deliveries, self.campaign.bounces), ('sent', 2, 1))
+        # Recipients go out in id order: the first was refused, the second hit the disconnect
+        first = NewsletterSubscription.objects.order_by('id').first()
+        self.assertEqual(EmailDelivery.objects.get(status='failed').subscriber, first)
+        self.assertEqual(EmailDelivery.objects.filter(status='sent').count(), 2)
+
+    @override_settings(EMAIL_BACKEND='apps.newsletter.tests.FlakyEmailBackend')
+    def test_connection_that_stays_down_raises_for_a_retry(self):
+        """Test that a connection that fails again after reconnecting raises and fails nobody"""
+        NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(status='sending')
+        FlakyEmailBackend.script = [None, ConnectionResetError(), ConnectionResetError()]
+
+        with self.assertRaises(ConnectionResetError):
+            send_campaign(self.campaign.id)
+
+        self.assertEqual(EmailDelivery.objects.filter(status='sent').count(), 1)
+        self.assertEqual(EmailDelivery.objects.filter(status='pending').count(), 2)
+        self.assertFalse(EmailDelivery.objects.filter(status='failed').exists())
+
+        FlakyEmailBackend.script = []
+        send_campaign(self.campaign.id)
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.status, self.campaign.successful_deliveries), ('sent', 3))
+
+
+class SlowEmailBackend(locmem.EmailBackend):
+    """Locmem backend that takes a moment per message, so concurrent sends overlap"""
+
+    def send_messages(self, messages):
+        time.sleep(0.05)
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='apps.newsletter.tests.SlowEmailBackend')
+class ConcurrentCampaignSendTest(TransactionTestCase):
+    """Test that two runs of one campaign never email a recipient twice"""
+
+    def test_concurrent_runs_take_turns(self):
+        """Test that the campaign row lock makes overlapping runs share the recipients"""
+        template = NewsletterTemplate.objects.create(
+            name='Monthly', type='newsletter', subject_en='News', content_en='<p>Hi</p>'
+        )
+        campaign = NewsletterCampaign.objects.create(name='May', template=template, status='sending')
+        for index in range(6):
+            NewsletterSubscription.objects.create(email=f'reader{index}@example.com', confirmed=True)
+
+        errors = []
+
+        def run():
+            try:
+                send_campaign(campaign.id, batch_size=2)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [
+            f'reader{index}@example.com' for index in range(6)
+        ])
+        campaign.refresh_from_db()
+        self.assertEqual((campaign.status, campaign.successful_deliveries), ('sent', 6))
+
+
+@override_settings(PRIVATE_MEDIA_ROOT=tempfile.mkdtemp())
+class SubscriberImportExportTest(TestCase):
+    """Test bulk subscriber import and streaming export"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        )
+        NewsletterSubscription.objects.create(email='existing@example.com', confirmed=True)
+
+    def test_import_dedups_and_reports_in_chunks(self):
+        """Test that each chunk costs a fixed number of queries and the report adds up"""
+        rows = ['email,First_Name,last_name,language_preference']
+        rows += [f'reader{index}@Example.com,Reader,{index},ar' for index in range(5)]
+        rows += ['existing@example.com,,,en', 'reader1@example.com,,,en', 'not-an-email,,,en']
+        subscriber_import = SubscriberImport.objects.create(format='csv', mark_confirmed=True)
+
+        # Per chunk: savepoint, IN lookup, insert (skipped when nothing is new), report update, release
+        with self.assertNumQueries(5 + 5 + 4):
+            run_import(subscriber_import, io.BytesIO('\n'.join(rows).encode('utf-8')), chunk_size=3)
+
+        subscriber_import.refresh_from_db()
+        self.assertEqual(subscriber_import.rows_processed, 8)
+        self.assertEqual(subscriber_import.created_count, 5)
+        self.assertEqual(subscriber_import.existing_count, 2)
+        self.assertEqual(subscriber_import.invalid_count, 1)
+        self.assertEqual(subscriber_import.errors[0]['row'], 9)
+        reader = NewsletterSubscription.objects.get(email='reader0@example.com')
+        self.assertEqual((reader.first_name, reader.language_preference, reader.confirmed), ('Reader', 'ar', True))
+
+    def test_upload_is_processed_by_worker(self):
+        """Test the API upload, the background job and the progress report"""
+        lines = '\n'.join(json.dumps({'email': f'json{index}@example.com'}) for index in range(3))
+        response = self.client.post('/api/v1/newsletter/subscriptions/import/', {
+            'file': SimpleUploadedFile('list.jsonl', lines.encode('utf-8')),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['format'], 'jsonl')
+        self.assertEqual(NewsletterSubscription.objects.count(), 1)
+
+        run_due_jobs('worker-1')
+
+        report = self.client.get(f"/api/v1/newsletter/imports/{response.data['id']}/").data
+        self.assertEqual((report['status'], report['created_count']), ('completed', 3))
+        self.assertFalse(SubscriberImport.objects.get(id=response.data['id']).file)
+
+    def test_export_streams_filtered_rows(self):
+        """Test the CSV export and its filters"""
+        NewsletterSubscription.objects.create(email='pending@example.com', first_name='Pat')
+
+        response = self.client.get('/api/v1/newsletter/subscriptions/export/', {'confirmed': 'false'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(lines[0], 'email,first_name,last_name,language_preference,confirmed,is_active,created_at')
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('pending@example.com,Pat,,en,False,True,'))
+
+        response = self.client.get('/api/v1/newsletter/subscriptions/export/', {'export_format': 'jsonl'})
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([record['email'] for record in records], ['existing@example.com', 'pending@example.com'])
+
+    def test_import_and_export_require_admin(self):
+        """Test that anonymous users cannot import or export"""
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/v1/newsletter/subscriptions/export/').status_code, 403)
+        self.assertEqual(self.client.post('/api/v1/newsletter/subscriptions/import/').status_code, 403)
+
+
+class SegmentMembershipTest(TestCase):
+    """Test bulk and rule-based segment membership changes"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        )
+        self.segment = SubscriberSegment.objects.create(name='VIP')
+        template = NewsletterTemplate.objects.create(
+            name='Welcome', type='welcome', subject_en='Hi', subject_ar='مرحبا',
+            content_en='<p>Hi</p>', content_ar='<p>مرحبا</p>'
+        )
+        self.automation = NewsletterAutomation.objects.create(
+            name='VIP welcome', trigger_type='segment_added', segment=self.segment, delay_days=1
+        )
+        AutomationStep.objects.create(automation=self.automation, template=template, order=1)
+        self.subscribers = [
+            NewsletterSubscription.objects.create(
+                email=f'member{index}@example.com', language_preference='ar' if index % 2 else 'en', confirmed=True
+            )
+            for index in range(6)
+        ]
+
+    def test_bulk_add_costs_fixed_queries(self):
+        """Test that adding many members and starting automations doesn't query per subscriber"""
+        SubscriberSegmentMembership.objects.create(segment=self.segment, subscriber=self.subscribers[0])
+        ids = [subscriber.id for subscriber in self.subscribers]
+
+        # Savepoint, diff, insert members, count update, automations, steps,
+        # enrolled lookup, insert executions, release
+        with self.assertNumQueries(9):
+            added = add_segment_members(self.segment, ids)
+
+        self.assertEqual(added, set(ids[1:]))
+        self.assertEqual(self.segment.subscribers.count(), 6)
+        executions = AutomationExecution.objects.filter(automation=self.automation)
+        self.assertEqual(executions.count(), 5)
+        self.assertTrue(all(execution.next_step_scheduled_at > timezone.now() for execution in executions))
+
+    def test_deleting_a_subscriber_updates_the_count(self):
+        """Test that memberships removed by cascade are taken off the stored count"""
+        add_segment_members(self.segment, [subscriber.id for subscriber in self.subscribers[:3]])
+
+        response = self.client.delete(f'/api/v1/newsletter/subscriptions/{self.subscribers[0].id}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.segment.refresh_from_db()
+        self.assertEqual(self.segment.member_count, 2)
+
+    def test_add_by_rules_and_remove(self):
+        """Test rule-based adds through the API and removal by ID"""
+        NewsletterSubscription.objects.filter(pk=self.subscribers[1].pk).update(
+            created_at=timezone.now() - timedelta(days=30)
+        )
+        NewsletterSubscription.objects.create(email='pending@example.com', language_preference='ar')
+        url = f'/api/v1/newsletter/segments/{self.segment.id}/'
+
+        response = self.client.post(f'{url}add_subscribers/', {
+            'language': 'ar', 'created_after': (timezone.now() - timedelta(days=7)).isoformat()
+        }, format='json')
+        self.assertEqual(response.data['added'], 2)
+        self.assertEqual(
+            set(self.segment.subscribers.values_list('subscriber__email', flat=True)),
+            {'member3@example.com', 'member5@example.com'}
+        )
+        self.assertEqual(AutomationExecution.objects.count(), 2)
+
+        # Repeating the rule adds nobody twice
+        response = self.client.post(f'{url}add_subscribers/', {'language': 'ar'}, format='json')
+        self.assertEqual(response.data['added'], 1)
+        self.assertEqual(self.client.get(url).data['subscriber_count'], 3)
+
+        response = self.client.post(f'{url}remove_subscribers/', {
+            'subscriber_ids': [str(self.subscribers[3].id), str(self.subscribers[0].id)]
+        }, format='json')
+        self.assertEqual(response.data['removed'], 1)
+        self.assertEqual(self.client.post(f'{url}add_subscribers/', {}, format='json').status_code, 400)
+
+    def test_dynamic_segment_is_materialized_from_rules(self):
+        """Test that a rule-based segment is filled by a job and refreshed incrementally"""
+        template = NewsletterTemplate.objects.get(name='Welcome')
+        campaign = NewsletterCampaign.objects.create(name='June', template=template)
+        recent = EmailDelivery.objects.create(
+            campaign=campaign, subscriber=self.subscribers[1], status='opened', opened_at=timezone.now()
+        )
+        EmailDelivery.objects.create(
+            campaign=campaign, subscriber=self.subscribers[3], status='opened',
+            opened_at=timezone.now() - timedelta(days=60)
+        )
+        LinkClick.objects.create(delivery=recent, url='https://example.com/offer')
+
+        response = self.client.post('/api/v1/newsletter/segments/', {
+            'name': 'Engaged Arabic readers',
+            'rules': {'language_preference': 'ar', 'opened_within_days': 30},
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data['is_dynamic'])
+        segment = SubscriberSegment.objects.get(id=response.data['id'])
+
+        run_due_jobs('worker-1')
+
+        segment.refresh_from_db()
+        self.assertEqual(list(segment.subscribers.values_list('subscriber', flat=True)), [self.subscribers[1].id])
+        self.assertEqual(segment.member_count, 1)
+        self.assertIsNotNone(segment.refreshed_at)
+        campaign.segments.add(segment)
+        self.assertEqual(list(campaign.get_all_subscribers()), [self.subscribers[1]])
+
+        # A refresh only writes the difference
+        EmailDelivery.objects.filter(subscriber=self.subscribers[3]).update(opened_at=timezone.now())
+        kept = segment.subscribers.get()
+        self.assertEqual(refresh_segment(segment.id), (1, 0))
+        self.assertEqual(segment.subscribers.get(subscriber=self.subscribers[1]).added_at, kept.added_at)
+
+        segment.rules = {'clicked_url': 'https://example.com/offer'}
+        segment.save()
+        self.assertEqual(refresh_segment(segment.id), (0, 1))
+
+        # Rules are validated and members can't be edited by hand
+        response = self.client.patch(f'/api/v1/newsletter/segments/{segment.id}/', {
+            'rules': {'opened_within_days': 0}
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(f'/api/v1/newsletter/segments/{segment.id}/add_subscribers/', {
+            'subscriber_ids': [str(self.subscribers[0].id)]
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -2,7 +2,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     NewsletterSubscriptionViewSet, SubscriberSegmentViewSet,
-    NewsletterTemplateViewSet, NewsletterCampaignViewSet
+    NewsletterTemplateViewSet, NewsletterCampaignViewSet, SubscriberImportViewSet
 )
 
 router = DefaultRouter()
@@ -10,6 +10,7 @@ router.register('subscriptions', NewsletterSubscriptionViewSet, basename='subscr
 router.register('segments', SubscriberSegmentViewSet, basename='segment')
 router.register('templates', NewsletterTemplateViewSet, basename='template')
 router.register('campaigns', NewsletterCampaignViewSet, basename='campaign')
+router.register('imports', SubscriberImportViewSet, basename='import')
 
 app_name = 'newsletter'
 
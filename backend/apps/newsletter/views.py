@@ -2,22 +2,41 @@ from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser, FormParser
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 import uuid
 import logging
+from apps.task_queue.services import cancel_jobs, enqueue
 from .models import (
     NewsletterSubscription, SubscriberSegment, 
-    NewsletterTemplate, NewsletterCampaign
+    NewsletterTemplate, NewsletterCampaign, SubscriberImport
 )
 from .serializers import (
     NewsletterSubscriptionSerializer, SubscriberSegmentSerializer,
     NewsletterTemplateSerializer, NewsletterCampaignSerializer,
-    ConfirmSubscriptionSerializer, UnsubscribeSerializer
+    ConfirmSubscriptionSerializer, UnsubscribeSerializer,
+    SubscriberImportSerializer, SubscriberImportUploadSerializer, SegmentMembersSerializer
 )
+from .services import (
+    add_segment_members, add_segment_members_by_rules, export_rows, remove_segment_members
+)
+
+DYNAMIC_SEGMENT_ERROR = "Members of a dynamic segment follow its rules; edit the rules instead."
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+
+def start_automations(trigger_type, subscription):
+    """Queue the automations triggered by a subscription event"""
+    # Imported here because the email_system models import this app's models
+    from apps.email_system.services import start_automations as start
+    start(trigger_type, subscription)
+
+
 class NewsletterSubscriptionViewSet(viewsets.ModelViewSet):
     """API endpoint for newsletter subscriptions"""
     queryset = NewsletterSubscription.objects.all()
@@ -26,8 +45,8 @@ class NewsletterSubscriptionViewSet(viewsets.ModelViewSet):
     http_method_names = ['post', 'get', 'delete']  # Allow viewing and deleting too
     
     def get_permissions(self):
-        """Only allow admin users to list subscribers"""
-        if self.action in ['list', 'retrieve']:
+        """Only allow admin users to list, import and export subscribers"""
+        if self.action in ['list', 'retrieve', 'bulk_import', 'export']:
             return [permissions.IsAdminUser()]
         return super().get_permissions()
     
@@ -64,6 +83,8 @@ class NewsletterSubscriptionViewSet(viewsets.ModelViewSet):
                 # Create new subscription
                 subscription = serializer.save()
             
+            start_automations('subscription', subscription)
+            
             # For now, we'll simply respond - email sending will be implemented later
             return Response(
                 {"detail": "Please check your email to confirm your subscription."},
@@ -89,6 +110,7 @@ class NewsletterSubscriptionViewSet(viewsets.ModelViewSet):
                 # Confirm the subscription
                 subscription.confirmed = True
                 subscription.save()
+                start_automations('confirmation', subscription)
                 
                 return Response(
                     {"detail": "Subscription confirmed successfully."},
@@ -126,6 +148,60 @@ class NewsletterSubscriptionViewSet(viewsets.ModelViewSet):
                 )
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def bulk_import(self, request):
+        """
+        Queue a CSV or JSON Lines file of subscribers for import.
+        Columns: email (required), first_name, last_name, language_preference.
+        Poll the returned report at /newsletter/imports/<id>/.
+        """
+        serializer = SubscriberImportUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data['file']
+        
+        with transaction.atomic():
+            subscriber_import = SubscriberImport.objects.create(
+                file=upload,
+                file_name=upload.name[:255],
+                format=serializer.validated_data['format'],
+                mark_confirmed=serializer.validated_data['mark_confirmed'],
+                created_by=request.user,
+            )
+            enqueue('newsletter.import_subscribers', {'import_id': str(subscriber_import.id)})
+        
+        return Response(SubscriberImportSerializer(subscriber_import).data, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream every subscriber as CSV (default) or JSON Lines (`?export_format=jsonl`).
+        Optional filters: is_active, confirmed, language_preference.
+        """
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in ('csv', 'jsonl'):
+            return Response({"detail": "export_format must be csv or jsonl."}, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = NewsletterSubscription.objects.all()
+        for field in ['is_active', 'confirmed']:
+            value = request.query_params.get(field)
+            if value is not None:
+                queryset = queryset.filter(**{field: value.lower() in ('1', 'true', 'yes')})
+        if request.query_params.get('language_preference'):
+            queryset = queryset.filter(language_preference=request.query_params['language_preference'])
+        
+        content_type = 'text/csv; charset=utf-8' if export_format == 'csv' else 'application/x-ndjson; charset=utf-8'
+        response = StreamingHttpResponse(export_rows(queryset, export_format), content_type=content_type)
+        filename = f"subscribers-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class SubscriberImportViewSet(viewsets.ReadOnlyModelViewSet):
+    """API endpoint for bulk import progress reports"""
+    queryset = SubscriberImport.objects.all()
+    serializer_class = SubscriberImportSerializer
+    permission_classes = [permissions.IsAdminUser]
 
 
 class SubscriberSegmentViewSet(viewsets.ModelViewSet):
@@ -133,6 +209,85 @@ class SubscriberSegmentViewSet(viewsets.ModelViewSet):
     queryset = SubscriberSegment.objects.all()
     serializer_class = SubscriberSegmentSerializer
     permission_classes = [permissions.IsAdminUser]
+    
+    def perform_create(self, serializer):
+        """Materialize the members of a new dynamic segment in the background"""
+        with transaction.atomic():
+            segment = serializer.save()
+            if segment.is_dynamic:
+                enqueue('newsletter.refresh_segment', {'segment_id': str(segment.id)})
+    
+    def perform_update(self, serializer):
+        """Re-materialize the members when the rules of a segment change"""
+        previous_rules = serializer.instance.rules
+        with transaction.atomic():
+            segment = serializer.save()
+            if segment.is_dynamic and segment.rules != previous_rules:
+                enqueue('newsletter.refresh_segment', {'segment_id': str(segment.id)})
+    
+    @action(detail=True, methods=['post'])
+    def refresh(self, request, pk=None):
+        """Queue a refresh of a dynamic segment's members"""
+        segment = self.get_object()
+        if not segment.is_dynamic:
+            return Response(
+                {"detail": "Only dynamic segments can be refreshed."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        enqueue('newsletter.refresh_segment', {'segment_id': str(segment.id)})
+        return Response(
+            {"detail": "Segment refresh queued."},
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @action(detail=True, methods=['post'])
+    def add_subscribers(self, request, pk=None):
+        """
+        Add subscribers to a segment, by `subscriber_ids` or by rules
+        (`language`, `created_after`, `created_before`).
+        Only active, confirmed subscribers are added.
+        """
+        segment = self.get_object()
+        if segment.is_dynamic:
+            return Response({"detail": DYNAMIC_SEGMENT_ERROR}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = SegmentMembersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        if data.get('subscriber_ids'):
+            added = add_segment_members(segment, data['subscriber_ids'])
+        else:
+            rules = {'language_preference': data.get('language'), 'created_after': data.get('created_after'),
+                     'created_before': data.get('created_before')}
+            added = add_segment_members_by_rules(
+                segment, {name: value for name, value in rules.items() if value is not None}
+            )
+        
+        return Response(
+            {"detail": f"Added {len(added)} subscribers to segment.", "added": len(added)},
+            status=status.HTTP_200_OK
+        )
+    
+    @action(detail=True, methods=['post'])
+    def remove_subscribers(self, request, pk=None):
+        """Remove subscribers from a segment by `subscriber_ids`"""
+        segment = self.get_object()
+        if segment.is_dynamic:
+            return Response({"detail": DYNAMIC_SEGMENT_ERROR}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = SegmentMembersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if not serializer.validated_data.get('subscriber_ids'):
+            return Response(
+                {"detail": "No subscriber IDs provided."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        removed = remove_segment_members(segment, serializer.validated_data['subscriber_ids'])
+        return Response(
+            {"detail": f"Removed {removed} subscribers from segment.", "removed": removed},
+            status=status.HTTP_200_OK
+        )
 
 
 class NewsletterTemplateViewSet(viewsets.ModelViewSet):
@@ -159,16 +314,61 @@ class NewsletterCampaignViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Schedule the campaign
-        campaign.status = 'scheduled'
-        campaign.scheduled_at = timezone.now()  # Default to now if no date provided
-        campaign.save()
+        scheduled_at = timezone.now()  # Default to now if no date provided
+        if request.data.get('scheduled_at'):
+            scheduled_at = parse_datetime(str(request.data['scheduled_at']))
+            if scheduled_at is None:
+                return Response(
+                    {"detail": "Invalid scheduled_at datetime."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(scheduled_at):
+                return Response(
+                    {"detail": "scheduled_at must include a timezone offset."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        # Schedule the campaign; a worker sends it when the job comes due
+        with transaction.atomic():
+            campaign.status = 'scheduled'
+            campaign.scheduled_at = scheduled_at
+            campaign.save()
+            enqueue('email_system.send_campaign', {'campaign_id': str(campaign.id)}, run_at=scheduled_at)
         
         return Response(
             {"detail": "Campaign scheduled successfully."},
             status=status.HTTP_200_OK
         )
     
+    @action(detail=True, methods=['post'])
+    def send_now(self, request, pk=None):
+        """Queue a campaign for immediate sending by the background workers"""
+        campaign = self.get_object()
+        
+        # The status change and the job commit together, so a campaign
+        # is never marked as sending without a job to send it. The row lock
+        # keeps a scheduled job that comes due meanwhile from starting too.
+        with transaction.atomic():
+            campaign = NewsletterCampaign.objects.select_for_update().get(pk=campaign.pk)
+            if campaign.status not in ['draft', 'scheduled']:
+                return Response(
+                    {"detail": "Only draft or scheduled campaigns can be sent."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            payload = {'campaign_id': str(campaign.id)}
+            # The scheduled send is replaced by this one
+            cancel_jobs('email_system.send_campaign', payload)
+            campaign.status = 'sending'
+            campaign.total_recipients = campaign.get_all_subscribers().count()
+            campaign.save()
+            enqueue('email_system.send_campaign', payload)
+        
+        return Response(
+            {"detail": "Campaign queued for immediate sending."},
+            status=status.HTTP_200_OK
+        )
+    
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         """Cancel a scheduled campaign"""
@@ -180,9 +380,11 @@ class NewsletterCampaignViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Cancel the campaign
-        campaign.status = 'cancelled'
-        campaign.save()
+        # Cancel the campaign and drop its scheduled send
+        with transaction.atomic():
+            campaign.status = 'cancelled'
+            campaign.save()
+            cancel_jobs('email_system.send_campaign', {'campaign_id': str(campaign.id)})
         
         return Response(
             {"detail": "Campaign cancelled successfully."},
@@ -1,4 +1,6 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 
@@ -13,7 +15,7 @@ class ProjectCategory(models.Model):
     description_ar = models.TextField(blank=True)
     parent = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='children')
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Project Category"
@@ -74,8 +76,16 @@ class Project(models.Model):
     is_featured = models.BooleanField(default=False)
     is_published = models.BooleanField(default=False, help_text="Only published projects are displayed on the website")
     cover_image = models.ImageField(upload_to='projects/covers/', blank=True, null=True)
+    # Maintained by apps.imaging.services.watch_images, see signals.py
+    cover_image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Maintained by utils.search.watch_search_vectors, see signals.py
+    search_vector_en = SearchVectorField(null=True, editable=False)
+    search_vector_ar = SearchVectorField(null=True, editable=False)
+
+    # Localized fields indexed for full-text search, with their rank weights
+    SEARCH_WEIGHTS = {'title': 'A', 'location': 'B', 'client': 'C', 'description': 'D'}
     tags = models.ManyToManyField(Tag, blank=True, related_name='projects')
     
     # Note: designer field will be added after User model is created
@@ -83,6 +93,12 @@ class Project(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination on (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='project_created_idx'),
+            GinIndex(fields=['search_vector_en'], name='project_search_en_gin'),
+            GinIndex(fields=['search_vector_ar'], name='project_search_ar_gin'),
+        ]
 
     def __str__(self):
         return self.title_en
@@ -114,6 +130,7 @@ class ProjectImage(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='projects/%Y/%m/')
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     alt_text_en = models.CharField(max_length=200, blank=True)
     alt_text_ar = models.CharField(max_length=200, blank=True)
     is_cover = models.BooleanField(default=False)
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.conf import settings
 from .models import Project, ProjectCategory, Tag, ProjectImage
+from apps.imaging.serializers import RenditionsField
+from apps.imaging.services import serialize_renditions
+from utils.search import SearchResultSerializerMixin
 
 # Helper function to get full media URL
 def get_absolute_media_url(request, path):
@@ -12,6 +15,17 @@ def get_absolute_media_url(request, path):
         return request.build_absolute_uri(f'{settings.MEDIA_URL}{path}')
     return f'/media/{path}'
 
+def get_cover_project_image(obj):
+    """
+    Return the first cover ProjectImage for a project.
+    Uses the `prefetched_cover_images` list attached by ProjectViewSet when
+    available so that serializing a page of projects doesn't query per row.
+    """
+    prefetched = getattr(obj, 'prefetched_cover_images', None)
+    if prefetched is not None:
+        return prefetched[0] if prefetched else None
+    return obj.images.filter(is_cover=True).first()
+
 class TagSerializer(serializers.ModelSerializer):
     """Serializer for project tags"""
     class Meta:
@@ -52,7 +66,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
         ]
     
     def get_cover_image(self, obj):
-        cover_image = obj.images.filter(is_cover=True).first()
+        cover_image = get_cover_project_image(obj)
         if cover_image:
             request = self.context.get('request')
             if request:
@@ -67,7 +81,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
             return get_absolute_media_url(request, str(obj.cover_image))
             
         # Otherwise try to find a cover image in project images
-        cover_image = obj.images.filter(is_cover=True).first()
+        cover_image = get_cover_project_image(obj)
         if cover_image:
             request = self.context.get('request')
             return get_absolute_media_url(request, str(cover_image.image))
@@ -120,16 +134,17 @@ class LocalizedCategorySerializer(serializers.ModelSerializer):
 class LocalizedProjectImageSerializer(serializers.ModelSerializer):
     """Project image serializer with localization support"""
     alt_text = serializers.SerializerMethodField()
+    renditions = RenditionsField(source='image_renditions')
     
     class Meta:
         model = ProjectImage
-        fields = ['id', 'image', 'alt_text', 'is_cover', 'order']
+        fields = ['id', 'image', 'renditions', 'alt_text', 'is_cover', 'order']
     
     def get_alt_text(self, obj):
         language = self.context.get('language', 'en')
         return getattr(obj, f'alt_text_{language}') if getattr(obj, f'alt_text_{language}') else obj.alt_text_en
 
-class LocalizedProjectListSerializer(serializers.ModelSerializer):
+class LocalizedProjectListSerializer(SearchResultSerializerMixin, serializers.ModelSerializer):
     """Project list serializer with localization support"""
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
@@ -138,13 +153,14 @@ class LocalizedProjectListSerializer(serializers.ModelSerializer):
     tags = LocalizedTagSerializer(many=True, read_only=True)
     cover_image = serializers.SerializerMethodField()
     cover_image_url = serializers.SerializerMethodField()
+    cover_image_renditions = serializers.SerializerMethodField()
     
     class Meta:
         model = Project
         fields = [
             'id', 'title', 'slug', 'description', 'category',
             'location', 'area', 'completed_date', 'is_featured', 'is_published',
-            'created_at', 'tags', 'cover_image', 'cover_image_url'
+            'created_at', 'tags', 'cover_image', 'cover_image_url', 'cover_image_renditions'
         ]
     
     def get_title(self, obj):
@@ -160,7 +176,7 @@ class LocalizedProjectListSerializer(serializers.ModelSerializer):
         return getattr(obj, f'location_{language}') if getattr(obj, f'location_{language}') else obj.location_en
     
     def get_cover_image(self, obj):
-        cover_image = obj.images.filter(is_cover=True).first()
+        cover_image = get_cover_project_image(obj)
         if cover_image:
             request = self.context.get('request')
             if request:
@@ -175,12 +191,22 @@ class LocalizedProjectListSerializer(serializers.ModelSerializer):
             return get_absolute_media_url(request, str(obj.cover_image))
             
         # Otherwise try to find a cover image in project images
-        cover_image = obj.images.filter(is_cover=True).first()
+        cover_image = get_cover_project_image(obj)
         if cover_image:
             request = self.context.get('request')
             return get_absolute_media_url(request, str(cover_image.image))
         return None
 
+    def get_cover_image_renditions(self, obj):
+        # Same image as cover_image_url
+        request = self.context.get('request')
+        if obj.cover_image:
+            return serialize_renditions(obj.cover_image_renditions, request)
+        cover_image = get_cover_project_image(obj)
+        if cover_image:
+            return serialize_renditions(cover_image.image_renditions, request)
+        return None
+
 class LocalizedProjectDetailSerializer(serializers.ModelSerializer):
     """Detailed project serializer with localization support"""
     title = serializers.SerializerMethodField()
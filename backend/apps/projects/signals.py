@@ -0,0 +1,14 @@
+from apps.imaging.services import watch_images
+from utils.cache import watch_models
+from utils.search import watch_search_vectors
+from .models import Project, ProjectCategory, Tag, ProjectImage
+
+# Refresh the stored search vectors before cached responses are invalidated
+watch_search_vectors(Project, Project.SEARCH_WEIGHTS)
+
+# Generate responsive renditions off the request thread when images change
+watch_images(Project, 'cover_image')
+watch_images(ProjectImage, 'image')
+
+# Invalidate cached API responses whenever this app's content changes
+watch_models(Project, ProjectCategory, Tag, ProjectImage)
@@ -1,3 +1,290 @@
-from django.test import TestCase
+import json
+import time
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+from utils.instrumentation import RequestMetricsMiddleware, sql_shape
+from .models import Project, ProjectCategory, Tag, ProjectImage
+from .views import ProjectListAsyncView, ProjectViewSet
+
+
+class ProjectQueryPlanTest(TestCase):
+    """Test that the project endpoints run a constant number of queries"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.list_view = ProjectViewSet.as_view({'get': 'list'})
+        self.detail_view = ProjectViewSet.as_view({'get': 'retrieve'})
+        self.category = ProjectCategory.objects.create(
+            name_en='Residential',
+            name_ar='سكني',
+            description_en='Homes',
+            description_ar='منازل'
+        )
+        self.tags = [
+            Tag.objects.create(name_en='Modern', name_ar='حديث'),
+            Tag.objects.create(name_en='Minimal', name_ar='بسيط'),
+        ]
+
+    def create_projects(self, count):
+        for index in range(count):
+            project = Project.objects.create(
+                title_en=f'Project {index}',
+                title_ar=f'مشروع {index}',
+                slug=f'project-{Project.objects.count()}',
+                description_en='Description',
+                description_ar='وصف',
+                location_en='Dubai',
+                client_en='Client',
+                category=self.category,
+                is_published=True
+            )
+            project.tags.set(self.tags)
+            ProjectImage.objects.create(project=project, image='projects/cover.jpg', is_cover=True, order=0)
+            ProjectImage.objects.create(project=project, image='projects/other.jpg', order=1)
+
+    def test_list_query_count_is_constant(self):
+        """Test that listing projects doesn't query per row"""
+        self.create_projects(2)
+        # validators, count, projects + category, tags, cover images
+        with self.assertNumQueries(5):
+            small_page = self.list_view(self.factory.get('/api/v1/projects/'))
+
+        self.create_projects(10)
+        with self.assertNumQueries(5):
+            full_page = self.list_view(self.factory.get('/api/v1/projects/?lang=ar'))
+
+        self.assertEqual(small_page.status_code, 200)
+        self.assertEqual(len(full_page.data['results']), 12)
+        project = full_page.data['results'][0]
+        self.assertEqual(project['category']['name'], 'سكني')
+        self.assertEqual(len(project['tags']), 2)
+        self.assertTrue(project['cover_image_url'].endswith('/media/projects/cover.jpg'))
+
+    def test_detail_query_count_is_constant(self):
+        """Test that retrieving a project loads its relations in bulk"""
+        self.create_projects(1)
+        project = Project.objects.get()
+
+        # validators, project + category, tags, images
+        with self.assertNumQueries(4):
+            response = self.detail_view(
+                self.factory.get(f'/api/v1/projects/{project.slug}/?lang=ar'),
+                slug=project.slug
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], project.title_ar)
+        self.assertEqual(response.data['client'], 'Client')
+        self.assertEqual(len(response.data['images']), 2)
+
+
+class ProjectSearchTest(TestCase):
+    """Test ranked full-text search on the project list"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.list_view = ProjectViewSet.as_view({'get': 'list'})
+        self.villa = Project.objects.create(
+            title_en='Beach Villa',
+            title_ar='فيلا على الشاطئ',
+            slug='beach-villa',
+            description_en='A family villa renovated with natural materials.',
+            description_ar='تجديد فِيلّا عائلية بمواد طبيعية',
+            is_published=True
+        )
+        self.office = Project.objects.create(
+            title_en='Downtown Office',
+            title_ar='مكتب وسط المدينة',
+            slug='downtown-office',
+            description_en='Open-plan office next to a renovated villa.',
+            description_ar='مكتب مفتوح',
+            is_published=True
+        )
+
+    def search(self, query, lang='en'):
+        response = self.list_view(self.factory.get('/api/v1/projects/', {'search': query, 'lang': lang}))
+        return response.data['results']
+
+    def test_results_are_stemmed_and_ranked(self):
+        """Test that title matches outrank description matches"""
+        results = self.search('villas')
+
+        self.assertEqual([result['slug'] for result in results], ['beach-villa', 'downtown-office'])
+        self.assertIn('<mark>villa</mark>', results[0]['search_headline'])
+
+    def test_vectors_follow_edits(self):
+        """Test that saving a project refreshes its stored vector"""
+        self.assertEqual(self.search('penthouse'), [])
+
+        self.office.title_en = 'Penthouse Office'
+        self.office.save()
+
+        self.assertEqual([result['slug'] for result in self.search('penthouse')], ['downtown-office'])
+
+    def test_arabic_search_ignores_diacritics(self):
+        """Test that Arabic text and queries are normalized the same way"""
+        results = self.search('فيلا', lang='ar')
+
+        self.assertEqual([result['slug'] for result in results], ['beach-villa'])
+        self.assertEqual(results[0]['title'], 'فيلا على الشاطئ')
+
+
+class ProjectConditionalGetTest(TestCase):
+    """Test If-Modified-Since on the project list"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.list_view = ProjectViewSet.as_view({'get': 'list'})
+        self.tag = Tag.objects.create(name_en='Modern', name_ar='حديث')
+        project = Project.objects.create(title_en='Villa', slug='villa', is_published=True)
+        project.tags.add(self.tag)
+        # A clock that has moved past every change made so far
+        self.now = int(time.time()) + 100.5
+
+    def get(self, **headers):
+        with mock.patch('time.time', lambda: self.now):
+            return self.list_view(self.factory.get('/api/v1/projects/', headers=headers))
+
+    def test_changes_move_last_modified(self):
+        """Test that edits to models without updated_at and same-second creates aren't answered with 304"""
+        # Models without a recorded change count as changed at the first request
+        self.get()
+        self.now += 1
+        first = self.get()
+        not_modified = self.get(**{'If-Modified-Since': first['Last-Modified']})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], first['ETag'])
+
+        with mock.patch('time.time', lambda: self.now):
+            self.tag.name_en = 'Minimal'
+            self.tag.save()
+        # Still within the second of the change: no Last-Modified to match against
+        response = self.get(**{'If-Modified-Since': first['Last-Modified']})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+
+        self.now += 1
+        response = self.get(**{'If-Modified-Since': first['Last-Modified']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['tags'][0]['name'], 'Minimal')
+
+        second = response['Last-Modified']
+        with mock.patch('time.time', lambda: self.now):
+            Project.objects.create(title_en='Office', slug='office', is_published=True)
+        self.now += 1
+        response = self.get(**{'If-Modified-Since': second})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+
+class ProjectListAsyncViewTest(TestCase):
+    """Test the ASGI project list against the DRF view it fronts"""
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.view = async_to_sync(ProjectListAsyncView.as_view())
+        category = ProjectCategory.objects.create(name_en='Residential', name_ar='سكني')
+        for index in range(3):
+            Project.objects.create(
+                title_en=f'Project {index}', slug=f'project-{index}', category=category, is_published=True
+            )
+
+    def test_cache_hits_are_served_without_the_drf_view(self):
+        """Test that a repeat request only runs the validators query and matches the DRF response"""
+        first = self.view(self.factory.get('/api/v1/projects/?lang=ar'))
+        self.assertEqual(first.status_code, 200)
+
+        with self.assertNumQueries(1):
+            second = self.view(self.factory.get('/api/v1/projects/?lang=ar'))
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(second.content), json.loads(first.content))
+        self.assertEqual(len(json.loads(second.content)['results']), 3)
+
+        # Same headers as the DRF response, so shared caches treat hits and misses alike
+        self.assertEqual(second['Allow'], first['Allow'])
+        self.assertEqual(second['Vary'], 'Accept, Cookie')
+        self.assertIn('Accept', first['Vary'])
+
+        response = self.view(self.factory.get('/api/v1/projects/?lang=ar', headers={'If-None-Match': second['ETag']}))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], second['ETag'])
+
+
+@override_settings(REQUEST_METRICS_SAMPLE_RATE=1, REQUEST_METRICS_N_PLUS_ONE_THRESHOLD=3)
+class RequestMetricsMiddlewareTest(TestCase):
+    """Test the sampled query and timing instrumentation"""
+
+    def setUp(self):
+        category = ProjectCategory.objects.create(name_en='Residential', name_ar='سكني')
+        for index in range(4):
+            Project.objects.create(
+                title_en=f'Project {index}', slug=f'project-{index}', category=category, is_published=True
+            )
+
+    def test_project_list_reports_queries_serializer_time_and_cache(self):
+        """Test the Server-Timing header and log line for a cache miss, then a hit"""
+        with self.assertLogs('utils.instrumentation', 'INFO') as logs:
+            first = self.client.get('/api/v1/projects/')
+            second = self.client.get('/api/v1/projects/')
+
+        self.assertRegex(first['Server-Timing'], r'^db;dur=[\d.]+;desc="5 queries", serialize;dur=[\d.]+, ')
+        self.assertIn('cache;desc="0 hits, 1 misses"', first['Server-Timing'])
+        self.assertIn('db;dur=', second['Server-Timing'])
+        self.assertIn('cache;desc="1 hits, 0 misses"', second['Server-Timing'])
+        self.assertIn('desc="1 queries"', second['Server-Timing'])
+
+        self.assertEqual(len(logs.records), 2)
+        record = logs.records[0].request_metrics
+        self.assertEqual((record['path'], record['status'], record['queries']), ('/api/v1/projects/', 200, 5))
+        self.assertTrue(logs.output[0].endswith(
+            f"request_metrics method=GET path=/api/v1/projects/ route={record['route']} status=200 queries=5 "
+            f"db_ms={record['db_ms']} serializer_ms={record['serializer_ms']} cache_hits=0 cache_misses=1 "
+            f"total_ms={record['total_ms']}"
+        ))
+
+    def test_repeated_statements_are_flagged(self):
+        """Test that a query run per row is logged as a possible N+1, in sync and async views"""
+        def view(request):
+            for project in Project.objects.order_by('pk'):
+                project.category.name_en
+            return HttpResponse()
+
+        async def async_view(request):
+            async for project in Project.objects.order_by('pk'):
+                await ProjectCategory.objects.filter(pk=project.category_id).aexists()
+            return HttpResponse()
+
+        request = RequestFactory().get('/projects/')
+        for get_response in (view, async_view):
+            middleware = RequestMetricsMiddleware(get_response)
+            handler = async_to_sync(middleware) if middleware.async_mode else middleware
+            with self.assertLogs('utils.instrumentation', 'INFO') as logs:
+                response = handler(request)
+
+            self.assertIn('desc="5 queries"', response['Server-Timing'])
+            warning = logs.records[1]
+            self.assertEqual(warning.levelname, 'WARNING')
+            self.assertIn('Possible N+1 on GET /projects/: 4 x SELECT', warning.getMessage())
+            self.assertEqual(warning.request_metrics['repeated_count'], 4)
+
+    def test_sampling(self):
+        """Test that unsampled requests are untouched and a zero rate unloads the middleware"""
+        middleware = RequestMetricsMiddleware(lambda request: HttpResponse())
+        middleware.sample_rate = 0.1
+        with mock.patch('utils.instrumentation.random.random', side_effect=[0.5, 0.05]):
+            self.assertNotIn('Server-Timing', middleware(RequestFactory().get('/')))
+            self.assertIn('Server-Timing', middleware(RequestFactory().get('/')))
+
+        with self.settings(REQUEST_METRICS_SAMPLE_RATE=0):
+            with self.assertRaises(MiddlewareNotUsed):
+                RequestMetricsMiddleware(lambda request: HttpResponse())
+
+        self.assertEqual(
+            sql_shape('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21'),
+            sql_shape('SELECT * FROM "t" WHERE "id" IN (%s) LIMIT 1'),
+        )
@@ -2,10 +2,16 @@ from django.shortcuts import render
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.conf import settings
 from django.utils.translation import get_language
-from django.db.models import Q
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Project, ProjectCategory, Tag
+from utils.async_views import AsyncCachedReadView
+from utils.cache import CacheResponseMixin
+from utils.http import ConditionalResponseMixin
+from utils.pagination import FlexiblePagination
+from utils.search import FullTextSearchFilter
+from .models import Project, ProjectCategory, Tag, ProjectImage
 from .serializers import (
     ProjectListSerializer, ProjectDetailSerializer, CategorySerializer,
     TagSerializer, LocalizedProjectListSerializer, LocalizedProjectDetailSerializer,
@@ -14,22 +20,55 @@ from .serializers import (
 
 # Create your views here.
 
-class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
+# Localized columns read by the list/detail serializers. The English column is
+# always loaded because it is the fallback when a translation is empty.
+PROJECT_LIST_LOCALIZED_FIELDS = ['title', 'description', 'location']
+PROJECT_DETAIL_LOCALIZED_FIELDS = PROJECT_LIST_LOCALIZED_FIELDS + ['client']
+PROJECT_LIST_FIELDS = [
+    'id', 'slug', 'area', 'completed_date', 'is_featured', 'is_published',
+    'created_at', 'cover_image', 'cover_image_renditions', 'category',
+]
+PROJECT_DETAIL_FIELDS = PROJECT_LIST_FIELDS + ['updated_at']
+CATEGORY_FIELDS = ['category__id', 'category__slug']
+CATEGORY_LOCALIZED_FIELDS = ['name', 'description']
+
+
+def localized_columns(field_names, language, prefix=''):
+    """Return the column names needed to localize `field_names` in `language`"""
+    languages = ['en'] if language == 'en' else ['en', language]
+    return [
+        f'{prefix}{name}_{lang}'
+        for name in field_names
+        for lang in languages
+    ]
+
+
+class ProjectViewSet(ConditionalResponseMixin, CacheResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows projects to be viewed.
     """
     queryset = Project.objects.all()
     permission_classes = [permissions.AllowAny]
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend, filters.OrderingFilter]
-    search_fields = ['title_en', 'title_ar', 'description_en', 'description_ar', 'location_en', 'location_ar']
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
+    search_headline_field = 'description'
     filterset_fields = ['category__slug', 'tags__slug', 'is_featured', 'is_published']
     ordering_fields = ['created_at', 'title_en']
     ordering = ['-created_at']
     lookup_field = 'slug'
+    cache_models = [Project, ProjectCategory, Tag, ProjectImage]
+    # Page numbers by default; ?pagination=cursor for keyset pages
+    pagination_class = FlexiblePagination
+    keyset_ordering = ('-created_at', '-id')
+    
+    def get_language(self):
+        """Requested language, falling back to English for unsupported codes"""
+        language = self.request.query_params.get('lang') or get_language() or 'en'
+        language = language.split('-')[0]
+        return language if language in dict(settings.LANGUAGES) else 'en'
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        context['language'] = self.request.query_params.get('lang', get_language() or 'en')
+        context['language'] = self.get_language()
         # Make sure the request is included in context for building absolute URLs
         context['request'] = self.request
         return context
@@ -39,8 +78,35 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
             return LocalizedProjectListSerializer
         return LocalizedProjectDetailSerializer
     
+    def get_query_plan(self, queryset):
+        """
+        Load everything the serializers touch up front so list and detail
+        cost a constant number of queries regardless of page size:
+        the project row joined with its category, one query for tags and
+        one for images (cover images only on the list endpoint).
+        """
+        language = self.get_language()
+        
+        if self.action == 'list':
+            fields = PROJECT_LIST_FIELDS + localized_columns(PROJECT_LIST_LOCALIZED_FIELDS, language)
+            images_prefetch = Prefetch(
+                'images',
+                queryset=ProjectImage.objects.filter(is_cover=True).order_by('order'),
+                to_attr='prefetched_cover_images'
+            )
+        else:
+            fields = PROJECT_DETAIL_FIELDS + localized_columns(PROJECT_DETAIL_LOCALIZED_FIELDS, language)
+            images_prefetch = Prefetch('images', queryset=ProjectImage.objects.order_by('order'))
+        
+        fields += CATEGORY_FIELDS + localized_columns(CATEGORY_LOCALIZED_FIELDS, language, prefix='category__')
+        
+        return queryset.select_related('category').prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.all()),
+            images_prefetch,
+        ).only(*fields)
+    
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = self.get_query_plan(super().get_queryset())
         
         # By default, only show published projects unless explicitly requested
         if 'is_published' not in self.request.query_params:
@@ -61,25 +127,14 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
         if featured:
             queryset = queryset.filter(is_featured=featured.lower() == 'true')
         
-        # Search functionality
-        search_query = self.request.query_params.get('search')
-        if search_query:
-            language = self.request.query_params.get('lang', get_language() or 'en')
-            if language == 'ar':
-                queryset = queryset.filter(
-                    Q(title_ar__icontains=search_query) |
-                    Q(description_ar__icontains=search_query) |
-                    Q(location_ar__icontains=search_query)
-                )
-            else:
-                queryset = queryset.filter(
-                    Q(title_en__icontains=search_query) |
-                    Q(description_en__icontains=search_query) |
-                    Q(location_en__icontains=search_query)
-                )
-        
         return queryset
 
+class ProjectListAsyncView(AsyncCachedReadView):
+    """Project list for ASGI deployments"""
+    drf_view = ProjectViewSet
+    actions = {'get': 'list'}
+
+
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows project categories to be viewed.
@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ('title', 'doc_type', 'language', 'object_id', 'updated_at')
+    list_filter = ('doc_type', 'language')
+    search_fields = ('title', 'object_id')
+    readonly_fields = ('doc_type', 'object_id', 'language', 'title', 'summary', 'body', 'slug', 'image', 'updated_at')
+
+    def has_add_permission(self, request):
+        # Documents are maintained from the content models
+        return False
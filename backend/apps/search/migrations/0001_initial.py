@@ -0,0 +1,39 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:52
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('doc_type', models.CharField(choices=[('project', 'Project'), ('service', 'Service'), ('faq', 'FAQ'), ('team_member', 'Team Member')], max_length=20)),
+                ('object_id', models.CharField(max_length=64)),
+                ('language', models.CharField(max_length=10)),
+                ('title', models.CharField(max_length=255)),
+                ('summary', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+                ('slug', models.CharField(blank=True, help_text='Slug used by the frontend to link to the item', max_length=250)),
+                ('image', models.CharField(blank=True, help_text="Storage path of the item's image", max_length=255)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+                'ordering': ['doc_type', 'title'],
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='search_document_vector_gin')],
+                'constraints': [models.UniqueConstraint(fields=('doc_type', 'object_id', 'language'), name='search_document_unique_object')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized, searchable copy of one piece of public content in one language.
+    Rows are written by apps.search.services from signals and by `manage.py rebuild_search_index`.
+    """
+    TYPE_PROJECT = 'project'
+    TYPE_SERVICE = 'service'
+    TYPE_FAQ = 'faq'
+    TYPE_TEAM_MEMBER = 'team_member'
+    TYPE_CHOICES = [
+        (TYPE_PROJECT, 'Project'),
+        (TYPE_SERVICE, 'Service'),
+        (TYPE_FAQ, 'FAQ'),
+        (TYPE_TEAM_MEMBER, 'Team Member'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    doc_type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    object_id = models.CharField(max_length=64)
+    language = models.CharField(max_length=10)
+    title = models.CharField(max_length=255)
+    summary = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    slug = models.CharField(max_length=250, blank=True, help_text="Slug used by the frontend to link to the item")
+    image = models.CharField(max_length=255, blank=True, help_text="Storage path of the item's image")
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        ordering = ['doc_type', 'title']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['doc_type', 'object_id', 'language'],
+                name='search_document_unique_object'
+            ),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector'], name='search_document_vector_gin'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_doc_type_display()} ({self.language}): {self.title}"
@@ -0,0 +1,23 @@
+from django.conf import settings
+from rest_framework import serializers
+from .models import SearchDocument
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    """One ranked search hit of any content type"""
+    type = serializers.CharField(source='doc_type')
+    id = serializers.CharField(source='object_id')
+    image_url = serializers.SerializerMethodField()
+    headline = serializers.CharField(source='search_headline')
+    rank = serializers.FloatField(source='search_rank')
+
+    class Meta:
+        model = SearchDocument
+        fields = ['type', 'id', 'title', 'summary', 'slug', 'image_url', 'headline', 'rank']
+
+    def get_image_url(self, obj):
+        if not obj.image:
+            return None
+        request = self.context.get('request')
+        url = f'{settings.MEDIA_URL}{obj.image}'
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,194 @@
+import logging
+
+from django.contrib.postgres.search import SearchHeadline, SearchRank
+from django.db import transaction
+from django.db.models import F
+
+from apps.about.models import TeamMember
+from apps.faqs.models import FAQ
+from apps.projects.models import Project
+from apps.services.models import Service
+from utils.search import HEADLINE_OPTIONS, SEARCH_CONFIGS, build_search_query, build_search_vector
+from .models import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+# Rank weights of the document columns
+DOCUMENT_WEIGHTS = {'title': 'A', 'summary': 'B', 'body': 'C'}
+
+REBUILD_BATCH_SIZE = 500
+
+
+def localized(instance, field, language, suffix_english=True):
+    """Value of a translated field, falling back to English when empty"""
+    english = getattr(instance, f'{field}_en' if suffix_english else field)
+    if language == 'en':
+        return english
+    return getattr(instance, f'{field}_{language}') or english
+
+
+def project_documents(project):
+    for language in SEARCH_CONFIGS:
+        yield {
+            'language': language,
+            'title': localized(project, 'title', language),
+            'summary': localized(project, 'location', language),
+            'body': ' '.join(filter(None, [
+                localized(project, 'description', language),
+                localized(project, 'client', language),
+            ])),
+            'slug': project.slug,
+            'image': str(project.cover_image or ''),
+        }
+
+
+def service_documents(service):
+    for language in SEARCH_CONFIGS:
+        yield {
+            'language': language,
+            'title': localized(service, 'title', language),
+            'summary': localized(service, 'short_description', language),
+            'body': localized(service, 'description', language),
+            'slug': service.slug,
+            'image': str(service.cover_image or service.image or ''),
+        }
+
+
+def faq_documents(faq):
+    # FAQs are written per language, so each one yields a single document
+    yield {
+        'language': faq.language,
+        'title': faq.question_text,
+        'summary': localized(faq.category, 'name', faq.language),
+        'body': faq.answer_text,
+        'slug': faq.category.slug,
+        'image': '',
+    }
+
+
+def team_member_documents(member):
+    for language in SEARCH_CONFIGS:
+        yield {
+            'language': language,
+            'title': localized(member, 'name', language, suffix_english=False),
+            'summary': ' '.join(filter(None, [
+                localized(member, 'role', language, suffix_english=False),
+                localized(member, 'department', language, suffix_english=False),
+            ])),
+            'body': localized(member, 'bio', language, suffix_english=False),
+            'slug': '',
+            'image': str(member.image or ''),
+        }
+
+
+# model -> (document type, queryset of indexable rows, visibility check, document builder)
+DOCUMENT_TYPES = {
+    Project: (
+        SearchDocument.TYPE_PROJECT,
+        lambda: Project.objects.filter(is_published=True),
+        lambda project: project.is_published,
+        project_documents,
+    ),
+    Service: (
+        SearchDocument.TYPE_SERVICE,
+        lambda: Service.objects.filter(is_published=True),
+        lambda service: service.is_published,
+        service_documents,
+    ),
+    FAQ: (
+        SearchDocument.TYPE_FAQ,
+        lambda: FAQ.objects.select_related('category').filter(
+            is_active=True, category__is_active=True, language__in=list(SEARCH_CONFIGS)
+        ),
+        lambda faq: faq.is_active and faq.category.is_active and faq.language in SEARCH_CONFIGS,
+        faq_documents,
+    ),
+    TeamMember: (
+        SearchDocument.TYPE_TEAM_MEMBER,
+        lambda: TeamMember.objects.filter(is_active=True),
+        lambda member: member.is_active,
+        team_member_documents,
+    ),
+}
+
+
+def build_documents(instance):
+    """Unsaved SearchDocument rows for an instance of an indexed model"""
+    doc_type, _, _, build = DOCUMENT_TYPES[type(instance)]
+    return [
+        SearchDocument(doc_type=doc_type, object_id=str(instance.pk), **fields)
+        for fields in build(instance)
+    ]
+
+
+def update_document_vectors(queryset):
+    """Compute the stored vectors in SQL, one UPDATE per language"""
+    for language in SEARCH_CONFIGS:
+        queryset.filter(language=language).update(
+            search_vector=build_search_vector(DOCUMENT_WEIGHTS, language, localized=False)
+        )
+
+
+def remove_object(instance):
+    """Drop every document of an instance"""
+    doc_type = DOCUMENT_TYPES[type(instance)][0]
+    SearchDocument.objects.filter(doc_type=doc_type, object_id=str(instance.pk)).delete()
+
+
+def index_object(instance):
+    """Replace the documents of one instance, or remove them if it is no longer public"""
+    _, _, is_visible, _ = DOCUMENT_TYPES[type(instance)]
+    with transaction.atomic():
+        remove_object(instance)
+        if not is_visible(instance):
+            return
+        documents = SearchDocument.objects.bulk_create(build_documents(instance))
+        update_document_vectors(SearchDocument.objects.filter(pk__in=[document.pk for document in documents]))
+
+
+def rebuild_index(batch_size=REBUILD_BATCH_SIZE):
+    """
+    Rebuild the whole index from the content tables.
+
+    Runs in one transaction, so searches keep seeing the old index until
+    the new one is complete.
+
+    Returns:
+        int: Number of documents written
+    """
+    total = 0
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for model, (doc_type, get_queryset, _, _) in DOCUMENT_TYPES.items():
+            documents = []
+            for instance in get_queryset().iterator(chunk_size=batch_size):
+                documents.extend(build_documents(instance))
+                if len(documents) >= batch_size:
+                    SearchDocument.objects.bulk_create(documents)
+                    total += len(documents)
+                    documents = []
+            SearchDocument.objects.bulk_create(documents)
+            total += len(documents)
+        update_document_vectors(SearchDocument.objects.all())
+
+    logger.info(f"Rebuilt search index with {total} documents")
+    return total
+
+
+def search_documents(text, language, doc_types=None):
+    """
+    Ranked documents of every type matching `text`, annotated with
+    `search_rank` and a highlighted `search_headline` of the body.
+    """
+    if language not in SEARCH_CONFIGS:
+        language = 'en'
+
+    query = build_search_query(text, language)
+    queryset = SearchDocument.objects.filter(language=language, search_vector=query)
+    if doc_types:
+        queryset = queryset.filter(doc_type__in=doc_types)
+
+    return queryset.annotate(
+        search_rank=SearchRank(F('search_vector'), query),
+        search_headline=SearchHeadline('body', query, config=SEARCH_CONFIGS[language], **HEADLINE_OPTIONS),
+    ).defer('body', 'search_vector').order_by('-search_rank', 'doc_type', 'title')
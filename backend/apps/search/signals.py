@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.faqs.models import FAQCategory
+from .services import DOCUMENT_TYPES, index_object, remove_object
+
+
+def _index_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_object(instance)
+
+
+def _remove_on_delete(sender, instance, **kwargs):
+    remove_object(instance)
+
+
+# Keep the search index in step with every indexed model
+for model in DOCUMENT_TYPES:
+    uid = f"search_index:{model._meta.label_lower}"
+    post_save.connect(_index_on_save, sender=model, dispatch_uid=f"{uid}:save")
+    post_delete.connect(_remove_on_delete, sender=model, dispatch_uid=f"{uid}:delete")
+
+
+@receiver(post_save, sender=FAQCategory, dispatch_uid="search_index:faqcategory:save")
+def reindex_category_faqs(sender, instance, raw=False, **kwargs):
+    """FAQ documents carry their category's name, slug and visibility"""
+    if raw:
+        return
+    for faq in instance.faqs.select_related('category'):
+        index_object(faq)
@@ -0,0 +1,77 @@
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from apps.about.models import TeamMember
+from apps.faqs.models import FAQ, FAQCategory
+from apps.projects.models import Project
+from apps.services.models import Service
+from .models import SearchDocument
+from .services import rebuild_index
+from .views import SearchView
+
+
+class SearchViewTest(TestCase):
+    """Test the unified search endpoint and its index maintenance"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.project = Project.objects.create(
+            title_en='Marble Kitchen', title_ar='مطبخ رخامي', slug='marble-kitchen',
+            description_en='A kitchen remodel', is_published=True
+        )
+        self.service = Service.objects.create(
+            title_en='Kitchen Design', slug='kitchen-design',
+            description_en='We design kitchens with marble and wood.'
+        )
+        self.category = FAQCategory.objects.create(name_en='General', slug='general')
+        self.faq = FAQ.objects.create(
+            category=self.category, question_text='Do you renovate kitchens?',
+            answer_text='Yes, every kitchen project starts with a site visit.'
+        )
+        TeamMember.objects.create(
+            name='Sara', role='Kitchen Designer', bio='Designs kitchens.', image='team/sara.jpg',
+            name_ar='سارة', role_ar='مصممة مطابخ', bio_ar='تصمم المطابخ.'
+        )
+
+    def search(self, **params):
+        return SearchView.as_view()(self.factory.get('/api/v1/search/', params)).data
+
+    def test_returns_ranked_mixed_results(self):
+        """Test that every content type is searched in one query plus the count"""
+        with self.assertNumQueries(2):
+            data = self.search(search='kitchen')
+
+        types = [result['type'] for result in data['results']]
+        self.assertEqual(sorted(types), ['faq', 'project', 'service', 'team_member'])
+        ranks = [result['rank'] for result in data['results']]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_type_and_language_filters(self):
+        """Test filtering by type and searching the Arabic documents"""
+        data = self.search(search='kitchen', type='service,faq')
+        self.assertEqual({result['type'] for result in data['results']}, {'service', 'faq'})
+
+        data = self.search(search='مطبخ', lang='ar')
+        self.assertEqual([result['slug'] for result in data['results']], ['marble-kitchen'])
+
+    def test_index_follows_content_changes(self):
+        """Test that unpublishing, editing and deleting update the index"""
+        self.project.is_published = False
+        self.project.save()
+        self.assertNotIn('project', [result['type'] for result in self.search(search='marble')['results']])
+
+        self.service.title_en = 'Bathroom Design'
+        self.service.save()
+        self.assertEqual(self.search(search='bathroom')['results'][0]['slug'], 'kitchen-design')
+
+        self.category.is_active = False
+        self.category.save()
+        self.assertFalse(SearchDocument.objects.filter(doc_type='faq').exists())
+
+    def test_rebuild_matches_incremental_index(self):
+        """Test that a full rebuild produces the same documents"""
+        before = sorted(SearchDocument.objects.values_list('doc_type', 'object_id', 'language', 'title'))
+
+        self.assertEqual(rebuild_index(), len(before))
+        after = sorted(SearchDocument.objects.values_list('doc_type', 'object_id', 'language', 'title'))
+        self.assertEqual(before, after)
+        self.assertEqual(len(self.search(search='kitchen')['results']), 4)
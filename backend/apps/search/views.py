@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.utils.translation import get_language
+from rest_framework import generics, permissions
+from rest_framework.settings import api_settings
+from .models import SearchDocument
+from .serializers import SearchResultSerializer
+from .services import search_documents
+
+
+class SearchView(generics.ListAPIView):
+    """
+    Search projects, services, FAQs and team members at once.
+
+    Query parameters:
+        search: Text to search for (web-search syntax: quotes, OR, -word)
+        lang: Content language (default: active language)
+        type: Comma-separated document types to include (default: all)
+    """
+    serializer_class = SearchResultSerializer
+    permission_classes = [permissions.AllowAny]
+    filter_backends = []
+
+    def get_language(self):
+        """Requested language, falling back to English for unsupported codes"""
+        language = self.request.query_params.get('lang') or get_language() or 'en'
+        language = language.split('-')[0]
+        return language if language in dict(settings.LANGUAGES) else 'en'
+
+    def get_queryset(self):
+        text = self.request.query_params.get(api_settings.SEARCH_PARAM, '').strip()
+        if not text:
+            return SearchDocument.objects.none()
+
+        doc_types = [
+            doc_type for doc_type in self.request.query_params.get('type', '').split(',')
+            if doc_type in dict(SearchDocument.TYPE_CHOICES)
+        ]
+        return search_documents(text, self.get_language(), doc_types)
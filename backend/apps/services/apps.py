@@ -5,3 +5,6 @@ class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.services'
     verbose_name = 'Services'
+
+    def ready(self):
+        from . import signals  # noqa: F401
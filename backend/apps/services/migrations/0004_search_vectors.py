@@ -0,0 +1,69 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, Func, TextField, Value
+
+# Frozen copy of utils.search as of this migration, so later changes to the
+# live search code don't change what this migration writes
+SEARCH_CONFIGS = {'en': 'english', 'ar': 'simple'}
+ARABIC_VARIANTS = 'أإآٱىة'
+ARABIC_CANONICAL = 'اااايه'
+ARABIC_MARKS = ''.join(chr(code) for code in range(0x064B, 0x0653)) + 'ٰـ'
+WEIGHTS = {'title': 'A', 'short_description': 'B', 'description': 'C'}
+
+
+def search_vector(language):
+    vector = None
+    for field, weight in WEIGHTS.items():
+        expression = F(f'{field}_{language}')
+        if language == 'ar':
+            expression = Func(
+                expression,
+                Value(ARABIC_VARIANTS + ARABIC_MARKS),
+                Value(ARABIC_CANONICAL),
+                function='TRANSLATE',
+                output_field=TextField()
+            )
+        part = SearchVector(expression, weight=weight, config=SEARCH_CONFIGS[language])
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def populate_search_vectors(apps, schema_editor):
+    Model = apps.get_model('services', 'service')
+    Model.objects.update(**{
+        f'search_vector_{language}': search_vector(language)
+        for language in SEARCH_CONFIGS
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0003_index_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='search_vector_ar',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='search_vector_en',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector_en'], name='service_search_en_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector_ar'], name='service_search_ar_gin'),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
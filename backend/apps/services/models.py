@@ -1,4 +1,6 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 
@@ -14,7 +16,7 @@ class ServiceCategory(models.Model):
     icon = models.CharField(max_length=100, blank=True, help_text="Icon name from icon library (e.g., 'home')")
     order = models.PositiveIntegerField(default=0, help_text="Order of appearance in listing")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Service Category"
@@ -52,6 +54,9 @@ class Service(models.Model):
     icon = models.CharField(max_length=100, blank=True, help_text="Icon name from icon library (e.g., 'home')")
     image = models.ImageField(upload_to='services/', blank=True, null=True)
     cover_image = models.ImageField(upload_to='services/covers/', blank=True, null=True, help_text="Cover image displayed at the top of the service page")
+    # Maintained by apps.imaging.services.watch_images, see signals.py
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
+    cover_image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     price_unit = models.CharField(max_length=50, blank=True, help_text="e.g., 'per hour', 'per sq ft', etc.")
     duration = models.CharField(max_length=50, blank=True, help_text="e.g., '2-3 weeks'")
@@ -59,10 +64,20 @@ class Service(models.Model):
     is_published = models.BooleanField(default=True)
     order = models.PositiveIntegerField(default=0, help_text="Order of appearance in listing")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Maintained by utils.search.watch_search_vectors, see signals.py
+    search_vector_en = SearchVectorField(null=True, editable=False)
+    search_vector_ar = SearchVectorField(null=True, editable=False)
+
+    # Localized fields indexed for full-text search, with their rank weights
+    SEARCH_WEIGHTS = {'title': 'A', 'short_description': 'B', 'description': 'C'}
     
     class Meta:
         ordering = ['order', 'title_en']
+        indexes = [
+            GinIndex(fields=['search_vector_en'], name='service_search_en_gin'),
+            GinIndex(fields=['search_vector_ar'], name='service_search_ar_gin'),
+        ]
 
     def __str__(self):
         return self.title_en
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.conf import settings
 from .models import ServiceCategory, Service, ServiceFeature
+from apps.imaging.serializers import RenditionsField
+from apps.imaging.services import serialize_renditions
+from utils.search import SearchResultSerializerMixin
 
 # Helper function to get full media URL
 def get_absolute_media_url(request, path):
@@ -106,20 +109,23 @@ class LocalizedServiceCategorySerializer(serializers.ModelSerializer):
         return getattr(obj, f'description_{language}') if getattr(obj, f'description_{language}') else obj.description_en
 
 
-class LocalizedServiceListSerializer(serializers.ModelSerializer):
+class LocalizedServiceListSerializer(SearchResultSerializerMixin, serializers.ModelSerializer):
     """Service list serializer with localization support"""
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     short_description = serializers.SerializerMethodField()
     category = LocalizedServiceCategorySerializer(read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_renditions = serializers.SerializerMethodField()
     cover_image_url = serializers.SerializerMethodField()
+    cover_image_renditions = RenditionsField()
     
     class Meta:
         model = Service
         fields = [
             'id', 'title', 'slug', 'short_description', 'description', 'category',
-            'icon', 'image', 'image_url', 'cover_image', 'cover_image_url', 'price', 'price_unit', 'duration',
+            'icon', 'image', 'image_url', 'image_renditions', 'cover_image', 'cover_image_url',
+            'cover_image_renditions', 'price', 'price_unit', 'duration',
             'is_featured', 'is_published', 'order'
         ]
     
@@ -143,6 +149,13 @@ class LocalizedServiceListSerializer(serializers.ModelSerializer):
              return get_absolute_media_url(request, str(obj.image))
         return None
 
+    def get_image_renditions(self, obj):
+        # Same image as image_url
+        request = self.context.get('request')
+        if obj.cover_image:
+            return serialize_renditions(obj.cover_image_renditions, request)
+        return serialize_renditions(obj.image_renditions, request)
+
     def get_cover_image_url(self, obj):
         request = self.context.get('request')
         return get_absolute_media_url(request, str(obj.cover_image)) if obj.cover_image else None
@@ -156,14 +169,17 @@ class LocalizedServiceDetailSerializer(serializers.ModelSerializer):
     category = LocalizedServiceCategorySerializer(read_only=True)
     features = LocalizedServiceFeatureSerializer(many=True, read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_renditions = RenditionsField()
     cover_image_url = serializers.SerializerMethodField()
+    cover_image_renditions = RenditionsField()
     price = serializers.SerializerMethodField()
     
     class Meta:
         model = Service
         fields = [
             'id', 'title', 'slug', 'short_description', 'description', 'category', 
-            'icon', 'image', 'image_url', 'cover_image', 'cover_image_url', 'price', 'price_unit', 'duration',
+            'icon', 'image', 'image_url', 'image_renditions', 'cover_image', 'cover_image_url',
+            'cover_image_renditions', 'price', 'price_unit', 'duration',
             'is_featured', 'is_published', 'order', 'features'
         ]
     
@@ -0,0 +1,13 @@
+from apps.imaging.services import watch_images
+from utils.cache import watch_models
+from utils.search import watch_search_vectors
+from .models import Service, ServiceCategory, ServiceFeature
+
+# Refresh the stored search vectors before cached responses are invalidated
+watch_search_vectors(Service, Service.SEARCH_WEIGHTS)
+
+# Generate responsive renditions off the request thread when images change
+watch_images(Service, 'image', 'cover_image')
+
+# Invalidate cached API responses whenever this app's content changes
+watch_models(Service, ServiceCategory, ServiceFeature)
@@ -2,9 +2,12 @@ from django.shortcuts import render
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.conf import settings
 from django.utils.translation import get_language
-from django.db.models import Q
 from django_filters.rest_framework import DjangoFilterBackend
+from utils.cache import CacheResponseMixin
+from utils.http import ConditionalResponseMixin
+from utils.search import FullTextSearchFilter
 from .models import Service, ServiceCategory, ServiceFeature
 from .serializers import (
     ServiceListSerializer, ServiceDetailSerializer, ServiceCategorySerializer, 
@@ -14,22 +17,29 @@ from .serializers import (
 )
 
 
-class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
+class ServiceViewSet(ConditionalResponseMixin, CacheResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows services to be viewed.
     """
     queryset = Service.objects.all()
     permission_classes = [permissions.AllowAny]
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend, filters.OrderingFilter]
-    search_fields = ['title_en', 'title_ar', 'description_en', 'description_ar']
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
+    search_headline_field = 'description'
     filterset_fields = ['category__slug', 'is_featured', 'is_published']
     ordering_fields = ['order', 'title_en', 'created_at']
     ordering = ['order', 'title_en']
     lookup_field = 'slug'
+    cache_models = [Service, ServiceCategory, ServiceFeature]
+    
+    def get_language(self):
+        """Requested language, falling back to English for unsupported codes"""
+        language = self.request.query_params.get('lang') or get_language() or 'en'
+        language = language.split('-')[0]
+        return language if language in dict(settings.LANGUAGES) else 'en'
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        context['language'] = self.request.query_params.get('lang', get_language() or 'en')
+        context['language'] = self.get_language()
         # Make sure the request is included in context for building absolute URLs
         context['request'] = self.request
         return context
@@ -40,7 +50,8 @@ class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
         return LocalizedServiceDetailSerializer
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # The stored search vectors are only read inside the database
+        queryset = super().get_queryset().defer('search_vector_en', 'search_vector_ar')
         
         # By default, only show published services unless explicitly requested
         if 'is_published' not in self.request.query_params:
@@ -56,21 +67,6 @@ class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
         if featured:
             queryset = queryset.filter(is_featured=featured.lower() == 'true')
         
-        # Search functionality
-        search_query = self.request.query_params.get('search')
-        if search_query:
-            language = self.request.query_params.get('lang', get_language() or 'en')
-            if language == 'ar':
-                queryset = queryset.filter(
-                    Q(title_ar__icontains=search_query) |
-                    Q(description_ar__icontains=search_query)
-                )
-            else:
-                queryset = queryset.filter(
-                    Q(title_en__icontains=search_query) |
-                    Q(description_en__icontains=search_query)
-                )
-        
         return queryset
 
 
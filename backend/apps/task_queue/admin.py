@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('task_name', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'finished_at')
+    list_filter = ('status', 'task_name')
+    search_fields = ('task_name', 'last_error')
+    ordering = ('-created_at',)
+    readonly_fields = ('attempts', 'locked_by', 'locked_until', 'last_error', 'created_at', 'updated_at', 'finished_at')
+    actions = ['retry_jobs']
+
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status=Job.STATUS_RUNNING).update(
+            status=Job.STATUS_QUEUED, run_at=timezone.now(), attempts=0, last_error=''
+        )
+        self.message_user(request, f"{updated} jobs queued for retry.")
+    retry_jobs.short_description = "Retry selected jobs"
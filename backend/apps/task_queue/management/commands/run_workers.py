@@ -0,0 +1,67 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.task_queue.polling import poll
+from apps.task_queue.services import DEFAULT_LEASE_SECONDS, run_due_jobs
+
+logger = logging.getLogger(__name__)
+
+
+def work(worker_id, batch_size, lease_seconds, poll_interval, once=False):
+    """Claim and run jobs until SIGTERM/SIGINT (or until idle with `once`)"""
+    logger.info(f"Worker {worker_id} started")
+    poll(
+        lambda: run_due_jobs(worker_id, limit=batch_size, lease_seconds=lease_seconds),
+        0 if once else poll_interval,
+        label=f"Worker {worker_id}",
+    )
+    logger.info(f"Worker {worker_id} stopped")
+
+
+class Command(BaseCommand):
+    """Run background job workers"""
+    help = 'Run worker processes that execute queued background jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes')
+        parser.add_argument('--batch-size', type=int, default=5, help='Jobs run per poll')
+        parser.add_argument('--lease', type=int, default=DEFAULT_LEASE_SECONDS,
+                            help='Seconds before a running job is considered abandoned')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to sleep when idle')
+        parser.add_argument('--once', action='store_true', help='Exit once no jobs are due')
+
+    def handle(self, *args, **options):
+        base_id = f"{socket.gethostname()}:{os.getpid()}"
+        worker_args = (options['batch_size'], options['lease'], options['poll_interval'], options['once'])
+
+        if options['processes'] <= 1:
+            work(base_id, *worker_args)
+            return
+
+        # Children must open their own database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=work, args=(f"{base_id}-{index}",) + worker_args, daemon=False)
+            for index in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(self.style.SUCCESS(f"Started {len(processes)} workers"))
+
+        def forward(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    os.kill(process.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+
+        for process in processes:
+            process.join()
@@ -0,0 +1,99 @@
+"""
+Polling loop shared by the long-running management commands
+(run_workers, aggregate_tracking_events, dispatch_outbox,
+run_automation_scheduler, refresh_segments).
+
+Each command drains its queue, sleeps for `--interval` seconds and drains
+again until SIGTERM/SIGINT. Without an interval it drains once and exits,
+which suits cron. A drain that raises is logged and retried after the
+interval, so one bad batch doesn't crash-loop the service.
+"""
+import logging
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+
+def poll(tick, interval=0, drained=None, report=None, label='poller'):
+    """
+    Call `tick` until the queue is drained, then sleep and repeat until stopped.
+
+    Args:
+        tick: Does one unit of work and returns the number of items processed
+        interval: Seconds to sleep between drains; 0 to drain once and return
+        drained: Called with each tick's count; True ends the drain
+            (default: the tick processed nothing)
+        report: Called with the number of items a drain processed, if any
+        label: Name used in log messages
+    """
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    if drained is None:
+        drained = lambda processed: not processed  # noqa: E731
+
+    while True:
+        close_old_connections()
+        total = 0
+        while not stopping:
+            try:
+                processed = tick()
+            except Exception as e:
+                if not interval:
+                    raise
+                logger.exception(f"{label} failed, retrying in {interval}s: {str(e)}")
+                connections.close_all()
+                break
+            total += processed
+            if drained(processed):
+                break
+        if total and report:
+            report(total)
+
+        if stopping or not interval:
+            break
+        # Sleep in short steps so a stop request isn't held up by a long interval
+        deadline = time.monotonic() + interval
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(min(1, max(deadline - time.monotonic(), 0)))
+
+
+class PollingCommand(BaseCommand):
+    """
+    Management command that runs `tick` through poll().
+
+    Subclasses implement tick() and usually report(); drained() can be
+    overridden for ticks that process fixed-size batches.
+    """
+    interval_help = 'Keep running, polling every N seconds (default: drain once and exit)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help=self.interval_help)
+
+    def tick(self, options):
+        """Process one batch; returns the number of items processed"""
+        raise NotImplementedError
+
+    def drained(self, processed, options):
+        return not processed
+
+    def report(self, total, options):
+        pass
+
+    def handle(self, *args, **options):
+        poll(
+            lambda: self.tick(options),
+            options['interval'],
+            drained=lambda processed: self.drained(processed, options),
+            report=lambda total: self.report(total, options),
+            label=self.__module__.rsplit('.', 1)[-1],
+        )
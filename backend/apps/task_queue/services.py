@@ -0,0 +1,216 @@
+import logging
+import threading
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Task name -> callable, filled by @register_task in each app's tasks.py
+TASKS = {}
+
+# Job being run by this thread, so long tasks can renew its lease
+_current = threading.local()
+
+DEFAULT_LEASE_SECONDS = 300
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+
+
+def register_task(name):
+    """
+    Register a function as a background task.
+
+    Usage:
+        @register_task('newsletter.send_campaign')
+        def send_campaign(campaign_id):
+            ...
+
+    Task functions receive the job payload as keyword arguments and must be
+    safe to run more than once: a job whose worker dies is picked up again
+    once its lease expires.
+    """
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(task_name, payload=None, run_at=None, max_attempts=None):
+    """
+    Queue a task for a worker process.
+
+    Args:
+        task_name: Name passed to @register_task
+        payload: JSON-serializable keyword arguments for the task
+        run_at: Earliest time to run (default: now)
+        max_attempts: Attempts before the job is marked failed
+
+    Returns:
+        Job: The queued job
+    """
+    job = Job(task_name=task_name, payload=payload or {}, run_at=run_at or timezone.now())
+    if max_attempts is not None:
+        job.max_attempts = max_attempts
+    job.save()
+    logger.info(f"Queued job {job.id} ({task_name})")
+    return job
+
+
+def cancel_jobs(task_name, payload):
+    """
+    Delete queued jobs of `task_name` with exactly this payload.
+    Jobs already running are left alone.
+
+    Returns:
+        int: Number of jobs cancelled
+    """
+    deleted, _ = Job.objects.filter(task_name=task_name, payload=payload, status=Job.STATUS_QUEUED).delete()
+    return deleted
+
+
+def claim_jobs(worker_id, limit=1, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    Claim up to `limit` due jobs for this worker.
+
+    Uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never claim
+    the same row. Running jobs whose lease has expired (their worker died)
+    are claimed again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Job.STATUS_QUEUED, run_at__lte=now) |
+                Q(status=Job.STATUS_RUNNING, locked_until__lt=now)
+            )
+            .order_by('run_at')[:limit]
+        )
+        if not jobs:
+            return []
+
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=Job.STATUS_RUNNING,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=lease_seconds),
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+
+    for job in jobs:
+        job.status = Job.STATUS_RUNNING
+        job.locked_by = worker_id
+        job.locked_until = now + timedelta(seconds=lease_seconds)
+        job.attempts += 1
+    return jobs
+
+
+def extend_lease(job, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    Keep a long-running job from being reclaimed by another worker.
+
+    Returns:
+        bool: False if the lease already expired and the job was claimed
+            again, in which case this worker no longer owns it
+    """
+    return Job.objects.filter(
+        pk=job.pk, status=Job.STATUS_RUNNING, locked_by=job.locked_by, attempts=job.attempts
+    ).update(
+        locked_until=timezone.now() + timedelta(seconds=lease_seconds)
+    ) == 1
+
+
+def heartbeat():
+    """
+    Renew the lease of the job running in this thread, if any.
+    Long tasks call this between units of work.
+
+    Returns:
+        bool: False if another worker has taken the job over
+    """
+    job = getattr(_current, 'job', None)
+    if job is None:
+        return True
+    return extend_lease(job, getattr(_current, 'lease_seconds', DEFAULT_LEASE_SECONDS))
+
+
+def retry_delay(attempts):
+    """Exponential backoff between attempts"""
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+def _record_failure(job, error, final):
+    job.last_error = error
+    job.locked_by = ''
+    job.locked_until = None
+    if final:
+        job.status = Job.STATUS_FAILED
+        job.finished_at = timezone.now()
+    else:
+        job.status = Job.STATUS_QUEUED
+        job.run_at = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+    job.save(update_fields=['status', 'run_at', 'last_error', 'locked_by', 'locked_until', 'finished_at', 'updated_at'])
+
+
+def run_job(job):
+    """
+    Run a claimed job and record the outcome.
+
+    Returns:
+        bool: True if the task succeeded
+    """
+    if job.attempts > job.max_attempts:
+        # Reclaimed after its worker died during the final attempt
+        _record_failure(job, "Lease expired on the final attempt", final=True)
+        return False
+
+    task = TASKS.get(job.task_name)
+    if task is None:
+        logger.error(f"Job {job.id} has unknown task '{job.task_name}'")
+        _record_failure(job, f"Unknown task '{job.task_name}'", final=True)
+        return False
+
+    _current.job = job
+    try:
+        task(**job.payload)
+    except Exception as e:
+        logger.error(f"Job {job.id} ({job.task_name}) failed on attempt {job.attempts}: {str(e)}")
+        _record_failure(job, traceback.format_exc(), final=job.attempts >= job.max_attempts)
+        return False
+    finally:
+        _current.job = None
+
+    job.status = Job.STATUS_SUCCEEDED
+    job.finished_at = timezone.now()
+    job.locked_by = ''
+    job.locked_until = None
+    job.save(update_fields=['status', 'finished_at', 'locked_by', 'locked_until', 'updated_at'])
+    return True
+
+
+def run_due_jobs(worker_id, limit=10, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    Run up to `limit` due jobs.
+
+    Jobs are claimed one at a time, just before they run, so a slow job
+    can't let the lease on jobs waiting behind it expire and have them
+    run by two workers.
+
+    Returns:
+        int: Number of jobs run
+    """
+    _current.lease_seconds = lease_seconds
+    processed = 0
+    while processed < limit:
+        jobs = claim_jobs(worker_id, limit=1, lease_seconds=lease_seconds)
+        if not jobs:
+            break
+        run_job(jobs[0])
+        processed += 1
+    return processed
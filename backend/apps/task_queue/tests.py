@@ -0,0 +1,137 @@
+import os
+import signal
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase
+from django.utils import timezone
+from .models import Job
+from .polling import poll
+from .services import TASKS, claim_jobs, enqueue, extend_lease, register_task, run_due_jobs
+
+CALLS = []
+
+
+@register_task('tests.record')
+def record(value):
+    CALLS.append(value)
+
+
+@register_task('tests.slow')
+def slow(value):
+    # Another worker polls while this job runs
+    CALLS.append(('claimed by worker-2', [job.payload for job in claim_jobs('worker-2')]))
+    CALLS.append(value)
+
+
+@register_task('tests.explode')
+def explode():
+    raise RuntimeError('boom')
+
+
+class JobQueueTest(TestCase):
+    """Test claiming, running and retrying queued jobs"""
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_due_job_runs_once(self):
+        """Test that a queued job runs and is not claimed again"""
+        job = enqueue('tests.record', {'value': 42})
+
+        self.assertEqual(run_due_jobs('worker-1'), 1)
+        self.assertEqual(run_due_jobs('worker-1'), 0)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(CALLS, [42])
+
+    def test_future_job_waits(self):
+        """Test that a job is not claimed before run_at"""
+        enqueue('tests.record', {'value': 1}, run_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(claim_jobs('worker-1'), [])
+
+    def test_failed_job_is_retried_then_failed(self):
+        """Test exponential retry and the final failed state"""
+        job = enqueue('tests.explode', max_attempts=2)
+
+        run_due_jobs('worker-1')
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('boom', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_due_jobs('worker-1')
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_expired_lease_is_reclaimed(self):
+        """Test that a job abandoned by a dead worker is picked up again"""
+        job = enqueue('tests.record', {'value': 7})
+        claim_jobs('dead-worker')
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(run_due_jobs('worker-2'), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIn('tests.record', TASKS)
+
+    def test_jobs_waiting_behind_a_slow_job_are_not_held(self):
+        """Test that a worker only holds the job it is running"""
+        enqueue('tests.slow', {'value': 1})
+        waiting = enqueue('tests.record', {'value': 2})
+
+        self.assertEqual(run_due_jobs('worker-1'), 1)
+
+        self.assertEqual(CALLS, [('claimed by worker-2', [{'value': 2}]), 1])
+        waiting.refresh_from_db()
+        self.assertEqual(waiting.locked_by, 'worker-2')
+
+    def test_lease_is_not_extended_after_a_reclaim(self):
+        """Test that a worker learns it lost a job whose lease expired"""
+        job = enqueue('tests.record', {'value': 3})
+        [stale] = claim_jobs('worker-1')
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        claim_jobs('worker-2')
+
+        self.assertFalse(extend_lease(stale))
+        job.refresh_from_db()
+        self.assertEqual(job.locked_by, 'worker-2')
+
+
+@mock.patch('apps.task_queue.polling.connections')
+@mock.patch('apps.task_queue.polling.close_old_connections')
+class PollTest(TestCase):
+    """Test the polling loop shared by the background commands"""
+
+    def setUp(self):
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+
+    def test_failing_tick_is_retried_after_the_interval(self, close_old_connections, connections):
+        """Test that a tick that raises is logged and the loop keeps going"""
+        counts = [RuntimeError('bad batch'), 3, 0]
+
+        def tick():
+            result = counts.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            if not counts:
+                os.kill(os.getpid(), signal.SIGTERM)
+            return result
+
+        reports = []
+        with self.assertLogs('apps.task_queue.polling', 'ERROR'):
+            poll(tick, interval=0.01, report=reports.append)
+
+        self.assertEqual(counts, [])
+        self.assertEqual(reports, [3])
+        connections.close_all.assert_called_once()
+
+    def test_single_drain_raises(self, close_old_connections, connections):
+        """Test that without an interval an error reaches the caller"""
+        with self.assertRaises(RuntimeError):
+            poll(mock.Mock(side_effect=RuntimeError('bad batch')))
@@ -0,0 +1,120 @@
+"""
+Public API benchmark suite.
+
+Usage (from backend/, against a migrated database you don't mind seeding):
+    python -m benchmarks seed
+    python -m benchmarks run --serve wsgi --output results.json
+    python -m benchmarks run --url http://127.0.0.1:8000 --baseline benchmarks/baseline.json
+    python -m benchmarks compare benchmarks/baseline.json results.json
+
+`run --baseline` and `compare` exit with status 1 when a metric regressed.
+"""
+import argparse
+import os
+import sys
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'interior_platform.settings.development')
+    import django
+    django.setup()
+
+
+def seed_command(args):
+    from .factories import DEFAULT_SIZES, reset, seed
+
+    if args.reset:
+        reset()
+        print("Removed the benchmark dataset")
+        return 0
+    sizes = {name: getattr(args, name) for name in DEFAULT_SIZES if getattr(args, name) is not None}
+    counts = seed(sizes, seed_value=args.seed)
+    print(', '.join(f"{count} {name}" for name, count in counts.items()))
+    return 0
+
+
+def report(results, baseline, tolerance):
+    from .runner import compare, format_table
+
+    print(format_table(results, baseline))
+    if baseline is None:
+        return 0
+    if baseline.get('dataset') != results.get('dataset'):
+        print(f"Note: dataset differs from the baseline ({baseline.get('dataset')} vs {results.get('dataset')})")
+    regressions = compare(baseline, results, tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+def run_command(args):
+    from .runner import ENDPOINTS, load_results, run, save_results
+    from .serving import start_server
+
+    endpoints = {name: ENDPOINTS[name] for name in args.endpoints} if args.endpoints else None
+    process = None
+    base_url = args.url
+    if args.serve:
+        process = start_server(args.serve, args.port, args.workers)
+        base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        results = run(base_url, endpoints, concurrency=args.concurrency, requests=args.requests)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+    results['server'] = args.serve or base_url
+
+    if args.output:
+        save_results(results, args.output)
+    baseline = load_results(args.baseline) if args.baseline else None
+    return report(results, baseline, args.tolerance)
+
+
+def compare_command(args):
+    from .runner import load_results
+
+    return report(load_results(args.current), load_results(args.baseline), args.tolerance)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n\n')[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    from .factories import DEFAULT_SIZES
+    seed_parser = subparsers.add_parser('seed', help='Replace the benchmark dataset')
+    for name, default in DEFAULT_SIZES.items():
+        seed_parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int, help=f"Default: {default}")
+    seed_parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    seed_parser.add_argument('--reset', action='store_true', help='Only remove the benchmark dataset')
+    seed_parser.set_defaults(handler=seed_command)
+
+    run_parser = subparsers.add_parser('run', help='Load every endpoint and report')
+    target = run_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--url', help='Running server to load')
+    target.add_argument('--serve', choices=['wsgi', 'asgi'], help='Start gunicorn in this mode for the run')
+    run_parser.add_argument('--port', type=int, default=8765)
+    run_parser.add_argument('--workers', type=int, default=4)
+    run_parser.add_argument('--concurrency', type=int, default=50)
+    run_parser.add_argument('--requests', type=int, default=2000, help='Requests per endpoint')
+    run_parser.add_argument('--endpoints', nargs='+', help='Endpoint names (default: all)')
+    run_parser.add_argument('--output', help='Write the results here (e.g. a new baseline)')
+    run_parser.add_argument('--baseline', help=f'Compare with this results file, e.g. {os.path.relpath(BASELINE_PATH)}')
+    run_parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown as a fraction')
+    run_parser.set_defaults(handler=run_command)
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two results files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown as a fraction')
+    compare_parser.set_defaults(handler=compare_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    setup_django()
+    sys.exit(main())
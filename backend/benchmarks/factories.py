@@ -0,0 +1,245 @@
+"""
+Seed a realistic dataset for the benchmarks.
+
+Rows are written with bulk_create, so the signals that normally keep search
+vectors, footer snapshots and response cache versions current don't fire;
+seed() brings those up to date afterwards. Every seeded row is marked with
+the `bench` prefix so reset() removes only benchmark data.
+"""
+import random
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from apps.about.models import (
+    AboutPage, ClientLogo, CompanyHistory, CompanyStatistic, CoreValue, TeamMember, Testimonial
+)
+from apps.faqs.models import FAQ, FAQCategory
+from apps.footer.models import FooterBottomLink, FooterLink, FooterSection, SocialMedia
+from apps.footer.services import rebuild_footer_snapshots
+from apps.projects.models import Project, ProjectCategory, ProjectImage, Tag
+from utils.cache import bump_model_version
+from utils.search import update_search_vectors
+
+PREFIX = 'bench'
+BATCH_SIZE = 1000
+
+# Dataset sizes used when none are given
+DEFAULT_SIZES = {
+    'projects': 3000,
+    'images_per_project': 4,
+    'tags': 60,
+    'tags_per_project': 3,
+    'categories': 12,
+    'faqs': 400,
+    'faq_categories': 10,
+    'footer_sections': 12,
+    'links_per_section': 15,
+    'team_members': 24,
+}
+
+WORDS = (
+    'modern minimal villa penthouse office retail loft courtyard marble oak brass linen terrace '
+    'gallery studio lounge kitchen suite atrium garden coastal desert heritage light open warm'
+).split()
+ARABIC_WORDS = 'حديث بسيط فيلا مكتب رخام خشب حديقة صالة مطبخ جناح ضوء دافئ تراث ساحل'.split()
+
+
+def sentence(rng, words=WORDS, length=12):
+    return ' '.join(rng.choice(words) for _ in range(length)).capitalize()
+
+
+def create_projects(rng, sizes):
+    categories = ProjectCategory.objects.bulk_create([
+        ProjectCategory(
+            name_en=f'Bench category {index}', name_ar=f'فئة {index}', slug=f'{PREFIX}-category-{index}',
+            description_en=sentence(rng), description_ar=sentence(rng, ARABIC_WORDS)
+        )
+        for index in range(sizes['categories'])
+    ])
+    tags = Tag.objects.bulk_create([
+        Tag(name_en=f'Bench tag {index}', name_ar=f'وسم {index}', slug=f'{PREFIX}-tag-{index}')
+        for index in range(sizes['tags'])
+    ])
+
+    today = date.today()
+    projects = Project.objects.bulk_create([
+        Project(
+            title_en=f'Bench project {index} {rng.choice(WORDS)}',
+            title_ar=f'مشروع {index} {rng.choice(ARABIC_WORDS)}',
+            slug=f'{PREFIX}-project-{index}',
+            description_en=' '.join(sentence(rng) for _ in range(8)),
+            description_ar=' '.join(sentence(rng, ARABIC_WORDS) for _ in range(8)),
+            location_en=rng.choice(['Dubai', 'Abu Dhabi', 'Riyadh', 'Doha', 'Cairo']),
+            client_en=f'Client {rng.randint(1, 500)}',
+            category=rng.choice(categories),
+            area=rng.randint(40, 2000),
+            completed_date=today - timedelta(days=rng.randint(0, 3650)),
+            is_featured=rng.random() < 0.1,
+            is_published=rng.random() < 0.9,
+            cover_image=f'projects/covers/{PREFIX}-{index}.jpg',
+        )
+        for index in range(sizes['projects'])
+    ], batch_size=BATCH_SIZE)
+
+    Through = Project.tags.through
+    Through.objects.bulk_create([
+        Through(project_id=project.pk, tag_id=tag.pk)
+        for project in projects
+        for tag in rng.sample(tags, min(sizes['tags_per_project'], len(tags)))
+    ], batch_size=BATCH_SIZE)
+    ProjectImage.objects.bulk_create([
+        ProjectImage(
+            project=project, image=f'projects/{PREFIX}/{project.slug}-{order}.jpg',
+            alt_text_en=sentence(rng, length=4), is_cover=order == 0, order=order
+        )
+        for project in projects
+        for order in range(sizes['images_per_project'])
+    ], batch_size=BATCH_SIZE)
+
+    update_search_vectors(Project.objects.filter(slug__startswith=PREFIX), Project.SEARCH_WEIGHTS)
+    return len(projects)
+
+
+def create_faqs(rng, sizes):
+    categories = FAQCategory.objects.bulk_create([
+        FAQCategory(name_en=f'Bench FAQ category {index}', name_ar=f'فئة {index}',
+                    slug=f'{PREFIX}-faq-{index}', order=index)
+        for index in range(sizes['faq_categories'])
+    ])
+    FAQ.objects.bulk_create([
+        FAQ(
+            category=rng.choice(categories),
+            question_text=f'{PREFIX}: {sentence(rng, length=8)}?',
+            answer_text=' '.join(sentence(rng) for _ in range(5)),
+            language='en' if index % 2 else 'ar',
+            order=index,
+        )
+        for index in range(sizes['faqs'])
+    ], batch_size=BATCH_SIZE)
+    return sizes['faqs']
+
+
+def create_footer(rng, sizes):
+    sections = FooterSection.objects.bulk_create([
+        FooterSection(title_en=f'Bench section {index}', title_ar=f'قسم {index}',
+                      slug=f'{PREFIX}-section-{index}', order=index)
+        for index in range(sizes['footer_sections'])
+    ])
+    FooterLink.objects.bulk_create([
+        FooterLink(section=section, title_en=sentence(rng, length=3), title_ar=sentence(rng, ARABIC_WORDS, 3),
+                   url=f'/{PREFIX}/{section.slug}/{order}', order=order)
+        for section in sections
+        for order in range(sizes['links_per_section'])
+    ], batch_size=BATCH_SIZE)
+    SocialMedia.objects.bulk_create([
+        SocialMedia(platform=platform, url=f'https://{platform}.com/{PREFIX}', order=index)
+        for index, platform in enumerate(['facebook', 'instagram', 'linkedin', 'twitter'])
+    ])
+    FooterBottomLink.objects.bulk_create([
+        FooterBottomLink(title_en=f'Bench {name}', title_ar=name, url=f'/{PREFIX}/{name}', order=index)
+        for index, name in enumerate(['terms', 'privacy', 'cookies'])
+    ])
+    return len(sections) * sizes['links_per_section']
+
+
+def create_about(rng, sizes):
+    AboutPage.objects.get_or_create(pk=1, defaults={
+        field: 'Bench' for field in (
+            'title', 'subtitle', 'mission_title', 'mission_description', 'vision_title',
+            'vision_description', 'team_section_title', 'values_section_title',
+            'testimonials_section_title', 'title_ar', 'subtitle_ar', 'mission_title_ar',
+            'mission_description_ar', 'vision_title_ar', 'vision_description_ar',
+            'team_section_title_ar', 'values_section_title_ar', 'testimonials_section_title_ar',
+        )
+    })
+    TeamMember.objects.bulk_create([
+        TeamMember(name=f'Bench member {index}', role='Designer', bio=sentence(rng, length=40),
+                   image=f'team/{PREFIX}-{index}.jpg', name_ar=f'عضو {index}', role_ar='مصمم',
+                   bio_ar=sentence(rng, ARABIC_WORDS, 40), order=index, is_featured=index < 8)
+        for index in range(sizes['team_members'])
+    ])
+    CoreValue.objects.bulk_create([
+        CoreValue(title=f'Bench value {index}', description=sentence(rng, length=20), icon='star',
+                  title_ar=f'قيمة {index}', description_ar=sentence(rng, ARABIC_WORDS, 20), order=index)
+        for index in range(6)
+    ])
+    Testimonial.objects.bulk_create([
+        Testimonial(client_name=f'Bench client {index}', quote=sentence(rng, length=30),
+                    client_name_ar=f'عميل {index}', quote_ar=sentence(rng, ARABIC_WORDS, 30),
+                    is_featured=index < 6, rating=5)
+        for index in range(30)
+    ])
+    CompanyHistory.objects.bulk_create([
+        CompanyHistory(year=2000 + index, title=f'Bench milestone {index}', description=sentence(rng, length=25),
+                       title_ar=f'محطة {index}', description_ar=sentence(rng, ARABIC_WORDS, 25))
+        for index in range(15)
+    ])
+    CompanyStatistic.objects.bulk_create([
+        CompanyStatistic(title=f'Bench statistic {index}', value=rng.randint(10, 5000),
+                         title_ar=f'إحصائية {index}', order=index)
+        for index in range(4)
+    ])
+    ClientLogo.objects.bulk_create([
+        ClientLogo(name=f'Bench logo {index}', logo=f'clients/{PREFIX}-{index}.png', name_ar=f'شعار {index}', order=index)
+        for index in range(20)
+    ])
+    return sizes['team_members']
+
+
+SEEDED_MODELS = [
+    ProjectCategory, Tag, Project, ProjectImage, FAQCategory, FAQ, FooterSection, FooterLink,
+    SocialMedia, FooterBottomLink, AboutPage, TeamMember, CoreValue, Testimonial, CompanyHistory,
+    CompanyStatistic, ClientLogo,
+]
+
+
+def refresh_derived_data():
+    """Invalidate cached responses and rebuild the footer snapshots after bulk writes"""
+    for model in SEEDED_MODELS:
+        bump_model_version(model)
+    rebuild_footer_snapshots()
+
+
+def reset():
+    """Delete every benchmark row"""
+    with transaction.atomic():
+        Project.objects.filter(slug__startswith=PREFIX).delete()
+        ProjectCategory.objects.filter(slug__startswith=PREFIX).delete()
+        Tag.objects.filter(slug__startswith=PREFIX).delete()
+        FAQCategory.objects.filter(slug__startswith=PREFIX).delete()
+        FooterSection.objects.filter(slug__startswith=PREFIX).delete()
+        SocialMedia.objects.filter(url__endswith=f'/{PREFIX}').delete()
+        FooterBottomLink.objects.filter(url__startswith=f'/{PREFIX}/').delete()
+        TeamMember.objects.filter(name__startswith='Bench ').delete()
+        CoreValue.objects.filter(title__startswith='Bench ').delete()
+        Testimonial.objects.filter(client_name__startswith='Bench ').delete()
+        CompanyHistory.objects.filter(title__startswith='Bench ').delete()
+        CompanyStatistic.objects.filter(title__startswith='Bench ').delete()
+        ClientLogo.objects.filter(name__startswith='Bench ').delete()
+    refresh_derived_data()
+
+
+def seed(sizes=None, seed_value=0):
+    """
+    Replace the benchmark rows with a fresh dataset.
+
+    Args:
+        sizes: Overrides for DEFAULT_SIZES
+        seed_value: Random seed, so every run builds the same data
+
+    Returns:
+        dict: Rows created per kind
+    """
+    sizes = dict(DEFAULT_SIZES, **(sizes or {}))
+    rng = random.Random(seed_value)
+    reset()
+    with transaction.atomic():
+        counts = {
+            'projects': create_projects(rng, sizes),
+            'faqs': create_faqs(rng, sizes),
+            'footer_links': create_footer(rng, sizes),
+            'team_members': create_about(rng, sizes),
+        }
+    refresh_derived_data()
+    return counts
@@ -0,0 +1,135 @@
+"""
+Minimal HTTP/1.1 load generator on asyncio streams.
+
+Each simulated client holds one connection and sends GETs back to back,
+reconnecting when the server closes it (gunicorn's sync workers close after
+every response). No third-party client, so the numbers don't depend on one.
+"""
+import asyncio
+import math
+import time
+from urllib.parse import urlsplit
+
+
+class LoadResult:
+    """Latencies and errors of one load run against one URL"""
+
+    def __init__(self, url, concurrency):
+        self.url = url
+        self.concurrency = concurrency
+        self.latencies = []
+        self.errors = 0
+        self.statuses = {}
+        self.elapsed = 0.0
+
+    def percentile(self, fraction):
+        """Latency in milliseconds below which `fraction` of requests completed"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 2)
+
+    def summary(self):
+        completed = len(self.latencies)
+        return {
+            'url': self.url,
+            'concurrency': self.concurrency,
+            'requests': completed,
+            'errors': self.errors,
+            'statuses': dict(sorted(self.statuses.items())),
+            'throughput': round(completed / self.elapsed, 1) if self.elapsed else 0,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+        }
+
+
+async def _read_response(reader):
+    """Read one response; returns (status, keep_alive)"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif status not in (204, 304):
+        # Body runs until the server closes the connection
+        await reader.read()
+        return status, False
+
+    keep_alive = headers.get('connection', '').lower() != 'close'
+    return status, keep_alive
+
+
+async def _client(url, headers, deadline, remaining, result):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nAccept: application/json\r\n"
+        + ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        + "\r\n"
+    ).encode('latin-1')
+
+    reader = writer = None
+    while remaining[0] > 0 and time.monotonic() < deadline:
+        remaining[0] -= 1
+        started = time.monotonic()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            result.errors += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            continue
+        result.latencies.append(time.monotonic() - started)
+        result.statuses[status] = result.statuses.get(status, 0) + 1
+        if not keep_alive:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(url, concurrency=50, requests=1000, duration=None, headers=None):
+    """
+    Send `requests` GETs to `url` from `concurrency` clients at once.
+
+    Args:
+        duration: Stop after this many seconds even if requests remain
+        headers: Extra request headers
+
+    Returns:
+        LoadResult
+    """
+    result = LoadResult(url, concurrency)
+    deadline = time.monotonic() + duration if duration else math.inf
+    # Shared budget so fast clients pick up the slack of slow ones
+    remaining = [requests]
+    started = time.monotonic()
+    await asyncio.gather(*(
+        _client(url, headers or {}, deadline, remaining, result) for _ in range(concurrency)
+    ))
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+def load(url, **kwargs):
+    """Blocking run_load()"""
+    return asyncio.run(run_load(url, **kwargs))
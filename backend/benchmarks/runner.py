@@ -0,0 +1,162 @@
+"""
+Run the public API benchmark and compare results with a baseline.
+
+Latency and throughput come from the load generator against a running
+server. Queries per request are counted in-process with the test client,
+once on a cold response cache and once warm, since those are exact and
+don't depend on the machine.
+"""
+import json
+import os
+import platform
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.faqs.models import FAQ
+from apps.footer.models import FooterLink
+from apps.projects.models import Project
+
+from .loadgen import load
+
+ENDPOINTS = {
+    'projects': '/api/v1/projects/',
+    'projects_ar_page_2': '/api/v1/projects/?lang=ar&page=2',
+    'faqs': '/api/v1/faqs/',
+    'footer': '/api/v1/footer/all/',
+    'about': '/api/v1/about/combined/',
+}
+
+# Metrics compared against the baseline: name -> True if higher is better
+COMPARED_METRICS = {
+    'p50_ms': False,
+    'p95_ms': False,
+    'p99_ms': False,
+    'throughput': True,
+}
+QUERY_METRICS = ('queries_cold', 'queries_warm')
+
+
+# Private cache for counting queries, so the shared cache of the server under load is left alone
+COUNTING_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmarks'}}
+
+
+def count_queries(path):
+    """Queries run by one request to `path` with an empty, then a warm, cache"""
+    client = Client(HTTP_HOST='localhost')
+    counts = {}
+    with override_settings(CACHES=COUNTING_CACHES):
+        cache.clear()
+        for name in QUERY_METRICS:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(path, HTTP_ACCEPT='application/json')
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+            counts[name] = len(queries)
+    return counts
+
+
+def describe_dataset():
+    """Row counts behind the benchmarked endpoints, so results on different data aren't compared blindly"""
+    return {
+        'projects': Project.objects.filter(is_published=True).count(),
+        'faqs': FAQ.objects.filter(is_active=True).count(),
+        'footer_links': FooterLink.objects.filter(is_active=True).count(),
+    }
+
+
+def run(base_url, endpoints=None, concurrency=50, requests=2000, warmup=100):
+    """
+    Benchmark each endpoint and return the results document.
+
+    Args:
+        base_url: Server to load, e.g. http://127.0.0.1:8000
+        endpoints: name -> path (default: ENDPOINTS)
+    """
+    endpoints = endpoints or ENDPOINTS
+    results = {}
+    for name, path in endpoints.items():
+        counts = count_queries(path)
+        url = f"{base_url.rstrip('/')}{path}"
+        load(url, concurrency=min(concurrency, 10), requests=warmup)
+        summary = load(url, concurrency=concurrency, requests=requests).summary()
+        results[name] = dict(summary, path=path, **counts)
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'settings': os.environ.get('DJANGO_SETTINGS_MODULE'),
+        'debug': settings.DEBUG,
+        'dataset': describe_dataset(),
+        'concurrency': concurrency,
+        'requests': requests,
+        'endpoints': results,
+    }
+
+
+def compare(baseline, current, tolerance=0.2):
+    """
+    List regressions of `current` against `baseline`.
+
+    A latency or throughput metric regresses when it is more than
+    `tolerance` (a fraction) worse; a query count regresses when it grows
+    at all. Endpoints missing from either side are skipped.
+
+    Returns:
+        list: One message per regression
+    """
+    regressions = []
+    for name, before in baseline['endpoints'].items():
+        after = current['endpoints'].get(name)
+        if after is None:
+            continue
+        for metric in QUERY_METRICS:
+            if after.get(metric, 0) > before.get(metric, 0):
+                regressions.append(f"{name}: {metric} {before[metric]} -> {after[metric]}")
+        if after.get('errors'):
+            regressions.append(f"{name}: {after['errors']} failed requests")
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), after.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name}: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def format_table(results, baseline=None):
+    """Plain-text table of a results document, with changes against `baseline` when given"""
+    header = (
+        f"{'endpoint':<20} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'queries':>9} {'errors':>7}"
+    )
+    lines = [header, '-' * len(header)]
+    for name, row in results['endpoints'].items():
+        lines.append(
+            f"{name:<20} {row['throughput']:>9} {row['p50_ms']!s:>9} {row['p95_ms']!s:>9} "
+            f"{row['p99_ms']!s:>9} {row['queries_cold']:>4}/{row['queries_warm']:<4} {row['errors']:>7}"
+        )
+        before = (baseline or {}).get('endpoints', {}).get(name)
+        if before:
+            changes = []
+            for metric in COMPARED_METRICS:
+                if before.get(metric) and row.get(metric) is not None:
+                    changes.append(f"{metric} {(row[metric] - before[metric]) / before[metric]:+.0%}")
+            lines.append(f"{'':<20} vs baseline: {', '.join(changes)}")
+    return '\n'.join(lines)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
@@ -0,0 +1,115 @@
+"""
+Compare sync gunicorn workers with uvicorn (ASGI) workers on the public reads.
+
+Starts each server in turn against the configured database, drives every
+endpoint at the same concurrency and prints p50/p95/p99 latency and
+throughput side by side.
+
+Usage (from backend/, with the database migrated and seeded):
+    python -m benchmarks.serving --concurrency 500 --requests 20000 --workers 4
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+
+from .loadgen import load
+
+# The hot public reads; the tracking pixel gets a fresh key per run
+ENDPOINTS = [
+    '/api/v1/projects/',
+    '/api/v1/faqs/',
+    '/api/v1/footer/all/',
+    '/api/v1/about/combined/',
+    '/api/v1/email/track/open/{tracking_key}/',
+]
+
+SERVERS = {
+    'wsgi': ['interior_platform.wsgi:application'],
+    'asgi': ['interior_platform.asgi:application', '-k', 'uvicorn.workers.UvicornWorker'],
+}
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start on port {port} within {timeout}s")
+
+
+def start_server(mode, port, workers):
+    command = [
+        sys.executable, '-m', 'gunicorn', *SERVERS[mode],
+        '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+        '--backlog', '2048', '--log-level', 'warning',
+    ]
+    # Both modes serve the same views unless the ASGI routes are switched off explicitly
+    env = dict(os.environ, ASYNC_PUBLIC_API='True' if mode == 'asgi' else 'False')
+    process = subprocess.Popen(command, env=env)
+    try:
+        wait_for_port(port)
+    except RuntimeError:
+        process.terminate()
+        raise
+    return process
+
+
+def benchmark(mode, args):
+    process = start_server(mode, args.port, args.workers)
+    results = []
+    try:
+        tracking_key = uuid.uuid4()
+        for endpoint in args.endpoints:
+            url = f"http://127.0.0.1:{args.port}{endpoint.format(tracking_key=tracking_key)}"
+            # Warm the response caches and the workers' connections
+            load(url, concurrency=min(args.concurrency, 20), requests=100)
+            result = load(url, concurrency=args.concurrency, requests=args.requests)
+            results.append(dict(result.summary(), mode=mode, endpoint=endpoint))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return results
+
+
+def print_table(results):
+    header = f"{'endpoint':<42} {'mode':<5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    print(header)
+    print('-' * len(header))
+    for row in sorted(results, key=lambda row: (row['endpoint'], row['mode'])):
+        print(
+            f"{row['endpoint']:<42} {row['mode']:<5} {row['throughput']:>9} {row['p50_ms']!s:>9} "
+            f"{row['p95_ms']!s:>9} {row['p99_ms']!s:>9} {row['errors']:>7}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=20000, help='Requests per endpoint and mode')
+    parser.add_argument('--workers', type=int, default=4, help='Gunicorn worker processes')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--modes', nargs='+', choices=sorted(SERVERS), default=['wsgi', 'asgi'])
+    parser.add_argument('--endpoints', nargs='+', default=ENDPOINTS)
+    parser.add_argument('--json', dest='json_path', help='Also write the results to this file')
+    args = parser.parse_args(argv)
+
+    results = []
+    for mode in args.modes:
+        results.extend(benchmark(mode, args))
+
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
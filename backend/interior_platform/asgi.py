@@ -14,6 +14,8 @@ from django.core.asgi import get_asgi_application
 # Point to production settings by default for ASGI server
 # The actual settings used can be overridden by the DJANGO_SETTINGS_MODULE env var in deployment
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'interior_platform.settings.production')
+# Serve the hot public reads from async views (see utils/async_views.py)
+os.environ.setdefault('ASYNC_PUBLIC_API', 'True')
 
 application = get_asgi_application()
 # If using Channels, import ProtocolTypeRouter here and wrap application
@@ -74,6 +74,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third-party apps
     'rest_framework',
@@ -90,6 +91,9 @@ INSTALLED_APPS = [
     'apps.email_system',  # New app for email delivery and automation
     'apps.faqs',  # FAQ app
     'apps.about',  # About page content app
+    'apps.task_queue',  # Database-backed background jobs
+    'apps.search',  # Cross-content search index
+    'apps.imaging',  # Responsive image renditions
     
     # Commented out apps
     # 'apps.contact',  # Original contact app (temporarily disabled for testing)
@@ -107,6 +111,7 @@ X_FRAME_OPTIONS = 'SAMEORIGIN'
 SILENCED_SYSTEM_CHECKS = ['security.W019'] # Consider removing this if not strictly needed after reviewing security implications
 
 MIDDLEWARE = [
+    'utils.instrumentation.RequestMetricsMiddleware',  # Sampled query/timing metrics, first so it times the rest
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware
@@ -118,7 +123,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # 'django_ratelimit.middleware.RatelimitMiddleware',  # Consider enabling in production.py
     # 'apps.contact.middleware.DynamicEmailSettingsMiddleware',  # Disabled since contact app is disabled
-    'apps.email_system.middleware.DynamicEmailSettingsMiddleware',  # New middleware for email settings
+    # Email settings from the database are applied per send by apps.email_system.services
 ]
 
 # Rate limiting settings - Consider environment-specific rates
@@ -162,6 +167,33 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory by default; production.py requires Redis (REDIS_URL)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'archway-default',
+    }
+}
+
+# Response cache for the public read APIs (see utils/cache.py)
+API_CACHE_ENABLED = config('API_CACHE_ENABLED', default=True, cast=bool)
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# Route the hot public reads to async views (see utils/async_views.py); on by default under asgi.py
+ASYNC_PUBLIC_API = config('ASYNC_PUBLIC_API', default=False, cast=bool)
+
+# Per-request query count and timing metrics (see utils/instrumentation.py):
+# the fraction of requests to sample (0 turns the middleware off), and how many
+# runs of the same SQL shape in one request are logged as a possible N+1
+REQUEST_METRICS_SAMPLE_RATE = config('REQUEST_METRICS_SAMPLE_RATE', default=0.0, cast=float)
+REQUEST_METRICS_N_PLUS_ONE_THRESHOLD = config('REQUEST_METRICS_N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+
+# Combined About page payload cache (see apps/about/services.py)
+ABOUT_CACHE_ENABLED = config('ABOUT_CACHE_ENABLED', default=True, cast=bool)
+ABOUT_CACHE_TIMEOUT = config('ABOUT_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -220,6 +252,35 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media' # Ensure this directory exists and is writable by the server process
 
+# How Django answers /static/ and /media/ requests (see utils/files.py):
+#   'django' - streams the file itself, with Range and conditional GET support
+#   'accel'  - returns X-Accel-Redirect to these internal nginx locations
+FILE_SERVING_MODE = config('FILE_SERVING_MODE', default='django')
+STATIC_ACCEL_REDIRECT = '/internal/static/'
+MEDIA_ACCEL_REDIRECT = '/internal/media/'
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=60 * 60 * 24, cast=int)
+
+# Uploads that must never be public, such as subscriber imports (see utils/files.py)
+PRIVATE_MEDIA_ROOT = config('PRIVATE_MEDIA_ROOT', default=str(BASE_DIR / 'private'))
+
+# Widths (px) of the responsive renditions generated by apps.imaging
+IMAGE_RENDITION_WIDTHS = [320, 640, 1024, 1600]
+
+# On-demand crops served from /media/r/<w>x<h>/<path> (see apps/imaging/resize.py)
+IMAGE_RESIZE_CACHE_DIR = config('IMAGE_RESIZE_CACHE_DIR', default=str(BASE_DIR / 'cache' / 'resized'))
+IMAGE_RESIZE_CACHE_MAX_BYTES = config('IMAGE_RESIZE_CACHE_MAX_BYTES', default=512 * 1024 * 1024, cast=int)
+IMAGE_RESIZE_WORKERS = config('IMAGE_RESIZE_WORKERS', default=2, cast=int)
+IMAGE_RESIZE_QUEUE_SIZE = config('IMAGE_RESIZE_QUEUE_SIZE', default=8, cast=int)
+IMAGE_RESIZE_MAX_DIMENSION = 2400
+IMAGE_RESIZE_URL_LIFETIME = 60 * 60 * 24 * 7
+# Internal location that serves IMAGE_RESIZE_CACHE_DIR, e.g. '/_resized/' (empty: stream from Django)
+IMAGE_RESIZE_ACCEL_REDIRECT = config('IMAGE_RESIZE_ACCEL_REDIRECT', default='')
+# Named crops included in serialized renditions as signed resize URLs
+IMAGE_CROP_PRESETS = {
+    'card': (600, 400),
+    'square': (400, 400),
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -259,6 +320,8 @@ SESSION_COOKIE_HTTPONLY = True # Keep True for security
 # Email settings
 # Default to console backend, override in dev/prod
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+# Public base URL of this API, used for tracking links in emails
+API_URL = config('API_URL', default='http://localhost:8000')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='info@archwaydesign.com')
 CONTACT_NOTIFICATION_EMAILS = config('CONTACT_NOTIFICATION_EMAILS', default='info@archwaydesign.com', cast=Csv())
 
@@ -267,4 +330,13 @@ EMAIL_HOST = config('EMAIL_HOST', default='')
 EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='') # Often 'apikey' for SendGrid
-EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='') # The actual API key 
\ No newline at end of file
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='') # The actual API key
+
+# Pooled SMTP (EMAIL_BACKEND = 'apps.email_system.backends.PooledEmailBackend'):
+# sessions per configuration and process, which also caps concurrent sends,
+# seconds to wait for a free session, idle seconds before a NOOP check and
+# idle seconds before a session is closed
+EMAIL_POOL_SIZE = config('EMAIL_POOL_SIZE', default=4, cast=int)
+EMAIL_POOL_TIMEOUT = config('EMAIL_POOL_TIMEOUT', default=30, cast=float)
+EMAIL_POOL_CHECK_AFTER = config('EMAIL_POOL_CHECK_AFTER', default=1, cast=float)
+EMAIL_POOL_MAX_IDLE = config('EMAIL_POOL_MAX_IDLE', default=300, cast=float) 
\ No newline at end of file
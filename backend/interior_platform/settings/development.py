@@ -43,6 +43,9 @@ CORS_ALLOW_CREDENTIALS = True # Often needed for frontend interaction during dev
 # Use console email backend for development to see emails in the terminal
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Build the About page from the database on every request while developing
+ABOUT_CACHE_ENABLED = config('ABOUT_CACHE_ENABLED', default=False, cast=bool)
+
 # Development Timezone
 TIME_ZONE = 'Europe/London' 
 
@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import * 
 
 # Override base settings for Production environment
@@ -13,12 +15,31 @@ CORS_ALLOW_CREDENTIALS = config('CORS_ALLOW_CREDENTIALS', default=False, cast=bo
 
 # Email settings for production (e.g., SendGrid)
 # Ensure these are loaded from environment variables in base.py
-# Example: Use SMTP backend defined in base, ensure EMAIL_HOST_PASSWORD etc. are set
-EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+# SMTP over pooled connections; ensure EMAIL_HOST_PASSWORD etc. are set
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='apps.email_system.backends.PooledEmailBackend')
 
 # Production Timezone
 TIME_ZONE = 'UTC'
 
+# Shared cache for production - response cache versions, footer snapshots and the
+# email configuration cache are invalidated through it, so every process must see it
+REDIS_URL = config('REDIS_URL', default='')
+if not REDIS_URL:
+    raise ImproperlyConfigured(
+        "REDIS_URL must be set in production: a per-process cache would keep serving "
+        "stale responses after admin edits"
+    )
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'archway',
+    }
+}
+
+# Instrument a small share of requests; raise temporarily to investigate an endpoint
+REQUEST_METRICS_SAMPLE_RATE = config('REQUEST_METRICS_SAMPLE_RATE', default=0.01, cast=float)
+
 # Security settings for production
 CSRF_COOKIE_SECURE = True
 SESSION_COOKIE_SECURE = True
@@ -31,9 +52,15 @@ SECURE_SSL_REDIRECT = config('SECURE_SSL_REDIRECT', default=True, cast=bool) # S
 
 # Static files handling for production
 STATIC_ROOT = BASE_DIR / 'staticfiles' # Directory where collectstatic will gather files
-# Consider using Whitenoise or cloud storage (S3) for serving static files
-# MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware') # Example for Whitenoise
-# STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage' # Example for Whitenoise
+# Hashed file names plus .gz/.br copies, written by collectstatic
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'utils.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+# nginx serves /static/ and /media/ itself (see nginx/nginx.conf); anything routed to
+# Django is handed back to nginx instead of tying up a gunicorn worker
+FILE_SERVING_MODE = config('FILE_SERVING_MODE', default='accel')
+IMAGE_RESIZE_ACCEL_REDIRECT = config('IMAGE_RESIZE_ACCEL_REDIRECT', default='/internal/resized/')
 
 
 # Logging configuration for production
@@ -57,6 +84,12 @@ LOGGING = {
             'level': config('DJANGO_LOG_LEVEL', default='INFO'),
             'propagate': False,
         },
+        # request_metrics lines and N+1 warnings from utils/instrumentation.py
+        'utils.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
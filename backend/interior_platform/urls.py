@@ -14,26 +14,27 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
-from django.views.static import serve
 from rest_framework import routers
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
-from apps.projects.views import ProjectViewSet, CategoryViewSet, TagViewSet
+from apps.projects.views import ProjectViewSet, CategoryViewSet, TagViewSet, ProjectListAsyncView
 # from apps.testimonials.views import TestimonialViewSet  # Removed - using testimonials from about app
 # from apps.contact.views import ContactViewSet, ContactInfoViewSet, FooterAPIView
 from apps.contact_management.views import ContactViewSet, ContactInfoViewSet
-from apps.footer.views import FooterSectionViewSet
+from apps.footer.views import FooterSectionViewSet, FooterCompleteAsyncView
 from apps.newsletter.views import NewsletterSubscriptionViewSet
-from apps.email_system.views import EmailDeliveryViewSet
+from apps.email_system.views import EmailDeliveryViewSet, TrackOpenAsyncView, TrackClickAsyncView
 from apps.services.views import ServiceViewSet, ServiceCategoryViewSet
-from apps.faqs.views import FAQViewSet
+from apps.faqs.views import FAQViewSet, FAQListAsyncView
+from apps.about.views import CombinedAboutAsyncView
+from apps.imaging.views import resized_media
+from utils.files import serve_media, serve_static
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -57,6 +58,7 @@ def api_root(request, format=None):
         'email-system': reverse('email_system:delivery-list', request=request, format=format),
         'faqs': reverse('faqs:faq-list', request=request, format=format),
         'about': reverse('about:about-list', request=request, format=format),
+        'search': reverse('search:search', request=request, format=format),
         # Commented until analytics app is enabled
         # 'analytics': reverse('pageview-list', request=request, format=format),
     })
@@ -87,22 +89,38 @@ api_patterns = [
     path('v1/email/', include('apps.email_system.urls')),
     path('v1/faqs/', include('apps.faqs.urls', namespace='faqs')),
     path('v1/about/', include('apps.about.urls', namespace='about')),
+    path('v1/search/', include('apps.search.urls', namespace='search')),
     
     # Commented until analytics app is enabled
     # path('v1/analytics/', include('apps.analytics.urls')),
     path('auth/', include('rest_framework.urls')),
 ]
 
+if settings.ASYNC_PUBLIC_API:
+    # Async views for the hot public reads, matched before the DRF routes (see asgi.py)
+    api_patterns = [
+        path('v1/projects/', ProjectListAsyncView.as_view()),
+        path('v1/faqs/', FAQListAsyncView.as_view()),
+        path('v1/faqs/faqs/', FAQListAsyncView.as_view()),
+        path('v1/footer/all/', FooterCompleteAsyncView.as_view()),
+        path('v1/about/combined/', CombinedAboutAsyncView.as_view()),
+        path('v1/email/track/open/<uuid:tracking_key>/', TrackOpenAsyncView.as_view()),
+        path('v1/email/track/click/<uuid:tracking_key>/', TrackClickAsyncView.as_view()),
+    ] + api_patterns
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include(api_patterns)),
     path('i18n/', include('django.conf.urls.i18n')),
 ]
 
-# Add static and media URLs for development
+# Static and media files. nginx serves these prefixes in production; requests that
+# still reach Django are streamed or handed back to nginx (see utils/files.py)
 urlpatterns += [
-    path('static/<path:path>', serve, {'document_root': settings.STATIC_ROOT}),
-    path('media/<path:path>', serve, {'document_root': settings.MEDIA_ROOT}),
+    # Signed on-demand crops, must come before the plain media route
+    path('media/r/<int:width>x<int:height>/<path:path>', resized_media, name='resized-media'),
+    path('static/<path:path>', serve_static, name='static-file'),
+    path('media/<path:path>', serve_media, name='media-file'),
 ]
 
 # Add internationalization to core patterns (except API and admin)
@@ -111,7 +129,3 @@ urlpatterns += i18n_patterns(
     prefix_default_language=True,
 )
 
-# Serve media files in development
-if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,116 @@
+"""
+Async (ASGI) views for the hot public read endpoints.
+
+Under an ASGI server these views wait on the database and cache without
+holding a worker, so slow clients and tracking hits don't pin one each.
+They are routed in front of the DRF views when ASYNC_PUBLIC_API is set,
+which interior_platform/asgi.py turns on by default.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views import View
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.renderers import JSONRenderer
+
+from .cache import get_response_cache_key
+from .http import get_validators, set_validators
+from .instrumentation import record_cache_lookup
+
+
+def json_response(data, status=200):
+    """Render `data` exactly as the DRF JSON renderer does"""
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+class AsyncCachedReadView(View):
+    """
+    Async front for a DRF read endpoint wrapped in @conditional_response
+    and @cache_response.
+
+    Conditional GETs and response cache hits are answered here: the
+    validators query and the cache lookup are awaited, and the DRF view is
+    never built. Everything else (cache misses, a non-JSON Accept header,
+    a permission that needs the user) runs the DRF view in a worker thread.
+    Views whose payload is cached somewhere else override get_cached_data.
+
+    Usage:
+        class ProjectListAsyncView(AsyncCachedReadView):
+            drf_view = ProjectViewSet
+            actions = {'get': 'list'}
+    """
+    http_method_names = ['get', 'head', 'options']
+    drf_view = None
+    # Method -> action for viewsets, as passed to ViewSet.as_view()
+    actions = None
+
+    def render_drf_view(self, request, *args, **kwargs):
+        """Run the DRF view and render its response (called in a worker thread)"""
+        view = self.drf_view.as_view(self.actions) if self.actions else self.drf_view.as_view()
+        response = view(request, *args, **kwargs)
+        return response.render() if hasattr(response, 'render') else response
+
+    def get_drf_view(self, request, *args, **kwargs):
+        """The DRF view set up for `request` as its dispatch() would, without running it"""
+        drf_view = self.drf_view()
+        drf_view.action_map = self.actions or {}
+        # Bind method handlers as ViewSet.as_view() does, so allowed_methods is right
+        for method, action in drf_view.action_map.items():
+            setattr(drf_view, method, getattr(drf_view, action))
+        if hasattr(drf_view, 'get') and not hasattr(drf_view, 'head'):
+            drf_view.head = drf_view.get
+        drf_view.args = args
+        drf_view.kwargs = kwargs
+        drf_view.format_kwarg = None
+        drf_view.headers = {}
+        drf_view.request = drf_view.initialize_request(request, *args, **kwargs)
+        return drf_view
+
+    async def get(self, request, *args, **kwargs):
+        drf_view = self.get_drf_view(request, *args, **kwargs)
+        drf_request = drf_view.request
+        try:
+            drf_view.check_permissions(drf_request)
+            renderer, _ = drf_view.perform_content_negotiation(drf_request)
+        except Exception:
+            return await sync_to_async(self.render_drf_view)(request, *args, **kwargs)
+        if renderer.format != 'json':
+            return await sync_to_async(self.render_drf_view)(request, *args, **kwargs)
+
+        models = drf_view.cache_models
+        etag, last_modified = await sync_to_async(get_validators)(drf_view, drf_request, models, kwargs)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            set_validators(not_modified, etag, last_modified)
+            return not_modified
+
+        cached = await self.get_cached_data(drf_view, drf_request, kwargs)
+        if cached is None:
+            return await sync_to_async(self.render_drf_view)(request, *args, **kwargs)
+
+        data, status_code = cached
+        response = json_response(data, status=status_code)
+        self.finalize_cached_response(drf_view, response)
+        if status_code == 200:
+            set_validators(response, etag, last_modified)
+        return response
+
+    async def get_cached_data(self, drf_view, drf_request, kwargs):
+        """(data, status) stored by cache_response for this request, or None on a miss"""
+        if not settings.API_CACHE_ENABLED:
+            return None
+        key = await sync_to_async(get_response_cache_key)(drf_view, drf_request, drf_view.cache_models, kwargs)
+        cached = await cache.aget(key)
+        record_cache_lookup(cached is not None)
+        return cached
+
+    def finalize_cached_response(self, drf_view, response):
+        """Headers the DRF view would have added, so hits and misses match for shared caches"""
+        response['Allow'] = ', '.join(drf_view.allowed_methods)
+        vary = ['Accept']
+        # Session authentication reads the session, which makes the miss vary on Cookie
+        if any(issubclass(auth, SessionAuthentication) for auth in drf_view.authentication_classes):
+            vary.append('Cookie')
+        patch_vary_headers(response, vary)
@@ -0,0 +1,211 @@
+import hashlib
+import logging
+import time
+from functools import wraps
+from typing import Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.translation import get_language
+from rest_framework.response import Response
+
+from .instrumentation import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION_PREFIX = 'model_version'
+MODEL_CHANGED_PREFIX = 'model_changed_at'
+RESPONSE_CACHE_PREFIX = 'api_response'
+
+
+def model_version_key(model) -> str:
+    """Cache key holding the content version of a model"""
+    return f"{MODEL_VERSION_PREFIX}:{model._meta.label_lower}"
+
+
+def model_changed_key(model) -> str:
+    """Cache key holding the Unix time of the last change to a model"""
+    return f"{MODEL_CHANGED_PREFIX}:{model._meta.label_lower}"
+
+
+def _initial_version() -> int:
+    # Seeded from the clock so a version evicted from the cache never comes
+    # back with a value that older response keys were built with
+    return int(time.time() * 1000)
+
+
+def get_model_versions(models: Sequence) -> List[int]:
+    """
+    Return the current content version for each model.
+
+    Args:
+        models: Model classes whose versions are needed
+
+    Returns:
+        A list of versions in the same order as `models`
+    """
+    keys = [model_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def get_model_changed_at(models: Sequence) -> List[float]:
+    """
+    Return the Unix time each model last changed, as recorded by
+    `bump_model_version`.
+
+    A model with no recorded change (e.g. after a cache restart) counts as
+    changed now, so clients revalidate once rather than keep stale copies.
+    """
+    keys = [model_changed_key(model) for model in models]
+    changed_at = cache.get_many(keys)
+
+    for key in keys:
+        if key not in changed_at:
+            cache.add(key, time.time(), None)
+            changed_at[key] = cache.get(key)
+
+    return [changed_at[key] for key in keys]
+
+
+def bump_model_version(model) -> None:
+    """Invalidate every cached response that depends on `model`"""
+    key = model_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+    cache.set(model_changed_key(model), time.time(), None)
+
+
+def _bump_on_change(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def _bump_on_m2m_change(sender, instance, action, model, **kwargs):
+    if action.startswith('post_'):
+        bump_model_version(type(instance))
+        bump_model_version(model)
+
+
+def watch_models(*models) -> None:
+    """
+    Bump the version of each model whenever one of its rows is saved or
+    deleted, or one of its many-to-many relations changes.
+
+    Note that bulk `QuerySet.update()` does not send signals; call
+    `bump_model_version` after such updates.
+    """
+    for model in models:
+        uid = f"response_cache:{model._meta.label_lower}"
+        post_save.connect(_bump_on_change, sender=model, dispatch_uid=f"{uid}:save")
+        post_delete.connect(_bump_on_change, sender=model, dispatch_uid=f"{uid}:delete")
+
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                _bump_on_m2m_change,
+                sender=field.remote_field.through,
+                dispatch_uid=f"{uid}:{field.name}"
+            )
+
+
+def get_view_language(view) -> str:
+    """Language a view renders in, via its `get_language()` when it has one"""
+    view_language = getattr(view, 'get_language', None)
+    return view_language() if callable(view_language) else (get_language() or 'en')
+
+
+def normalize_query_params(query_params) -> List[tuple]:
+    """Sorted (key, values) pairs so parameter order does not split the cache"""
+    return sorted(
+        (key, tuple(sorted(query_params.getlist(key))))
+        for key in query_params.keys()
+    )
+
+
+def get_response_cache_key(view, request, models: Iterable, extra: Optional[dict] = None) -> str:
+    """
+    Build the cache key for a GET response.
+
+    The key covers the endpoint, the response language, the normalized query
+    parameters, the host (serializers build absolute media URLs) and the
+    current version of every model the response is built from.
+    """
+    parts = [
+        request.scheme,
+        request.get_host(),
+        request.path,
+        get_view_language(view),
+        repr(normalize_query_params(request.query_params)),
+        repr(sorted((extra or {}).items())),
+        repr(get_model_versions(list(models))),
+    ]
+    digest = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+    return f"{RESPONSE_CACHE_PREFIX}:{view.__class__.__name__}:{digest}"
+
+
+def cache_response(models: Optional[Sequence] = None, timeout: Optional[int] = None):
+    """
+    Cache successful GET responses of a view method.
+
+    Args:
+        models: Models the response is built from. Defaults to the view's
+            `cache_models` attribute.
+        timeout: Seconds to keep a response (default: API_CACHE_TIMEOUT)
+
+    Usage:
+        @cache_response()
+        def list(self, request, *args, **kwargs):
+            ...
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            if not settings.API_CACHE_ENABLED or request.method not in ('GET', 'HEAD'):
+                return view_method(view, request, *args, **kwargs)
+
+            cache_models = models if models is not None else view.cache_models
+            key = get_response_cache_key(view, request, cache_models, kwargs)
+
+            cached = cache.get(key)
+            record_cache_lookup(cached is not None)
+            if cached is not None:
+                data, status_code = cached
+                return Response(data, status=status_code)
+
+            response = view_method(view, request, *args, **kwargs)
+
+            if isinstance(response, Response) and response.status_code == 200:
+                cache_timeout = timeout if timeout is not None else settings.API_CACHE_TIMEOUT
+                try:
+                    cache.set(key, (response.data, response.status_code), cache_timeout)
+                except Exception:
+                    logger.exception("Could not cache response for %s", request.path)
+
+            return response
+        return wrapper
+    return decorator
+
+
+class CacheResponseMixin:
+    """
+    Serve `list` and `retrieve` from the response cache.
+
+    Views set `cache_models` to every model their serializers read.
+    """
+    cache_models: Sequence = ()
+
+    @cache_response()
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response()
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -0,0 +1,205 @@
+"""
+Serving /static/ and /media/ when a request reaches Django.
+
+In production nginx serves both prefixes from disk; these views cover the
+dev server and any request that still gets routed here. With
+FILE_SERVING_MODE = 'accel' Django only checks the path and returns an
+X-Accel-Redirect, so nginx sends the bytes (with sendfile and Range
+support) and the gunicorn worker is freed immediately. In 'django' mode the
+file is streamed with conditional GET, single-range and precompressed
+(static) support.
+"""
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers, quote_etag
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .staticfiles import PRECOMPRESSED_SUFFIXES
+
+# Names written by ManifestStaticFilesStorage, e.g. app.3f2a9c1b7d4e.css
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[A-Za-z0-9]+$')
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+STREAM_CHUNK_SIZE = 64 * 1024
+# Stored compressed files (e.g. a .tar.gz download) are sent as-is, like FileResponse does
+ENCODED_CONTENT_TYPES = {
+    'bzip2': 'application/x-bzip',
+    'gzip': 'application/gzip',
+    'xz': 'application/x-xz',
+    'br': 'application/x-brotli',
+}
+
+
+def static_cache_control(path):
+    """Hashed names never change content, so they can be cached for a year"""
+    return IMMUTABLE_CACHE_CONTROL if HASHED_NAME_RE.search(path) else REVALIDATE_CACHE_CONTROL
+
+
+def media_cache_control(path):
+    return f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single `bytes=` range, inclusive.
+
+    Returns None when the header should be ignored (absent, malformed or
+    multiple ranges, which are answered with the full file) and raises
+    ValueError when it can't be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def _read_range(handle, start, length):
+    try:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+def _pick_encoding(request, full_path):
+    """Precompressed sibling the client accepts, as (encoding, path), or (None, full_path)"""
+    accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+        if encoding in accepted and os.path.isfile(full_path + suffix):
+            return encoding, full_path + suffix
+    return None, full_path
+
+
+def serve_file(request, path, document_root, cache_control, accel_prefix='', precompressed=False):
+    """
+    Response for `path` under `document_root`.
+
+    Args:
+        cache_control: Function returning the Cache-Control value for `path`
+        accel_prefix: Internal nginx location; when set, nginx sends the file
+        precompressed: Look for `.br`/`.gz` siblings written by collectstatic
+    """
+    try:
+        full_path = safe_join(document_root, path)
+    except SuspiciousFileOperation:
+        raise Http404('File not found')
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = ENCODED_CONTENT_TYPES.get(encoding, content_type) or 'application/octet-stream'
+
+    if accel_prefix:
+        # nginx keeps Content-Type and Cache-Control from this response
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{quote(path)}"
+        response['Cache-Control'] = cache_control(path)
+        return response
+
+    content_encoding, file_path = _pick_encoding(request, full_path) if precompressed else (None, full_path)
+    try:
+        file_stat = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('File not found')
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404('File not found')
+
+    size = file_stat.st_size
+    etag = quote_etag(f"{int(file_stat.st_mtime_ns):x}-{size:x}{'-' + content_encoding if content_encoding else ''}")
+    last_modified = int(file_stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        byte_range = None
+        # Ranges are only offered on the identity encoding
+        if content_encoding is None and request.method == 'GET':
+            if_range = request.META.get('HTTP_IF_RANGE')
+            if not if_range or if_range == etag or parse_http_date_safe(if_range) == last_modified:
+                try:
+                    byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+                except ValueError:
+                    response = HttpResponse(status=416)
+                    response['Content-Range'] = f'bytes */{size}'
+                    return response
+
+        handle = open(file_path, 'rb')
+        if byte_range is None:
+            # FileResponse uses the WSGI server's file wrapper (sendfile where available)
+            response = FileResponse(handle, content_type=content_type, filename=os.path.basename(full_path))
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(handle, start, end - start + 1), status=206, content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = end - start + 1
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control(path)
+    if content_encoding is None:
+        response['Accept-Ranges'] = 'bytes'
+    else:
+        response['Content-Encoding'] = content_encoding
+    if precompressed:
+        patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def _accel_prefix(location):
+    return location if settings.FILE_SERVING_MODE == 'accel' else ''
+
+
+@require_safe
+def serve_static(request, path):
+    return serve_file(
+        request, path, settings.STATIC_ROOT, static_cache_control,
+        accel_prefix=_accel_prefix(settings.STATIC_ACCEL_REDIRECT), precompressed=True
+    )
+
+
+@require_safe
+def serve_media(request, path):
+    return serve_file(
+        request, path, settings.MEDIA_ROOT, media_cache_control,
+        accel_prefix=_accel_prefix(settings.MEDIA_ACCEL_REDIRECT)
+    )
+
+
+@deconstructible(path='utils.files.PrivateFileStorage')
+class PrivateFileStorage(FileSystemStorage):
+    """Files under PRIVATE_MEDIA_ROOT, which no URL serves (e.g. uploaded imports)"""
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.PRIVATE_MEDIA_ROOT)
+
+
+private_storage = PrivateFileStorage()
@@ -0,0 +1,142 @@
+import hashlib
+import logging
+import math
+import time
+from functools import wraps
+from typing import List, Optional, Sequence, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+from .cache import get_model_changed_at, get_model_versions, get_view_language, normalize_query_params
+
+logger = logging.getLogger(__name__)
+
+
+def _updated_at_column(model) -> Optional[str]:
+    try:
+        return model._meta.get_field('updated_at').column
+    except FieldDoesNotExist:
+        return None
+
+
+def get_latest_updates(models: Sequence) -> List[tuple]:
+    """
+    Return (model label, latest updated_at) for each model with an
+    `updated_at` column.
+
+    Runs a single UNION ALL of indexed MAX() lookups, so the cost does not
+    grow with the size of the tables.
+    """
+    quote = connection.ops.quote_name
+    selects = []
+    params = []
+    for model in models:
+        column = _updated_at_column(model)
+        if column is None:
+            continue
+        selects.append(f"SELECT %s, MAX({quote(column)}) FROM {quote(model._meta.db_table)}")
+        params.append(model._meta.label_lower)
+
+    if not selects:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(' UNION ALL '.join(selects), params)
+        return sorted(cursor.fetchall(), key=lambda row: row[0])
+
+
+def get_validators(view, request, models: Sequence, extra: Optional[dict] = None) -> Tuple[str, Optional[int]]:
+    """
+    Compute the ETag and Last-Modified timestamp for a GET response.
+
+    Both combine MAX(updated_at) with the version and changed-at time that
+    the save/delete signals record for every model, so deletions and
+    models without `updated_at` move them too.
+    """
+    latest_updates = get_latest_updates(models)
+
+    parts = [
+        request.path,
+        get_view_language(view),
+        repr(normalize_query_params(request.query_params)),
+        repr(sorted((extra or {}).items())),
+        repr([(label, latest.isoformat() if latest else None) for label, latest in latest_updates]),
+        repr(get_model_versions(models)),
+    ]
+    etag = quote_etag(hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest())
+
+    timestamps = [latest.timestamp() for _, latest in latest_updates if latest]
+    timestamps.extend(get_model_changed_at(models))
+    return etag, last_modified_header_time(timestamps)
+
+
+def last_modified_header_time(timestamps: Sequence[float]) -> Optional[int]:
+    """
+    Whole-second Last-Modified for content last changed at max(`timestamps`).
+
+    Rounded up, and None while that second is still running: a second
+    change within it would otherwise leave Last-Modified unchanged and
+    If-Modified-Since requests would get a stale 304.
+    """
+    if not timestamps:
+        return None
+    last_modified = math.ceil(max(timestamps))
+    return last_modified if last_modified <= time.time() else None
+
+
+def set_validators(response, etag: str, last_modified: Optional[int]) -> None:
+    """Add the ETag and Last-Modified headers to a 200 or 304 response"""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+
+
+def conditional_response(models: Optional[Sequence] = None):
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before the view runs.
+
+    Args:
+        models: Models the response is built from. Defaults to the view's
+            `cache_models` attribute.
+
+    Successful responses carry ETag and Last-Modified headers.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_method(view, request, *args, **kwargs)
+
+            content_models = models if models is not None else view.cache_models
+            etag, last_modified = get_validators(view, request, content_models, kwargs)
+
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                set_validators(not_modified, etag, last_modified)
+                return not_modified
+
+            response = view_method(view, request, *args, **kwargs)
+
+            if response.status_code == 200:
+                set_validators(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
+
+
+class ConditionalResponseMixin:
+    """
+    Add ETag / Last-Modified handling to `list` and `retrieve`.
+
+    Views set `cache_models` to every model their serializers read.
+    """
+
+    @conditional_response()
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_response()
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
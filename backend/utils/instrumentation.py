@@ -0,0 +1,229 @@
+"""
+Per-request instrumentation for finding query-heavy endpoints.
+
+RequestMetricsMiddleware samples a fraction of requests
+(REQUEST_METRICS_SAMPLE_RATE) and, for each sampled one, records:
+
+- the SQL statements run on the default database, through
+  `connection.execute_wrapper`, with their total time
+- the time spent building serializer `.data` (including the queries it
+  triggers)
+- response cache hits and misses reported by `record_cache_lookup`
+
+The numbers go out as a `Server-Timing` header and a `request_metrics`
+log line. A statement shape repeated more than
+REQUEST_METRICS_N_PLUS_ONE_THRESHOLD times is logged as a possible N+1.
+Requests that aren't sampled only pay for one random() call.
+"""
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+# Metrics of the request being handled, if it was sampled
+_current_metrics: ContextVar[Optional['RequestMetrics']] = ContextVar('request_metrics', default=None)
+
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+
+
+def sql_shape(sql: str) -> str:
+    """
+    The statement with its variable parts collapsed, so the same query run
+    for different rows (or IN lists of different lengths) compares equal.
+    """
+    return _NUMBER.sub('N', _IN_LIST.sub('(%s, ...)', sql))
+
+
+class RequestMetrics:
+    """Counters for one sampled request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.shapes: Counter = Counter()
+        self.serializer_time = 0.0
+        self.serializing = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        """`connection.execute_wrapper` hook"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.started
+
+    def repeated_queries(self, threshold: int) -> List[Tuple[str, int]]:
+        """(shape, count) for every statement shape run more than `threshold` times"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing header (durations in milliseconds)"""
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serializer_time * 1000:.1f}',
+            f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'total;dur={self.duration * 1000:.1f}',
+        ])
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 1),
+            'serializer_ms': round(self.serializer_time * 1000, 1),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'total_ms': round(self.duration * 1000, 1),
+        }
+
+
+def record_cache_lookup(hit: bool) -> None:
+    """Count a cache hit or miss against the current request, if it is sampled"""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+_serializer_timer_installed = False
+
+
+def install_serializer_timer() -> None:
+    """
+    Time `BaseSerializer.data` for sampled requests.
+
+    Only the outermost `.data` is timed, so serializers that build nested
+    serializers' data aren't counted twice.
+    """
+    global _serializer_timer_installed
+    if _serializer_timer_installed:
+        return
+    get_data = BaseSerializer.data.fget
+
+    def data(serializer):
+        metrics = _current_metrics.get()
+        if metrics is None or metrics.serializing:
+            return get_data(serializer)
+        metrics.serializing = True
+        start = time.perf_counter()
+        try:
+            return get_data(serializer)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.serializing = False
+
+    BaseSerializer.data = property(data)
+    _serializer_timer_installed = True
+
+
+def _start_recording(metrics: RequestMetrics) -> ExitStack:
+    # Database connections are per thread: under ASGI this runs in the
+    # request's thread-sensitive worker, where its queries run
+    recording = ExitStack()
+    recording.enter_context(connection.execute_wrapper(metrics.record_query))
+    return recording
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count and timings for a sample of requests.
+
+    Put it first in MIDDLEWARE so `total` covers the other middleware too.
+    Not loaded at all when REQUEST_METRICS_SAMPLE_RATE is 0.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.threshold = settings.REQUEST_METRICS_N_PLUS_ONE_THRESHOLD
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_serializer_timer()
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with _start_recording(metrics):
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        self.report(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        recording = await sync_to_async(_start_recording)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.close)()
+            _current_metrics.reset(token)
+        self.report(request, response, metrics)
+        return response
+
+    def report(self, request, response, metrics: RequestMetrics) -> None:
+        metrics.finish()
+        timing = metrics.server_timing()
+        existing = response.get('Server-Timing')
+        response['Server-Timing'] = f"{existing}, {timing}" if existing else timing
+
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'route': match.route if match else '',
+            'status': response.status_code,
+            **metrics.as_dict(),
+        }
+        logger.info(
+            'request_metrics ' + ' '.join(f"{key}={value}" for key, value in record.items()),
+            extra={'request_metrics': record}
+        )
+
+        for shape, count in metrics.repeated_queries(self.threshold):
+            logger.warning(
+                f"Possible N+1 on {request.method} {request.path}: {count} x {shape[:300]}",
+                extra={'request_metrics': dict(record, repeated_sql=shape, repeated_count=count)}
+            )
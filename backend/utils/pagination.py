@@ -0,0 +1,246 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from functools import cached_property
+from typing import Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+
+
+def estimate_count(queryset) -> int:
+    """
+    Approximate row count from Postgres statistics instead of COUNT(*).
+
+    An unfiltered queryset reads `pg_class.reltuples`; a filtered one uses
+    the planner's row estimate from EXPLAIN. Both are only as fresh as the
+    last ANALYZE, so use them for "about N results" displays.
+    """
+    db = queryset.db
+    with connections[db].cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            # -1 means the table has never been analyzed
+            if row and row[0] >= 0:
+                return row[0]
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+def get_count_mode(request, view, default=COUNT_EXACT) -> str:
+    """`?count=` from the request, else the view's `pagination_count`, else `default`"""
+    mode = request.query_params.get('count') or getattr(view, 'pagination_count', None) or default
+    return mode if mode in COUNT_MODES else default
+
+
+class EstimatedCountPaginator(Paginator):
+    """Django paginator whose total comes from estimate_count()"""
+
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a unique composite key such as (created_at, id).
+
+    Each page is fetched with `WHERE (created_at, id) < (cursor values)`
+    and `LIMIT page_size + 1`, so deep pages cost the same as the first one
+    when a matching index exists. Results always use the key ordering;
+    OrderingFilter choices do not apply in this mode.
+
+    Views set `keyset_ordering`, e.g. ('-clicked_at', '-id'); the last
+    field must be unique. The count is omitted unless `?count=exact` or
+    `?count=estimate` is passed (or the view sets `pagination_count`).
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, view) -> Sequence[str]:
+        return getattr(view, 'keyset_ordering', None) or self.ordering
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            values, reverse = data['v'], bool(data.get('r'))
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            values = [
+                self.model._meta.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, instance, reverse) -> str:
+        values = []
+        for name in self.fields:
+            value = getattr(instance, name.lstrip('-'))
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        data = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+    def keyset_filter(self, values, reverse) -> Q:
+        """Rows strictly after `values` in the key ordering (before, when `reverse`)"""
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.fields, values):
+            field = name.lstrip('-')
+            descending = name.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+
+        # Leading inclusive bound so the planner can range-scan the index
+        leading = self.fields[0].lstrip('-')
+        descending = self.fields[0].startswith('-') != reverse
+        bound = Q(**{f"{leading}__{'lte' if descending else 'gte'}": values[0]})
+        return bound & condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.fields = list(self.get_ordering(view))
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        self.count_mode = get_count_mode(request, view, default=COUNT_NONE)
+        self.count = None
+        if self.count_mode == COUNT_EXACT:
+            self.count = queryset.count()
+        elif self.count_mode == COUNT_ESTIMATE:
+            self.count = estimate_count(queryset)
+
+        values, reverse = self.decode_cursor(request)
+        ordering = self.fields
+        if reverse:
+            ordering = [name[1:] if name.startswith('-') else f'-{name}' for name in ordering]
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.keyset_filter(values, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+        self.page = results
+        return results
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.page[-1], False))
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.page[0], True))
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict()
+        if self.count_mode != COUNT_NONE:
+            payload['count'] = self.count
+            payload['count_is_estimate'] = self.count_mode == COUNT_ESTIMATE
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class FlexiblePagination(PageNumberPagination):
+    """
+    Page-number pagination that can switch to keyset pagination.
+
+    `?pagination=cursor` (or any `?cursor=`) selects KeysetPagination for the
+    request. In page-number mode `?count=estimate` replaces COUNT(*) with a
+    planner estimate (`count=none` behaves the same, since page numbers need
+    some total); pages past an underestimated total return 404.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request, view) -> bool:
+        mode = request.query_params.get(self.mode_query_param) or getattr(view, 'pagination_mode', None)
+        return mode == 'cursor' or self.keyset_class.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request, view):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        count_mode = get_count_mode(request, view)
+        self.count_is_estimate = count_mode in (COUNT_ESTIMATE, COUNT_NONE)
+        self.django_paginator_class = EstimatedCountPaginator if self.count_is_estimate else Paginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        response = super().get_paginated_response(data)
+        if self.count_is_estimate:
+            response.data['count_is_estimate'] = True
+        return response
@@ -0,0 +1,176 @@
+from typing import Dict, Optional
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Func, TextField, Value
+from django.db.models.signals import post_save
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from .cache import get_view_language
+
+# Text search configuration per content language. Postgres ships no Arabic
+# stemmer, so Arabic uses 'simple' on normalized text.
+SEARCH_CONFIGS = {
+    'en': 'english',
+    'ar': 'simple',
+}
+
+# Arabic letter variants folded to one form, and marks dropped entirely
+# (harakat, superscript alef, tatweel). Applied to stored text in SQL and to
+# queries in Python so both sides agree.
+ARABIC_VARIANTS = 'أإآٱىة'
+ARABIC_CANONICAL = 'اااايه'
+ARABIC_MARKS = ''.join(chr(code) for code in range(0x064B, 0x0653)) + 'ٰـ'
+ARABIC_TRANSLATION = str.maketrans(ARABIC_VARIANTS, ARABIC_CANONICAL, ARABIC_MARKS)
+
+HEADLINE_OPTIONS = {
+    'start_sel': '<mark>',
+    'stop_sel': '</mark>',
+    'max_words': 35,
+    'min_words': 15,
+    'max_fragments': 2,
+}
+
+
+def search_vector_field(language: str) -> str:
+    """Name of the stored vector column for a language"""
+    return f'search_vector_{language}'
+
+
+def normalize_arabic(text: str) -> str:
+    """Fold Arabic spelling variants and strip diacritics"""
+    return text.translate(ARABIC_TRANSLATION)
+
+
+class NormalizeArabic(Func):
+    """SQL counterpart of normalize_arabic() using TRANSLATE()"""
+    function = 'TRANSLATE'
+    output_field = TextField()
+
+    def __init__(self, expression, **extra):
+        super().__init__(
+            expression,
+            Value(ARABIC_VARIANTS + ARABIC_MARKS),
+            Value(ARABIC_CANONICAL),
+            **extra
+        )
+
+
+def build_search_vector(weights: Dict[str, str], language: str, localized: bool = True) -> SearchVector:
+    """
+    Weighted vector over the `<field>_<language>` columns.
+
+    Args:
+        weights: Base field name -> weight ('A' to 'D')
+        language: Content language code
+        localized: False to read the field names as given, for tables
+            that store one language per row
+    """
+    config = SEARCH_CONFIGS[language]
+    vector = None
+    for field, weight in weights.items():
+        expression = F(f'{field}_{language}' if localized else field)
+        if language == 'ar':
+            expression = NormalizeArabic(expression)
+        part = SearchVector(expression, weight=weight, config=config)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vectors(queryset, weights: Dict[str, str]) -> int:
+    """
+    Recompute the stored vectors of every row in `queryset` with one UPDATE.
+    Call after bulk `QuerySet.update()` of searchable fields, which sends no signals.
+    """
+    return queryset.update(**{
+        search_vector_field(language): build_search_vector(weights, language)
+        for language in SEARCH_CONFIGS
+    })
+
+
+def watch_search_vectors(model, weights: Dict[str, str]) -> None:
+    """Keep `model`'s stored vectors current whenever a row is saved"""
+
+    def refresh_vectors(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        update_search_vectors(sender._default_manager.filter(pk=instance.pk), weights)
+
+    post_save.connect(
+        refresh_vectors,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"search_vectors:{model._meta.label_lower}"
+    )
+
+
+def build_search_query(text: str, language: str) -> SearchQuery:
+    """Parse user input with web-search syntax (quotes, OR, -exclusion)"""
+    if language == 'ar':
+        text = normalize_arabic(text)
+    return SearchQuery(text, config=SEARCH_CONFIGS[language], search_type='websearch')
+
+
+def search_queryset(queryset, text: str, language: str, headline_field: Optional[str] = None):
+    """
+    Filter `queryset` to rows matching `text`, annotated with `search_rank`
+    and, when `headline_field` is given, a highlighted `search_headline`
+    snippet of `<headline_field>_<language>`.
+    """
+    if language not in SEARCH_CONFIGS:
+        language = 'en'
+
+    query = build_search_query(text, language)
+    vector = F(search_vector_field(language))
+    queryset = queryset.filter(**{search_vector_field(language): query}).annotate(
+        search_rank=SearchRank(vector, query)
+    )
+    if headline_field:
+        queryset = queryset.annotate(search_headline=SearchHeadline(
+            f'{headline_field}_{language}',
+            query,
+            config=SEARCH_CONFIGS[language],
+            **HEADLINE_OPTIONS
+        ))
+    return queryset
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search over the stored `search_vector_<lang>` columns.
+
+    Reads the standard `search` query parameter in the view's language.
+    Results are ordered by rank unless the client asked for an explicit
+    `ordering`, so list this backend after OrderingFilter.
+    The view may set `search_headline_field` to return snippets.
+    """
+    search_param = api_settings.SEARCH_PARAM
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+
+        queryset = search_queryset(
+            queryset,
+            text,
+            get_view_language(view),
+            getattr(view, 'search_headline_field', None)
+        )
+        if self.ordering_param not in request.query_params:
+            queryset = queryset.order_by(
+                '-search_rank', *(queryset.query.order_by or queryset.model._meta.ordering)
+            )
+        return queryset
+
+
+class SearchResultSerializerMixin:
+    """Add the highlighted snippet to serialized search results"""
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        headline = getattr(instance, 'search_headline', None)
+        if headline is not None:
+            data['search_headline'] = headline
+        return data
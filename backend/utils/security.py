@@ -6,18 +6,20 @@ from typing import Dict, Optional, Tuple
 from django.conf import settings
 
 
-def generate_signed_url(path: str, expiry: int = 3600) -> str:
+def generate_signed_url(path: str, expiry: int = 3600, expires_at: Optional[int] = None) -> str:
     """
     Generate a signed URL that expires after the specified time.
     
     Args:
         path: The path to the resource
         expiry: Number of seconds until the URL expires (default: 1 hour)
+        expires_at: Exact expiry as a Unix timestamp, overrides `expiry`
+            (lets callers hand out the same URL for a whole period)
         
     Returns:
         A signed URL with expiration
     """
-    timestamp = int(time.time()) + expiry
+    timestamp = expires_at if expires_at is not None else int(time.time()) + expiry
     message = f"{path}:{timestamp}".encode('utf-8')
     secret = settings.SECRET_KEY.encode('utf-8')
     signature = hmac.new(secret, message, hashlib.sha256).hexdigest()
@@ -56,7 +58,7 @@ def validate_signed_url(url: str) -> Tuple[bool, Optional[str]]:
         secret = settings.SECRET_KEY.encode('utf-8')
         expected_signature = hmac.new(secret, message, hashlib.sha256).hexdigest()
         
-        if signature != expected_signature:
+        if not hmac.compare_digest(signature, expected_signature):
             return False, "Invalid signature"
             
         return True, None
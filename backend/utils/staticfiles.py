@@ -0,0 +1,65 @@
+import gzip
+import logging
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only .gz variants are written
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.mjs', '.json', '.map', '.svg', '.txt', '.xml', '.html',
+    '.ico', '.ttf', '.otf', '.eot',
+)
+MIN_COMPRESS_SIZE = 256
+# Variants that save less than 5% are not worth the client's decode time
+MAX_COMPRESSED_RATIO = 0.95
+
+PRECOMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Content-hashed static files plus precompressed copies.
+
+    After the manifest is built, every hashed text asset gets `.gz` and (when
+    the `brotli` package is installed) `.br` siblings, so nginx's
+    `gzip_static` and utils.files can send compressed bytes without
+    compressing on each request.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        written = 0
+        for name in set(self.hashed_files.values()):
+            written += self.compress(name)
+        logger.info(f"Wrote {written} precompressed static files")
+
+    def compress(self, name):
+        """Write the compressed variants of one file; returns how many were kept"""
+        if not name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+            return 0
+        path = self.path(name)
+        with open(path, 'rb') as handle:
+            content = handle.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return 0
+
+        # mtime=0 keeps the output identical between builds
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content, quality=11)))
+
+        written = 0
+        for suffix, compressed in variants:
+            if len(compressed) < len(content) * MAX_COMPRESSED_RATIO:
+                with open(path + suffix, 'wb') as handle:
+                    handle.write(compressed)
+                written += 1
+        return written
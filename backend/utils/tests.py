@@ -0,0 +1,66 @@
+import gzip
+import os
+import shutil
+import tempfile
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from .staticfiles import CompressedManifestStaticFilesStorage
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def tearDownModule():
+    shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, STATIC_ROOT=os.path.join(MEDIA_ROOT, 'static'), FILE_SERVING_MODE='django')
+class FileServingTest(TestCase):
+    """Test the /static/ and /media/ views used when a request reaches Django"""
+
+    def setUp(self):
+        self.path = default_storage.save('downloads/brochure.pdf', SimpleUploadedFile('brochure.pdf', bytes(range(256)) * 4))
+
+    def test_range_and_conditional_requests(self):
+        """Test partial content, unsatisfiable ranges and 304s"""
+        url = f'/media/{self.path}'
+        response = self.client.get(url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(10, 20)))
+
+        response = self.client.get(url, HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(252, 256)))
+        self.assertEqual(self.client.get(url, HTTP_RANGE='bytes=5000-').status_code, 416)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self.client.get('/media/../settings.py').status_code, 404)
+
+    def test_accel_mode_hands_file_to_nginx(self):
+        """Test that accel mode returns only an X-Accel-Redirect header"""
+        with self.settings(FILE_SERVING_MODE='accel'):
+            response = self.client.get(f'/media/{self.path}')
+        self.assertEqual(response['X-Accel-Redirect'], f'/internal/media/{self.path}')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response.content, b'')
+
+    def test_collectstatic_precompresses_hashed_assets(self):
+        """Test .gz/.br copies from the storage and their negotiation"""
+        storage = CompressedManifestStaticFilesStorage(location=settings.STATIC_ROOT)
+        name = storage.save('css/site.css', ContentFile(b'body { color: #333; }\n' * 100))
+        self.assertEqual(storage.compress(name), 2)
+
+        response = self.client.get(f'/static/{name}', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        # Not a hashed name, so clients must revalidate
+        self.assertIn('must-revalidate', response['Cache-Control'])
+
+        response = self.client.get(f'/static/{name}', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b'body { color: #333; }\n' * 100)